@@ -0,0 +1,342 @@
+#!/usr/bin/env python3
+"""
+Wake Word / VAD Benchmark for AI Chatbot
+Replays labeled WAV recordings through the same resample -> noise gate ->
+openwakeword -> webrtcvad code the service runs in wake_word_loop and
+recording_loop, as fast as the CPU allows, and reports hit rate, false
+accepts per hour, end-of-speech latency and CPU time per audio second.
+Needs no microphone, so model and threshold changes can be checked on
+any Linux box.
+
+Dataset layout (one directory tree of 16-bit WAV files, 48kHz or 16kHz):
+
+    eval/wake/*.wav         contain the keyword named by the directory
+    eval/stop/*.wav         (any [keyword:<name>] name, 'wake' = main wake word)
+    eval/negative/*.wav     any other directory: no keyword expected
+
+An optional sidecar foo.json next to foo.wav overrides the directory label
+and adds the end of the spoken command for endpoint latency:
+
+    {"keyword": "wake", "speech_end": 3.42}
+
+Usage:
+    ai-chatbot-bench.py eval/
+    ai-chatbot-bench.py eval/ --threshold 0.6 --vad-aggressiveness 3 --silence-threshold 0.6
+    ai-chatbot-bench.py eval/ --json > results.json
+"""
+
+import os
+import sys
+import json
+import time
+import wave
+import argparse
+import configparser
+
+import numpy as np
+
+from openwakeword.model import Model as WakeWordModel
+from resampler import StreamingDecimator
+from noise_gate import NoiseFloorGate
+from wake_keywords import load_keywords, KeywordSpotter
+from endpointer import endpointer_from_config
+
+try:
+    import webrtcvad
+    VAD_AVAILABLE = True
+except ImportError:
+    VAD_AVAILABLE = False
+
+CONFIG_FILE = "/etc/ai-chatbot/config.ini"
+
+# Same framing as the live capture loop
+NATIVE_RATE = 48000
+TARGET_RATE = 16000
+DECIMATION_FACTOR = NATIVE_RATE // TARGET_RATE
+CHUNK_SAMPLES = 1280                         # 80ms at 16kHz
+CHUNK_SECONDS = CHUNK_SAMPLES / TARGET_RATE
+
+
+def load_config(path, args):
+    """Service config with command line overrides applied"""
+    config = configparser.ConfigParser()
+    config['wake_word'] = {
+        'model_path': '/usr/share/openwakeword-models/hey_jarvis_v0.1.onnx',
+        'threshold': '0.5',
+        'vad_aggressiveness': '2',
+        'silence_threshold': '0.8',
+        'adaptive_endpoint': 'true',
+        'min_silence': '0.3',
+        'max_silence': '1.5',
+        'max_recording_time': '10',
+        'gate_enabled': 'true',
+        'gate_margin_db': '6',
+        'gate_hangover_ms': '1000',
+        'gate_context_ms': '1600'
+    }
+    if os.path.exists(path):
+        config.read(path)
+
+    wake = config['wake_word']
+    for option in ('model_path', 'threshold', 'vad_aggressiveness', 'silence_threshold',
+                   'max_recording_time', 'gate_margin_db'):
+        value = getattr(args, option)
+        if value is not None:
+            wake[option] = str(value)
+    if args.no_gate:
+        wake['gate_enabled'] = 'false'
+    if args.fixed_endpoint:
+        wake['adaptive_endpoint'] = 'false'
+    return config
+
+
+def find_recordings(root, keyword_names):
+    """(wav path, expected keyword or None, speech_end or None) for every WAV under root"""
+    recordings = []
+    for dirpath, _, filenames in os.walk(root):
+        rel_parts = os.path.relpath(dirpath, root).split(os.sep)
+        dir_label = next((part for part in rel_parts if part in keyword_names), None)
+        for filename in sorted(filenames):
+            if not filename.lower().endswith('.wav'):
+                continue
+            path = os.path.join(dirpath, filename)
+            keyword, speech_end = dir_label, None
+            sidecar = os.path.splitext(path)[0] + '.json'
+            if os.path.exists(sidecar):
+                with open(sidecar) as f:
+                    label = json.load(f)
+                keyword = label.get('keyword', keyword)
+                speech_end = label.get('speech_end')
+            recordings.append((path, keyword, speech_end))
+    return sorted(recordings)
+
+
+def read_chunks(path):
+    """Yield 16kHz int16 chunks the way the capture callback produces them"""
+    with wave.open(path, 'rb') as wf:
+        if wf.getsampwidth() != 2:
+            raise ValueError("not 16-bit PCM")
+        rate, channels = wf.getframerate(), wf.getnchannels()
+        audio = np.frombuffer(wf.readframes(wf.getnframes()), dtype=np.int16)
+    if channels > 1:
+        audio = audio[::channels]  # First channel, like the mono capture stream
+
+    if rate == NATIVE_RATE:
+        resampler = StreamingDecimator(DECIMATION_FACTOR)
+        step = CHUNK_SAMPLES * DECIMATION_FACTOR
+        for i in range(0, len(audio) - step + 1, step):
+            yield resampler.process(audio[i:i + step])
+    elif rate == TARGET_RATE:
+        # Already past the resampler (e.g. recordings saved by the service)
+        for i in range(0, len(audio) - CHUNK_SAMPLES + 1, CHUNK_SAMPLES):
+            yield audio[i:i + CHUNK_SAMPLES]
+    else:
+        raise ValueError(f"unsupported sample rate {rate}")
+
+
+def percentile(values, q):
+    return float(np.percentile(values, q)) if values else None
+
+
+class Benchmark:
+    """Runs recordings through the live detection code and accumulates results"""
+
+    def __init__(self, config):
+        self.config = config
+        wake = config['wake_word']
+
+        self.gate_args = None
+        if wake.getboolean('gate_enabled'):
+            self.gate_args = dict(
+                margin_db=float(wake['gate_margin_db']),
+                hangover_chunks=int(int(wake['gate_hangover_ms']) / (CHUNK_SECONDS * 1000)),
+                context_chunks=int(int(wake['gate_context_ms']) / (CHUNK_SECONDS * 1000))
+            )
+        self.keywords = load_keywords(config)
+        self.spotter = KeywordSpotter(WakeWordModel, self.keywords)
+
+        self.vad_aggressiveness = int(wake['vad_aggressiveness'])
+
+        self.files = []
+        self.audio_seconds = 0.0
+        self.wake_cpu = 0.0
+        self.vad_cpu = 0.0
+        self.chunks = 0
+        self.skipped_chunks = 0
+
+    def run_file(self, path, expected, speech_end):
+        gate = NoiseFloorGate(**self.gate_args) if self.gate_args else None
+        self.spotter.gate = gate
+        self.spotter.reset()
+
+        endpointer = None
+        if speech_end is not None and VAD_AVAILABLE:
+            # No ASR here, so the adaptive endpointer decides on VAD and energy only
+            endpointer = endpointer_from_config(webrtcvad.Vad(self.vad_aggressiveness),
+                                                self.config['wake_word'])
+        recording_from = 0.0 if endpointer and expected is None else None
+
+        detections = []
+        endpoint = None
+        t = 0.0
+        for chunk in read_chunks(path):
+            t += CHUNK_SECONDS
+            self.chunks += 1
+
+            start = time.process_time()
+            prediction = self.spotter.process(chunk)
+            keyword = self.spotter.detect(prediction, now=t) if prediction is not None else None
+            self.wake_cpu += time.process_time() - start
+            if prediction is None:
+                self.skipped_chunks += 1
+            if keyword is not None:
+                detections.append((keyword.name, round(t, 2)))
+                # Wake word starts the command recording, as in wake_word_detected_handler()
+                if endpointer and recording_from is None and keyword.name == expected:
+                    recording_from = t
+                    endpointer.start(t)
+                continue
+
+            if recording_from is not None and endpoint is None:
+                start = time.process_time()
+                reason = endpointer.update(chunk, t)
+                self.vad_cpu += time.process_time() - start
+                if reason:
+                    endpoint = (reason, t)
+
+        self.audio_seconds += t
+        hit = expected is not None and any(name == expected for name, _ in detections)
+        expected_seen = False
+        false_accepts = 0
+        for name, _ in detections:
+            if name == expected and not expected_seen:
+                expected_seen = True
+            else:
+                false_accepts += 1
+
+        result = {
+            "file": path,
+            "seconds": round(t, 2),
+            "expected": expected,
+            "detections": detections,
+            "hit": hit,
+            "false_accepts": false_accepts
+        }
+        if speech_end is not None:
+            result["speech_end"] = speech_end
+            if endpoint:
+                result["endpoint"] = endpoint[0]
+                result["endpoint_latency"] = round(endpoint[1] - speech_end, 3)
+                result["required_silence_ms"] = endpointer.result["required_ms"]
+            else:
+                result["endpoint"] = "none"
+        self.files.append(result)
+        return result
+
+    def summary(self):
+        positives = [f for f in self.files if f["expected"] is not None]
+        hits = [f for f in positives if f["hit"]]
+        false_accepts = sum(f["false_accepts"] for f in self.files)
+        hours = self.audio_seconds / 3600
+        latencies = [f["endpoint_latency"] for f in self.files
+                     if f.get("endpoint") == "silence"]
+
+        per_keyword = {}
+        for keyword in self.keywords:
+            expected = [f for f in positives if f["expected"] == keyword.name]
+            per_keyword[keyword.name] = {
+                "threshold": keyword.threshold,
+                "files": len(expected),
+                "hit_rate": round(sum(f["hit"] for f in expected) / len(expected), 3) if expected else None
+            }
+
+        return {
+            "files": len(self.files),
+            "audio_hours": round(hours, 3),
+            "hit_rate": round(len(hits) / len(positives), 3) if positives else None,
+            "misses": [f["file"] for f in positives if not f["hit"]],
+            "false_accepts": false_accepts,
+            "false_accepts_per_hour": round(false_accepts / hours, 2) if hours else None,
+            "keywords": per_keyword,
+            "endpoint": {
+                "labeled": sum(1 for f in self.files if "speech_end" in f),
+                "measured": len(latencies),
+                "timeouts": sum(1 for f in self.files if f.get("endpoint") == "timeout"),
+                "cut_early": sum(1 for v in latencies if v < 0),
+                "latency_p50": percentile(latencies, 50),
+                "latency_p90": percentile(latencies, 90),
+                "latency_max": max(latencies) if latencies else None
+            },
+            "cpu": {
+                "wake_ms_per_audio_s": round(1000 * self.wake_cpu / self.audio_seconds, 2) if self.audio_seconds else None,
+                "vad_ms_per_audio_s": round(1000 * self.vad_cpu / self.audio_seconds, 2) if self.audio_seconds else None,
+                "gate_skipped_fraction": round(self.skipped_chunks / self.chunks, 3) if self.chunks else None
+            }
+        }
+
+
+def print_report(summary, wall_seconds, audio_seconds):
+    print(f"Files: {summary['files']}  Audio: {summary['audio_hours']:.3f}h  "
+          f"Speed: {audio_seconds / max(wall_seconds, 1e-6):.0f}x real time")
+    print(f"Hit rate: {summary['hit_rate']}")
+    for name, stats in summary['keywords'].items():
+        print(f"  {name}: threshold {stats['threshold']}, {stats['files']} files, hit rate {stats['hit_rate']}")
+    print(f"False accepts: {summary['false_accepts']} ({summary['false_accepts_per_hour']}/hour)")
+    endpoint = summary['endpoint']
+    if endpoint['labeled']:
+        print(f"End of speech: {endpoint['measured']}/{endpoint['labeled']} endpointed, "
+              f"{endpoint['timeouts']} timeouts, {endpoint['cut_early']} cut early")
+        if endpoint['measured']:
+            print(f"  latency p50 {endpoint['latency_p50']:.2f}s  p90 {endpoint['latency_p90']:.2f}s  "
+                  f"max {endpoint['latency_max']:.2f}s")
+    cpu = summary['cpu']
+    print(f"CPU per audio second: wake {cpu['wake_ms_per_audio_s']}ms, VAD {cpu['vad_ms_per_audio_s']}ms "
+          f"(gate skipped {cpu['gate_skipped_fraction']})")
+    for path in summary['misses']:
+        print(f"  MISS {path}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay labeled WAVs through the wake word / VAD pipeline")
+    parser.add_argument('dataset', help="Directory of labeled WAV recordings")
+    parser.add_argument('--config', default=CONFIG_FILE, help="Service config to take settings from")
+    parser.add_argument('--model-path', dest='model_path', help="Override [wake_word] model_path")
+    parser.add_argument('--threshold', type=float, help="Override [wake_word] threshold")
+    parser.add_argument('--vad-aggressiveness', dest='vad_aggressiveness', type=int, choices=range(4))
+    parser.add_argument('--silence-threshold', dest='silence_threshold', type=float)
+    parser.add_argument('--max-recording-time', dest='max_recording_time', type=float)
+    parser.add_argument('--gate-margin-db', dest='gate_margin_db', type=float)
+    parser.add_argument('--fixed-endpoint', action='store_true',
+                        help="Fixed silence_threshold instead of the adaptive endpointer")
+    parser.add_argument('--no-gate', action='store_true', help="Score every chunk (no noise floor gate)")
+    parser.add_argument('--json', action='store_true', help="Print summary and per-file results as JSON")
+    args = parser.parse_args()
+
+    config = load_config(args.config, args)
+    bench = Benchmark(config)
+    if not VAD_AVAILABLE:
+        print("WARNING: webrtcvad not installed, end-of-speech latency skipped", file=sys.stderr)
+
+    recordings = find_recordings(args.dataset, {k.name for k in bench.keywords})
+    if not recordings:
+        print(f"No WAV files found under {args.dataset}", file=sys.stderr)
+        return 1
+
+    start = time.time()
+    for path, expected, speech_end in recordings:
+        try:
+            bench.run_file(path, expected, speech_end)
+        except Exception as e:
+            print(f"Skipping {path}: {e}", file=sys.stderr)
+    wall = time.time() - start
+
+    summary = bench.summary()
+    if args.json:
+        print(json.dumps({"summary": summary, "files": bench.files}, indent=2))
+    else:
+        print_report(summary, wall, bench.audio_seconds)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
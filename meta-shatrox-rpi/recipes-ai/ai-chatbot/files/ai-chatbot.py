@@ -10,6 +10,8 @@ import sys
 import time
 import socket
 import threading
+import queue
+import re
 import subprocess
 import configparser
 import json
@@ -17,6 +19,7 @@ import signal
 import wave
 from pathlib import Path
 from datetime import datetime
+from collections import deque
 from enum import Enum
 
 # VOSK imports
@@ -38,11 +41,16 @@ try:
     from openwakeword.model import Model as WakeWordModel
     import pyaudio
     import numpy as np
-    from scipy.signal import decimate
+    from audio_ring import AudioRingBuffer
+    from resampler import StreamingDecimator
+    from audio_capture import AudioCapture
+    from noise_gate import NoiseFloorGate, CpuMeter
+    from wake_keywords import load_keywords, KeywordSpotter
+    from endpointer import endpointer_from_config
     WAKE_WORD_AVAILABLE = True
 except ImportError:
     print("WARNING: OpenWakeWord not installed. Wake word detection disabled.")
-    print("Install with: pip3 install openwakeword pyaudio numpy scipy")
+    print("Install with: pip3 install openwakeword pyaudio numpy")
     WAKE_WORD_AVAILABLE = False
 
 # Voice Activity Detection for end-of-speech detection
@@ -54,15 +62,63 @@ except ImportError:
     print("Install with: pip3 install webrtcvad")
     VAD_AVAILABLE = False
 
+# Persistent Piper TTS engine (falls back to 'speak' wrapper)
+try:
+    from tts_engine import PiperEngine, SpeechCache, set_default_engine
+    TTS_ENGINE_AVAILABLE = True
+except ImportError:
+    print("WARNING: tts_engine.py not found. Using 'speak' command for TTS.")
+    TTS_ENGINE_AVAILABLE = False
+
+# Ollama model residency (preload, keep_alive policy, memory-aware eviction)
+try:
+    from model_residency import ModelResidencyManager, SpeculativeWarmup
+    RESIDENCY_AVAILABLE = True
+except ImportError:
+    print("WARNING: model_residency.py not found. Models load on first use.")
+    RESIDENCY_AVAILABLE = False
+
+# Ollama backend pool (multi-host, circuit breaker, latency routing)
+try:
+    from ollama_pool import OllamaPool
+except ImportError:
+    print("ERROR: ollama_pool.py not found.")
+    sys.exit(1)
+
+# Staged ASR -> LLM -> TTS workers
+try:
+    from voice_pipeline import Job, PipelineStage
+except ImportError:
+    print("ERROR: voice_pipeline.py not found.")
+    sys.exit(1)
+
+# Answer cache for repeated questions
+try:
+    from answer_cache import AnswerCache
+    ANSWER_CACHE_AVAILABLE = True
+except ImportError:
+    print("WARNING: answer_cache.py not found. Answer caching disabled.")
+    ANSWER_CACHE_AVAILABLE = False
+
 # System tools for function calling
 try:
-    from system_tools import TOOL_DEFINITIONS, execute_tool, detect_command_category, get_current_time, get_current_date
+    from system_tools import TOOL_DEFINITIONS, execute_tool, detect_command_category, parse_command, normalize_tool_call, motor_stop, get_current_time, get_current_date
 except ImportError:
     print("ERROR: system_tools.py not found. Function calling will not work.")
     TOOL_DEFINITIONS = []
     execute_tool = None
     detect_command_category = None
+    parse_command = None
+    normalize_tool_call = None
+    motor_stop = None
 
+# Motor commands fired from streaming ASR partials, before end of speech
+try:
+    from early_intent import EarlyIntent
+    EARLY_INTENT_AVAILABLE = execute_tool is not None
+except ImportError:
+    print("WARNING: early_intent.py not found. Commands wait for the full transcript.")
+    EARLY_INTENT_AVAILABLE = False
 
 # Configuration
 CONFIG_FILE = "/etc/ai-chatbot/config.ini"
@@ -73,6 +129,46 @@ CAMERA_DIR = "/tmp/ai-camera"
 VOSK_MODEL_PATH = "/usr/share/vosk-models/default"
 QA_DISPLAY_FILE = "/tmp/ai-qa-display.txt"  # Clean Q&A for display only
 
+# Capture format (USB mic native rate, decimated to 16kHz for wake word / VAD / ASR)
+NATIVE_RATE = 48000
+TARGET_RATE = 16000
+DECIMATION_FACTOR = NATIVE_RATE // TARGET_RATE  # = 3
+RING_MARGIN_SECONDS = 2  # Extra ring capacity so readers finish before the writer laps them
+
+# Regular chat request (also used by speculative warm-up, must stay identical for prefix reuse)
+CHAT_SYSTEM_PROMPT = 'You are a helpful robot. Give direct, concise answers. Maximum 2 sentences. No extra formatting or explanations.'
+CHAT_OPTIONS = {
+    'num_ctx': 2048,
+    'temperature': 0.7,
+    'num_predict': 50
+}
+
+def estimate_tokens(text):
+    """Rough token count for budgeting (~4 characters per token for English)"""
+    return len(text) // 4 + 1
+
+# Sentence boundary for streamed answers: terminal punctuation followed by whitespace
+SENTENCE_END = re.compile(r'(?<=[.!?])\s+')
+MIN_SENTENCE_CHARS = 12  # Merge very short fragments ("Yes.") into the next sentence
+SPEAK_TIMEOUT = 30  # Longest a socket SPEAK waits for playback (s)
+
+
+def split_sentences(text):
+    """Split streamed text into complete sentences and the unfinished remainder"""
+    parts = SENTENCE_END.split(text)
+    remainder = parts.pop()
+    sentences = []
+    current = ""
+    for part in parts:
+        current = f"{current} {part}" if current else part
+        if len(current) >= MIN_SENTENCE_CHARS:
+            sentences.append(current.strip())
+            current = ""
+    if current:
+        remainder = f"{current} {remainder}"
+    return sentences, remainder
+
+
 class State(Enum):
     WAKE_LISTENING = "wake_listening"  # NEW: Listening for wake word
     WAKE_DETECTED = "wake_detected"   # NEW: Wake word just detected
@@ -83,6 +179,9 @@ class State(Enum):
     SPEAKING = "speaking"
     CAMERA = "camera"
 
+# States in which a wake word, K1 or stop keyword interrupts the current answer
+BARGE_IN_STATES = (State.TRANSCRIBING, State.ANSWERING, State.SPEAKING, State.CAMERA)
+
 class AIChatBot:
     def __init__(self):
         self.state = State.IDLE
@@ -91,18 +190,36 @@ class AIChatBot:
         self.recording_process = None
         self.current_audio_file = None
         self.conversation_history = []
+        self.conversation_summary = ""  # Running summary of turns compacted out of history
+        self.history_lock = threading.Lock()
+        self.compacting = False
         self.last_interaction_time = time.time()
         self.vosk_model = None
         
         # Wake word detection attributes
         self.wake_word_enabled = self.config['wake_word'].getboolean('enabled', fallback=False)
         self.wake_word_thread = None
+        self.recording_thread = None   # VAD / end-of-speech consumer
+        self.capture = None            # Mic capture producer (see audio_capture.py)
         self.wake_word_running = False
         self.wake_word_paused = False  # Pause wake word during TTS only
         self._wake_debug_counter = 0   # For debug logging
-        
-        # Audio buffer for PyAudio recording (unified for wake word + K1)
-        self.audio_buffer = []
+        self.spotter = None            # Wake word + direct-action keyword models
+        self.noise_gate = None         # Skips wake word inference on chunks at the noise floor
+        self.wake_cpu = None           # CPU spent in wake word inference
+        
+        # Ring buffer of resampled 16kHz capture (unified for wake word + K1)
+        # Every chunk is written; a recording is a start position, with pre-roll
+        self.audio_ring = None
+        self.resampler = None
+        self.recording_start_pos = 0
+        self.preroll_samples = int(TARGET_RATE * int(self.config['audio'].get('preroll_ms', 500)) / 1000)
+        if WAKE_WORD_AVAILABLE:
+            max_seconds = max(10.0, float(self.config['wake_word'].get('max_recording_time', 10)))
+            capacity = int(TARGET_RATE * (max_seconds + RING_MARGIN_SECONDS)) + self.preroll_samples
+            self.audio_ring = AudioRingBuffer(capacity)
+            # One anti-aliased 48k->16k stage shared by wake word, VAD and ASR
+            self.resampler = StreamingDecimator(DECIMATION_FACTOR)
         self.recording_start_time = None
         self.recording_duration = 5.0  # Default fallback (if VAD disabled)
         self.is_recording = False
@@ -112,9 +229,16 @@ class AIChatBot:
         self.recording_source = None  # 'wake_word' or 'k1_button' - tracks who started recording
         
         # VAD-based end-of-speech detection
-        self.vad = None
-        self.last_speech_time = None
-        self.speech_started = False
+        self.endpointer = None  # VadEndpointer for the current wake word recording
+        self.endpoint_latencies = deque(maxlen=50)  # ms of silence waited per utterance
+        
+        # Streaming ASR: recognizer fed chunk-by-chunk while recording
+        self.streaming_asr = self.config['vosk'].getboolean('streaming', fallback=True) and WAKE_WORD_AVAILABLE
+        self.asr_recognizer = None
+        self.asr_samples = 0  # 16kHz samples fed to the live recognizer
+        self.asr_fed_pos = 0  # Ring position up to which audio was fed to the recognizer
+        self.asr_text = ""  # Segments VOSK already finalized during this recording
+        self.asr_partial = ""  # Latest hypothesis for the whole recording so far
         
         # Current Q&A for display
         self.current_question = None
@@ -141,8 +265,48 @@ class AIChatBot:
         self.load_vosk_model()
         
         # Initialize Ollama client (network or local)
-        self.ollama_client = self.init_ollama_client()
-        self.use_network_ollama = self.config['ollama']['ollama_host'] != 'local'
+        self.ollama_pool = self.init_ollama_pool()
+        self.use_network_ollama = bool(self.ollama_pool.remote)
+        self.residency = self.init_residency_manager()
+        self.answer_cache = None
+        if ANSWER_CACHE_AVAILABLE and self.config['answer_cache'].getboolean('enabled', fallback=True):
+            self.answer_cache = AnswerCache(
+                path=self.config['answer_cache']['path'],
+                ttl=int(self.config['answer_cache']['ttl']),
+                volatile_ttl=int(self.config['answer_cache']['volatile_ttl']),
+                max_entries=int(self.config['answer_cache']['max_entries']),
+                flush_delay=self.config['answer_cache'].getfloat('flush_delay', fallback=5),
+                log=self.log
+            )
+        self.warmup = None
+        if RESIDENCY_AVAILABLE and self.config['warmup'].getboolean('enabled', fallback=True):
+            self.warmup = SpeculativeWarmup(self.warmup_target, self.config['warmup'], log=self.log)
+        
+        # Start persistent TTS engine (voice model stays loaded)
+        self.tts = self.init_tts_engine()
+        
+        # Worker stages (ASR -> LLM -> TTS): capture, wake word and socket threads only submit jobs
+        self.asr_stage = PipelineStage('asr', self.run_asr_job, log=self.log)
+        self.llm_stage = PipelineStage('llm', self.run_llm_job, log=self.log)
+        # A speech job cancelled while queued still signals whoever waits on it (socket SPEAK)
+        self.tts_stage = PipelineStage('tts', self.run_tts_job, log=self.log,
+                                       on_skip=lambda job: job.speech_finished())
+        self.stages = [self.asr_stage, self.llm_stage, self.tts_stage]
+        self.last_job = None  # Most recent finished job (stage timings in STATUS)
+        
+        # Barge-in: K1, wake word or stop keyword during an answer cancels it
+        self.barge_in_enabled = self.config['barge_in'].getboolean('enabled', fallback=True)
+        self.echo_ratio = float(self.config['barge_in']['echo_ratio'])
+        self.output_latency = int(self.config['barge_in']['output_latency_ms']) / 1000
+        self.barge_ins = 0
+        
+        # Early intent dispatch: motor commands fire from stable ASR partials
+        early = self.config['early_intent']
+        self.early_intent_enabled = EARLY_INTENT_AVAILABLE and early.getboolean('enabled', fallback=True)
+        self.early_categories = tuple(c.strip() for c in early['categories'].split(',') if c.strip())
+        self.early_stable_seconds = float(early['stable_seconds'])
+        self.early_intent = None  # EarlyIntent for the current recording
+        self.early_dispatches = 0
         
     def load_vosk_model(self):
         """Load VOSK speech recognition model"""
@@ -158,18 +322,78 @@ class AIChatBot:
             self.log(f"Failed to load VOSK model: {e}", "ERROR")
             sys.exit(1)
     
-    def init_ollama_client(self):
-        """Initialize Ollama client (network or local)"""
-        ollama_host = self.config['ollama']['ollama_host']
-        
-        if ollama_host != 'local':
-            # Network Ollama server
-            self.log(f"Using network Ollama server: {ollama_host}")
-            return ollama.Client(host=f"http://{ollama_host}")
+    def init_tts_engine(self):
+        """Start persistent Piper TTS engine, or None to use 'speak' wrapper"""
+        if not TTS_ENGINE_AVAILABLE or not self.config['tts'].getboolean('persistent', fallback=True):
+            self.log("Using 'speak' command for TTS")
+            return None
+        
+        try:
+            voice_model = self.config['tts']['voice_model']
+            cache = None
+            if self.config['tts'].getboolean('cache_enabled', fallback=True):
+                cache = SpeechCache(
+                    voice_model,
+                    cache_dir=self.config['tts']['cache_dir'],
+                    max_memory_bytes=int(self.config['tts']['cache_memory_mb']) * 1024 * 1024
+                )
+            
+            engine = PiperEngine(
+                voice_model=voice_model,
+                device=self.config['audio']['speaker_device'],
+                log=self.log,
+                cache=cache
+            )
+            engine.start()
+            set_default_engine(engine)
+            
+            # Pre-render fixed phrases in background (instant on later boots, loaded from disk)
+            threading.Thread(target=engine.prerender, daemon=True).start()
+            return engine
+        except Exception as e:
+            self.log(f"Failed to start TTS engine, using 'speak' command: {e}", "WARN")
+            return None
+    
+    def init_residency_manager(self):
+        """Create local Ollama residency manager (started in run())"""
+        if not RESIDENCY_AVAILABLE or not self.config['residency'].getboolean('enabled', fallback=True):
+            return None
+        return ModelResidencyManager(
+            self.config['llm']['text_model'],
+            self.config['llm']['vision_model'],
+            self.config['residency'],
+            log=self.log,
+            busy=lambda: self.state in (State.ANSWERING, State.CAMERA)
+        )
+    
+    def model_keep_alive(self, model):
+        """keep_alive for a chat request, records model usage for the residency policy"""
+        if not self.residency:
+            return None
+        self.residency.note_use(model)
+        return self.residency.keep_alive(model)
+    
+    def warmup_target(self):
+        """Model the router will most likely pick next: regular chat on the preferred backend"""
+        backend = self.ollama_pool.preferred()
+        model = self.config['llm']['text_model'] if backend.local else self.config['ollama']['network_text_model']
+        # Same prefix the next chat request will send (system + history so far)
+        messages = self.build_chat_messages()
+        # Warm-ups don't count as usage for the keep_alive policy
+        keep_alive = self.residency.keep_alive(model) if self.residency else None
+        return backend.address, model, messages, CHAT_OPTIONS, keep_alive
+    
+    def init_ollama_pool(self):
+        """Initialize Ollama backend pool (network hosts + local fallback)"""
+        # ollama_host: 'local' or comma-separated 'IP:PORT' list
+        hosts = [h.strip() for h in self.config['ollama']['ollama_host'].split(',') if h.strip()]
+        pool = OllamaPool(hosts, self.config['ollama'], log=self.log)
+        
+        if pool.remote:
+            self.log(f"Using network Ollama servers: {', '.join(b.host for b in pool.remote)} (local fallback)")
         else:
-            # Local Ollama
             self.log("Using local Ollama server")
-            return ollama.Client()
+        return pool
     
     def load_config(self):
         """Load configuration from INI file"""
@@ -180,7 +404,12 @@ class AIChatBot:
             'ollama_host': 'local',
             'network_vision_model': 'moondream',
             'network_text_model': 'llama3.2:3b',
-            'network_timeout': '5'
+            'network_timeout': '5',
+            'request_deadline': '8',          # Give up on network hosts after this (seconds)
+            'probe_interval': '10',           # Background health check period (seconds)
+            'failure_threshold': '2',         # Consecutive failures that open the circuit
+            'circuit_open_time': '30',        # Skip a failed host for this long (seconds)
+            'ewma_alpha': '0.3'               # Latency smoothing (higher = react faster)
         }
         config['llm'] = {
             'system_prompt': 'You are a helpful robot. Answer in 1 sentence maximum. Be direct and concise.',
@@ -191,12 +420,55 @@ class AIChatBot:
         }
         config['vosk'] = {
             'model_path': VOSK_MODEL_PATH,
-            'sample_rate': '16000'
+            'sample_rate': '16000',
+            'streaming': 'true'               # Feed recognizer live during capture (no temp WAV)
         }
         config['audio'] = {
             'microphone_device': 'plughw:2,0',
             'speaker_device': 'auto',
-            'sample_rate': '16000'
+            'sample_rate': '16000',
+            'preroll_ms': '500',              # Audio kept from before wake word / K1 press
+            'capture_queue_chunks': '25'      # Per-consumer queue bound (80ms chunks)
+        }
+        config['tts'] = {
+            'persistent': 'true',             # Keep Piper running, stream its audio (false = fork 'speak')
+            'voice_model': '/usr/share/piper-voices/default.onnx',
+            'cache_enabled': 'true',          # Cache PCM of fixed/templated phrases
+            'cache_dir': '/var/cache/ai-chatbot/tts',
+            'cache_memory_mb': '16'           # In-memory LRU size limit
+        }
+        config['residency'] = {
+            'enabled': 'true',
+            'preload_text_model': 'true',     # Load text model at startup (no cold first question)
+            'text_keep_alive': '30m',
+            'vision_keep_alive': '2m',
+            'busy_keep_alive': '60m',         # Used when a model had busy_uses requests in 15 min
+            'busy_uses': '3',
+            'min_available_mb': '600',        # Unload vision model below this MemAvailable
+            'check_interval': '10'
+        }
+        config['warmup'] = {
+            'enabled': 'true',                # Prefill likely model on wake word / K1 press
+            'delay': '0.2',                   # Grace period so instant cancels cost nothing
+            'min_interval': '20'              # Rate limit between warm-ups (seconds)
+        }
+        config['answer_cache'] = {
+            'enabled': 'true',
+            'path': '/var/cache/ai-chatbot/answers.json',
+            'ttl': '86400',                   # Seconds a cached answer stays valid
+            'volatile_ttl': '600',            # TTL for questions about today/news/weather
+            'max_entries': '500',
+            'flush_delay': '5'                # Seconds before changes are written to disk
+        }
+        config['barge_in'] = {
+            'enabled': 'true',                # Wake word / K1 / stop keyword interrupt answers
+            'echo_ratio': '0.5',              # Mic RMS must exceed this x our output RMS during playback
+            'output_latency_ms': '300'        # How far back to look at our output level
+        }
+        config['early_intent'] = {
+            'enabled': 'true',                # Fire motor commands before end of speech
+            'categories': 'MOTOR_STOP,MOTOR_FORWARD,MOTOR_BACKWARD,MOTOR_LEFT,MOTOR_RIGHT',
+            'stable_seconds': '0.6'           # Same command this long, or a VOSK segment end (MOTOR_STOP fires at once)
         }
         config['camera'] = {
             'enable': 'true',
@@ -204,7 +476,8 @@ class AIChatBot:
         }
         config['behavior'] = {
             'chat_history_timeout': '300',
-            'max_history_messages': '10'
+            'max_history_messages': '10',
+            'compact_at': '0.6'               # Summarize old turns above this fraction of num_ctx
         }
         config['wake_word'] = {
             'enabled': 'false',  # Will be true after setup
@@ -216,7 +489,15 @@ class AIChatBot:
             'vad_enabled': 'true',           # Use VAD for silence detection
             'vad_aggressiveness': '2',        # 0-3 (higher = more aggressive)
             'silence_threshold': '0.8',       # Seconds of silence to stop recording
-            'max_recording_time': '10'        # Maximum recording time (safety)
+            'adaptive_endpoint': 'true',      # Adapt the silence to transcript and energy
+            'min_silence': '0.3',             # Complete short command ("stop")
+            'max_silence': '1.5',             # Sentence left hanging ("turn left and")
+            'max_recording_time': '10',       # Maximum recording time (safety)
+            # Noise floor gate in front of wake word inference
+            'gate_enabled': 'true',
+            'gate_margin_db': '6',            # Score chunks this far above the noise floor
+            'gate_hangover_ms': '1000',       # Keep scoring this long after the last loud chunk
+            'gate_context_ms': '1600'         # Skipped audio replayed into the model when the gate opens
         }
         
         # Load from file if exists
@@ -340,22 +621,25 @@ class AIChatBot:
             
             # CRITICAL FIX: Disable VAD for K1 button - recording stops on button RELEASE only
             # This prevents stale VAD state from triggering early stop
-            self.vad = None
-            self.last_speech_time = None
-            self.speech_started = False
+            self.endpointer = None
             
-            # Clear buffer and start recording
-            self.audio_buffer = []
+            # Start recording (includes pre-roll from before the button press)
+            self.recording_start_pos = self.audio_ring.mark(self.preroll_samples) if self.audio_ring else 0
             self.recording_start_time = time.time()
             self.is_recording = True
             self.recording_source = 'k1_button'  # Track source for priority handling
             self.recording_duration = 10.0  # K1 button: record for 10 seconds max or until button release
+            self.start_streaming_asr()
             
             # Generate unique filename
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             self.current_audio_file = os.path.join(RECORDINGS_DIR, f"recording_{timestamp}.wav")
             
             self.log(f"Started recording (K1 button, no VAD - waits for release)")
+        
+        # Overlap model load + system prompt prefill with the user speaking
+        if self.warmup:
+            self.warmup.trigger('k1_button')
     
     def stop_recording(self):
         """Stop audio recording and save buffer to WAV file"""
@@ -371,21 +655,32 @@ class AIChatBot:
             self.recording_source = None
             
             # CRITICAL FIX: Reset VAD state to prevent stale values in next session
-            self.vad = None
-            self.last_speech_time = None
-            self.speech_started = False
+            self.endpointer = None
             
-            # Copy buffer reference so we can process outside lock
-            audio_data = list(self.audio_buffer)
-            self.audio_buffer = []
-        
-        # Processing happens outside the lock to avoid blocking other threads
+            # Recorded range in the ring, processed outside the lock
+            start_pos = self.recording_start_pos
+            end_pos = self.audio_ring.write_pos if self.audio_ring else 0
+            
+            # Detach live recognizer so the capture loop stops feeding it
+            recognizer = self.asr_recognizer
+            asr_samples = self.asr_samples
+            asr_text = self.asr_text
+            early_intent = self.early_intent if self.early_intent and self.early_intent.fired else None
+            self.early_intent = None
+            self.asr_recognizer = None
+        
+        # Processing happens on the ASR stage - the caller (recording or socket thread) returns at once
         self.log(f"Stopped recording (was: {recording_source})")
+        job = Job('voice', source=recording_source, recognizer=recognizer,
+                  asr_samples=asr_samples, asr_text=asr_text)
+        job.early_intent = early_intent
         
-        # DEFENSIVE FIX: Use try/finally to ensure cleanup always happens
-        try:
+        # STREAMING ASR: audio was already recognized during capture, ASR stage just finalizes
+        if recognizer is None:
+            audio_16k = self.audio_ring.read(start_pos, end_pos) if self.audio_ring else None
+            
             # Check if we have any audio data
-            if not audio_data or len(audio_data) == 0:
+            if audio_16k is None or len(audio_16k) == 0:
                 self.log("No audio data recorded", "WARN")
                 self.update_qa_display(clear=True)  # Clear listening indicator
                 if self.wake_word_enabled:
@@ -394,125 +689,174 @@ class AIChatBot:
                     self.set_state(State.IDLE)
                 return
             
-            # Restore buffer for save function (temporary)
-            self.audio_buffer = audio_data
-            
-            # Save buffered audio to WAV file
-            try:
-                self.save_audio_buffer_to_wav()
-                
-                # Check file size
-                file_size = os.path.getsize(self.current_audio_file)
-                if file_size < 1000:  # Less than 1KB
-                    self.log(f"Recording too small ({file_size} bytes), no usable audio", "WARN")
-                    os.remove(self.current_audio_file)
-                    self.update_qa_display(clear=True)  # Clear listening indicator
-                    if self.wake_word_enabled:
-                        self.set_state(State.WAKE_LISTENING)
-                    else:
-                        self.set_state(State.IDLE)
-                    return
-                
-                # Transcribe
-                self.set_state(State.TRANSCRIBING)
-                self.transcribe_audio()
-                
-            except Exception as e:
-                self.log(f"Error saving/transcribing audio: {e}", "ERROR")
-                self.update_qa_display(clear=True)  # Clear listening indicator
-                if self.wake_word_enabled:
-                    self.set_state(State.WAKE_LISTENING)
-                else:
-                    self.set_state(State.IDLE)
+            # Copy out of the ring: capture keeps overwriting it while the job waits
+            job.audio = audio_16k.copy()
+            job.wav_path = self.current_audio_file
         
-        finally:
-            # DEFENSIVE FIX: Always ensure display is clean
-            # This runs even if there were exceptions above
-            # Double-check that listening indicator is cleared (defensive)
-            try:
-                # Only clear if we're not already in TRANSCRIBING state (which means transcribe succeeded)
-                if self.state != State.TRANSCRIBING:
-                    self.update_qa_display(clear=True)
-                    self.log("Ensured listening indicator cleared in finally block", "DEBUG")
-            except Exception as e:
-                self.log(f"Failed to clear indicator in finally block: {e}", "WARN")
-                self.set_state(State.IDLE)
+        self.set_state(State.TRANSCRIBING)
+        self.update_display("transcribing", "🔄 Transcribing...")
+        if not self.asr_stage.submit(job):
+            self.update_qa_display(clear=True)
+            self.set_state(State.WAKE_LISTENING if self.wake_word_enabled else State.IDLE)
     
-    def save_audio_buffer_to_wav(self):
-        """Convert PyAudio buffer (48kHz) to WAV file (16kHz)"""
-        # Concatenate all audio chunks
-        audio_48k_bytes = b''.join(self.audio_buffer)
-        audio_48k = np.frombuffer(audio_48k_bytes, dtype=np.int16)
-        
-        # Decimate from 48kHz to 16kHz (factor of 3)
-        audio_16k = decimate(audio_48k, 3)
-        
-        # Save to WAV file
-        with wave.open(self.current_audio_file, 'wb') as wf:
+    def start_streaming_asr(self):
+        """Create a fresh live recognizer for the new recording (caller holds recording_lock)"""
+        self.asr_recognizer = None
+        self.asr_samples = 0
+        self.asr_text = ""
+        self.asr_partial = ""
+        self.asr_fed_pos = self.recording_start_pos  # Pre-roll is fed with the first chunk
+        self.early_intent = None
+        if not self.streaming_asr:
+            return
+        if self.early_intent_enabled:
+            self.early_intent = EarlyIntent(
+                detect_command_category, parse_command, execute_tool,
+                normalize=normalize_tool_call,
+                categories=self.early_categories,
+                stable_seconds=self.early_stable_seconds,
+                log=self.log
+            )
+        try:
+            self.asr_recognizer = KaldiRecognizer(self.vosk_model, 16000)
+            self.asr_recognizer.SetWords(True)
+        except Exception as e:
+            self.log(f"Failed to create streaming recognizer, using WAV path: {e}", "WARN")
+            self.asr_recognizer = None
+    
+    def feed_streaming_asr(self):
+        """Feed new 16kHz ring audio to the live recognizer, returns the partial transcript"""
+        with self.recording_lock:
+            # Recognizer may have been detached by stop_recording() meanwhile
+            if self.asr_recognizer is None:
+                return None
+            end_pos = self.audio_ring.write_pos
+            audio_16k = self.audio_ring.read(self.asr_fed_pos, end_pos)
+            self.asr_fed_pos = end_pos
+            if len(audio_16k) == 0:
+                return self.asr_partial
+            if self.asr_recognizer.AcceptWaveform(audio_16k.tobytes()):
+                # VOSK ended a segment on its own pause; keep it, the next
+                # AcceptWaveform() would discard it
+                segment = json.loads(self.asr_recognizer.Result()).get("text", "")
+                self.asr_text = " ".join(filter(None, [self.asr_text, segment]))
+                partial = ""
+            else:
+                partial = json.loads(self.asr_recognizer.PartialResult()).get("partial", "")
+            self.asr_samples += len(audio_16k)
+            self.asr_partial = " ".join(filter(None, [self.asr_text, partial]))
+            return self.asr_partial
+    
+    def finish_streaming_asr(self, recognizer, asr_samples, asr_text=""):
+        """Finalize the live recognizer, returns the transcript"""
+        if asr_samples == 0:
+            self.log("No audio data recorded", "WARN")
+            return ""
+        
+        start = time.time()
+        result = json.loads(recognizer.FinalResult())
+        self.log(f"Streaming ASR finalized {asr_samples/16000:.1f}s of audio in {(time.time() - start)*1000:.0f}ms")
+        return " ".join(filter(None, [asr_text, result.get("text", "")])).strip()
+    
+    def save_audio_buffer_to_wav(self, audio_16k, wav_path):
+        """Write recorded ring audio (already resampled to 16kHz) to WAV file"""
+        with wave.open(wav_path, 'wb') as wf:
             wf.setnchannels(1)  # Mono
             wf.setsampwidth(2)  # 16-bit
-            wf.setframerate(16000)  # 16kHz
-            wf.writeframes(audio_16k.astype(np.int16).tobytes())
+            wf.setframerate(TARGET_RATE)  # 16kHz
+            wf.writeframes(audio_16k.tobytes())
         
-        self.log(f"Saved {len(audio_48k)/48000:.1f}s of audio to {self.current_audio_file}")
+        self.log(f"Saved {len(audio_16k)/TARGET_RATE:.1f}s of audio to {wav_path}")
     
-    def transcribe_audio(self):
-        """Transcribe audio with VOSK"""
-        self.set_state(State.TRANSCRIBING)
-        self.update_display("transcribing", "🔄 Transcribing...")
-        
+    def transcribe_audio(self, wav_path):
+        """Transcribe a WAV file with VOSK, returns the transcript"""
         try:
             # Open audio file
-            wf = wave.open(self.current_audio_file, "rb")
-            
-            # Check format
-            if wf.getnchannels() != 1 or wf.getsampwidth() != 2:
-                self.log("Audio format must be mono PCM WAV", "ERROR")
-                self.set_state(State.IDLE)
-                return
-            
-            # Create recognizer
-            rec = KaldiRecognizer(self.vosk_model, wf.getframerate())
-            rec.SetWords(True)
-            
-            # Process audio
-            while True:
-                data = wf.readframes(4000)
-                if len(data) == 0:
-                    break
-                rec.AcceptWaveform(data)
+            with wave.open(wav_path, "rb") as wf:
+                # Check format
+                if wf.getnchannels() != 1 or wf.getsampwidth() != 2:
+                    raise ValueError("Audio format must be mono PCM WAV")
+                
+                # Create recognizer
+                rec = KaldiRecognizer(self.vosk_model, wf.getframerate())
+                rec.SetWords(True)
+                
+                # Process audio
+                while True:
+                    data = wf.readframes(4000)
+                    if len(data) == 0:
+                        break
+                    rec.AcceptWaveform(data)
             
             # Get final result
             result = json.loads(rec.FinalResult())
-            transcribed_text = result.get("text", "").strip()
-            
-            if transcribed_text:
-                self.log(f"Transcribed: {transcribed_text}")
-                self.update_display("transcribing", transcribed_text)
-                self.answer_question(transcribed_text)
+            return result.get("text", "").strip()
+        finally:
+            # Clean up audio file
+            if os.path.exists(wav_path):
+                os.remove(wav_path)
+    
+    def run_asr_job(self, job):
+        """ASR stage: recording -> transcript, then hand the job to the LLM stage"""
+        self.set_state(State.TRANSCRIBING)
+        try:
+            if job.recognizer is not None:
+                text = self.finish_streaming_asr(job.recognizer, job.asr_samples, job.asr_text)
+                job.recognizer = None
             else:
-                self.log("No speech detected", "WARN")
-                self.update_qa_display(clear=True)  # FIX: Clear listening indicator
-                # Return to wake listening if enabled, otherwise IDLE
-                if self.wake_word_enabled:
-                    # Add cooldown to prevent wake word from immediately re-triggering
-                    self.tts_cooldown_until = time.time() + 1.0
-                    self.log("Setting 1s cooldown to prevent wake word re-trigger")
-                    self.set_state(State.WAKE_LISTENING)
+                # WAV path (streaming ASR disabled)
+                self.save_audio_buffer_to_wav(job.audio, job.wav_path)
+                job.audio = None
+                file_size = os.path.getsize(job.wav_path)
+                if file_size < 1000:  # Less than 1KB
+                    self.log(f"Recording too small ({file_size} bytes), no usable audio", "WARN")
+                    os.remove(job.wav_path)
+                    text = ""
                 else:
-                    self.set_state(State.IDLE)
-                
+                    text = self.transcribe_audio(job.wav_path)
         except Exception as e:
             self.log(f"Transcription failed: {e}", "ERROR")
             self.update_qa_display(clear=True)  # FIX: Clear listening indicator
             self.set_state(State.IDLE)
-        finally:
-            # Clean up audio file
-            if self.current_audio_file and os.path.exists(self.current_audio_file):
-                os.remove(self.current_audio_file)
+            return
+        
+        job.mark("transcribed")
+        self.handle_transcript(job, text)
     
-    def answer_question(self, question):
-        """Get answer from LLM with tool calling support"""
+    def handle_transcript(self, job, transcribed_text):
+        """Queue a transcript for answering, or return to listening if nothing was said"""
+        if transcribed_text:
+            self.log(f"Transcribed: {transcribed_text}")
+            self.update_display("transcribing", transcribed_text)
+            job.transcript = transcribed_text
+            if self.llm_stage.submit(job):
+                return
+            self.update_qa_display(clear=True)
+            self.set_state(State.WAKE_LISTENING if self.wake_word_enabled else State.IDLE)
+        else:
+            self.log("No speech detected", "WARN")
+            # False wake - no LLM request is coming
+            if self.warmup:
+                self.warmup.cancel()
+            self.update_qa_display(clear=True)  # FIX: Clear listening indicator
+            # Return to wake listening if enabled, otherwise IDLE
+            if self.wake_word_enabled:
+                # Add cooldown to prevent wake word from immediately re-triggering
+                self.tts_cooldown_until = time.time() + 1.0
+                self.log("Setting 1s cooldown to prevent wake word re-trigger")
+                self.set_state(State.WAKE_LISTENING)
+            else:
+                self.set_state(State.IDLE)
+    
+    def run_llm_job(self, job):
+        """LLM stage: transcript (or camera trigger) -> answer text for the TTS stage"""
+        if job.kind == 'camera':
+            self.capture_camera(job)
+        else:
+            self.answer_question(job.transcript, job)
+    
+    def answer_question(self, question, job=None):
+        """Get answer from LLM with tool calling support (spoken by the TTS stage)"""
         self.set_state(State.ANSWERING)
         self.update_display("answering", "🤔 Thinking...")
         
@@ -520,24 +864,35 @@ class AIChatBot:
         timeout = int(self.config['behavior']['chat_history_timeout'])
         if time.time() - self.last_interaction_time > timeout:
             self.log("Resetting conversation history (timeout)")
-            self.conversation_history = []
+            self.reset_history()
         
         # Update last interaction time
         self.last_interaction_time = time.time()
         
-        # Add to conversation history
-        self.conversation_history.append({"role": "user", "content": question})
+        # Add to conversation history (append-only so the prompt prefix stays stable)
+        self.append_history("user", question)
         
         # Store and display current question
         self.current_question = question
         self.update_qa_display(question=question)
         
-        # Limit history
-        max_history = int(self.config['behavior']['max_history_messages'])
-        if len(self.conversation_history) > max_history:
-            self.conversation_history = self.conversation_history[-max_history:]
-        
         try:
+            # OPTIMIZATION: Command already fired from a partial transcript while the user spoke
+            early = job.early_intent if job else None
+            if early:
+                if early.confirms(question):
+                    result = early.wait_result()
+                    self.invalidate_cached_answers(early.call[0])
+                    self.log(f"Final transcript confirms early {early.category}: {result}")
+                    self.append_history("assistant", result)
+                    self.update_qa_display(question=self.current_question, answer=result)
+                    self.speak_answer(result, job)
+                    return
+                # Stop the early motion so the final command replaces it rather than adding to it
+                withdrawn = early.withdraw()
+                self.log(f"Final transcript '{question}' differs from early {early.category} "
+                         f"('{early.text}'), withdrew it ({withdrawn}) and handling it normally", "WARN")
+            
             # STAGE 1: Detect command CATEGORY using regex (loose matching)
             command_category = None
             if detect_command_category:
@@ -547,7 +902,7 @@ class AIChatBot:
                 # OPTIMIZATION: Camera command can bypass LLM (no parameters, instant trigger)
                 if command_category == 'CAMERA_COMMAND':
                     self.log("Camera command - executing directly (no LLM needed)")
-                    self.capture_camera()
+                    self.capture_camera(job)
                     return
                 
                 # OPTIMIZATION: Motor stop/explore bypass LLM (no parameters, prevents AI confusion)
@@ -555,80 +910,43 @@ class AIChatBot:
                     self.log("Motor STOP command - executing directly (no LLM needed)")
                     from system_tools import motor_stop
                     result = motor_stop()
-                    self.conversation_history.append({"role": "assistant", "content": result})
+                    self.append_history("assistant", result)
                     self.update_qa_display(question=self.current_question, answer=result)
-                    self.speak_answer(result)
+                    self.speak_answer(result, job)
                     return
                 
                 if command_category == 'MOTOR_EXPLORE':
                     self.log("Motor EXPLORE command - executing directly (no LLM needed)")
                     from system_tools import motor_explore
                     result = motor_explore()
-                    self.conversation_history.append({"role": "assistant", "content": result})
+                    self.append_history("assistant", result)
+                    self.update_qa_display(question=self.current_question, answer=result)
+                    self.speak_answer(result, job)
+                    return
+                
+                # OPTIMIZATION: Deterministic slot filling for simple commands
+                # ("what time is it", "set volume to 30", "turn left 90 degrees")
+                parsed = parse_command(question, command_category) if parse_command and execute_tool else None
+                if parsed:
+                    func_name, func_args = parsed
+                    start = time.time()
+                    result = execute_tool(func_name, func_args)
+                    self.invalidate_cached_answers(func_name)
+                    self.log(f"Parsed {command_category} directly (no LLM needed): {func_name}({func_args}) in {(time.time() - start)*1000:.0f}ms")
+                    self.log(f"Result: {result}")
+                    self.append_history("assistant", result)
                     self.update_qa_display(question=self.current_question, answer=result)
-                    self.speak_answer(result)
+                    self.speak_answer(result, job)
                     return
                 
-                # STAGE 2: For all other commands, use AI WITH tools to parse details
-                # (TIME, DATE, VOLUME, SHUTDOWN all need LLM for typo handling)
+                # STAGE 2: Ambiguous commands use AI WITH tools to parse details
+                # (relative volume changes, unusual units, SHUTDOWN confirmation)
                 self.log(f"Command category detected: {command_category} (needs LLM parsing)")
                 
-                # Try network Ollama first if configured
-                if self.use_network_ollama:
-                    text_model = self.config['ollama']['network_text_model']
-                    self.log(f"Using network Ollama for command: {text_model}")
-                    
-                    try:
-                        response = self.ollama_client.chat(
-                            model=text_model,
-                            messages=[
-                                {
-                                    'role': 'system',
-                                    'content': 'You are a robot assistant. The user is giving you a system command. Use the available tools to execute it. Handle variations and typos intelligently (e.g., "too" → "to", "fifty" → 50).'
-                                },
-                                {
-                                    'role': 'user',
-                                    'content': question
-                                }
-                            ],
-                            tools=TOOL_DEFINITIONS,
-                            options={
-                                'num_ctx': 2048,
-                                'temperature': 0.3,
-                                'num_predict': 80
-                            }
-                        )
-                        self.log("Network Ollama success")
-                    
-                    except (ConnectionError, TimeoutError, Exception) as e:
-                        # Network failed - fall back to local
-                        self.log(f"Network Ollama failed: {e}, falling back to local", "WARN")
-                        text_model = self.config['llm']['text_model']
-                        
-                        response = ollama.chat(
-                            model=text_model,
-                            messages=[
-                                {
-                                    'role': 'system',
-                                    'content': 'You are a robot assistant. The user is giving you a system command. Use the available tools to execute it. Handle variations and typos intelligently (e.g., "too" → "to", "fifty" → 50).'
-                                },
-                                {
-                                    'role': 'user',
-                                    'content': question
-                                }
-                            ],
-                            tools=TOOL_DEFINITIONS,
-                            options={
-                                'num_ctx': 2048,
-                                'temperature': 0.3,
-                                'num_predict': 80
-                            }
-                        )
-                        self.log(f"Local Ollama fallback success: {text_model}")
-                else:
-                    # Use local Ollama directly
-                    text_model = self.config['llm']['text_model']
-                    response = ollama.chat(
+                def command_request(backend):
+                    text_model = self.config['llm']['text_model'] if backend.local else self.config['ollama']['network_text_model']
+                    self.log(f"Using {'local' if backend.local else 'network'} Ollama for command: {text_model} ({backend.host})")
+                    return backend.client.chat(
                         model=text_model,
                         messages=[
                             {
@@ -641,6 +959,7 @@ class AIChatBot:
                             }
                         ],
                         tools=TOOL_DEFINITIONS,
+                        keep_alive=self.model_keep_alive(text_model),
                         options={
                             'num_ctx': 2048,
                             'temperature': 0.3,
@@ -648,6 +967,14 @@ class AIChatBot:
                         }
                     )
                 
+                # Network hosts first (fastest healthy one), local as fallback
+                _, response = self.ollama_pool.run(command_request, "command")
+                
+                # Interrupted while the model was parsing - don't act on it
+                if job and job.is_cancelled():
+                    self.log(f"Command dropped ({job.cancel_reason})")
+                    return
+                
                 # Check if AI returned tool calls
                 if 'tool_calls' in response.get('message', {}) and execute_tool:
                     tool_calls = response['message']['tool_calls']
@@ -664,117 +991,75 @@ class AIChatBot:
                         # Special handling for camera
                         if func_name == 'take_picture':
                             self.log("Tool: take_picture - triggering camera")
-                            self.capture_camera()
+                            self.capture_camera(job)
                             return  # Camera handles the rest
                         
                         # Execute other tools
                         result = execute_tool(func_name, func_args)
+                        self.invalidate_cached_answers(func_name)
                         self.log(f"Result: {result}")
                         tool_results.append(result)
                     
                     # Speak combined results
                     if tool_results:
                         combined_result = ". ".join(tool_results)
-                        self.conversation_history.append({"role": "assistant", "content": combined_result})
+                        self.append_history("assistant", combined_result)
                         self.update_qa_display(question=self.current_question, answer=combined_result)
-                        self.speak_answer(combined_result)
+                        self.speak_answer(combined_result, job)
                     else:
                         self.set_state(State.IDLE)
                 else:
                     # AI couldn't parse the command - fallback to best guess
                     self.log("AI couldn't parse command, asking for clarification", "WARN")
                     fallback_msg = "I detected a command but couldn't understand the details. Please try again."
-                    self.conversation_history.append({"role": "assistant", "content": fallback_msg})
+                    self.append_history("assistant", fallback_msg)
                     self.update_qa_display(question=self.current_question, answer=fallback_msg)
-                    self.speak_answer(fallback_msg)
+                    self.speak_answer(fallback_msg, job)
             
             else:
                 # NOT a command - regular question, use AI WITHOUT tools
                 self.log("Regular question detected (no command category)")
                 
-                # Try network Ollama first if configured
-                if self.use_network_ollama:
-                    text_model = self.config['ollama']['network_text_model']
-                    self.log(f"Using network Ollama for chat: {text_model}")
-                    
-                    try:
-                        response = self.ollama_client.chat(
-                            model=text_model,
-                            messages=[
-                                {
-                                    'role': 'system',
-                                    'content': 'You are a helpful robot. Give direct, concise answers. Maximum 2 sentences. No extra formatting or explanations.'
-                                },
-                                {
-                                    'role': 'user',
-                                    'content': question
-                                }
-                            ],
-                            options={
-                                'num_ctx': 2048,
-                                'temperature': 0.7,
-                                'num_predict': 50
-                            }
-                        )
-                        self.log("Network Ollama success")
-                    
-                    except (ConnectionError, TimeoutError, Exception) as e:
-                        # Network failed - fall back to local
-                        self.log(f"Network Ollama failed: {e}, falling back to local", "WARN")
-                        text_model = self.config['llm']['text_model']
-                        
-                        response = ollama.chat(
-                            model=text_model,
-                            messages=[
-                                {
-                                    'role': 'system',
-                                    'content': 'You are a helpful robot. Give direct, concise answers. Maximum 2 sentences. No extra formatting or explanations.'
-                                },
-                                {
-                                    'role': 'user',
-                                    'content': question
-                                }
-                            ],
-                            options={
-                                'num_ctx': 2048,
-                                'temperature': 0.7,
-                                'num_predict': 50
-                            }
-                        )
-                        self.log(f"Local Ollama fallback success: {text_model}")
-                else:
-                    # Use local Ollama directly
-                    text_model = self.config['llm']['text_model']
-                    response = ollama.chat(
-                        model=text_model,
-                        messages=[
-                            {
-                                'role': 'system',
-                                'content': 'You are a helpful robot. Give direct, concise answers. Maximum 2 sentences. No extra formatting or explanations.'
-                            },
-                            {
-                                'role': 'user',
-                                'content': question
-                            }
-                        ],
-                        options={
-                            'num_ctx': 2048,
-                            'temperature': 0.7,
-                            'num_predict': 50
-                        }
-                    )
+                # Repeated self-contained questions are answered from cache
+                # (command categories never get here, so tool/stateful intents are never cached).
+                # The key is the question alone, so only first turns of a conversation
+                # use it: later answers are generated with, and may depend on, history
+                with self.history_lock:
+                    first_turn = len(self.conversation_history) == 1 and not self.conversation_summary
+                cache_key = self.answer_cache.key(question) if self.answer_cache and first_turn else None
+                cached_answer = self.answer_cache.get(cache_key) if cache_key else None
+                if cached_answer:
+                    self.log(f"Answer cache hit: '{cache_key}'")
+                    self.append_history("assistant", cached_answer)
+                    self.update_qa_display(question=self.current_question, answer=cached_answer)
+                    self.speak_answer(cached_answer, job)
+                    return
                 
-                # Regular chat response
-                answer = response['message']['content']
-                answer = answer.strip()
+                # Multi-turn: system + summary + history (current question is last)
+                messages = self.build_chat_messages()
                 
-                if answer and len(answer) > 10:
+                # STREAMING: speak each sentence as soon as the model finishes it
+                chunks = self.stream_chat(
+                    self.config['ollama']['network_text_model'],
+                    self.config['llm']['text_model'],
+                    messages,
+                    CHAT_OPTIONS,
+                    job=job
+                )
+                answer = self.speak_streamed_answer(chunks, question=self.current_question, job=job)
+                
+                if job and job.is_cancelled():
+                    # Keep what was said so the conversation stays coherent, but never cache it
+                    self.log(f"Answer interrupted ({job.cancel_reason}): {answer}")
+                    if answer:
+                        self.append_history("assistant", answer)
+                elif answer:
                     self.log(f"Answer: {answer}")
-                    self.conversation_history.append({"role": "assistant", "content": answer})
-                    self.update_qa_display(question=self.current_question, answer=answer)
-                    self.speak_answer(answer)
+                    self.append_history("assistant", answer)
+                    if cache_key:
+                        self.answer_cache.put(cache_key, answer, question)
                 else:
-                    self.log(f"No valid answer (got: {response['message']['content'][:100]})", "WARN")
+                    self.log("No valid answer (empty response)", "WARN")
                     self.set_state(State.IDLE)
                 
         except Exception as e:
@@ -782,48 +1067,324 @@ class AIChatBot:
             import traceback
             self.log(traceback.format_exc(), "ERROR")
             self.set_state(State.IDLE)
+        finally:
+            # Compact old turns in the background, after the answer was spoken
+            self.maybe_compact_history()
+    
+    def invalidate_cached_answers(self, tool_name):
+        """Drop cached answers made stale by a tool call"""
+        if self.answer_cache:
+            dropped = self.answer_cache.invalidate_for_tool(tool_name)
+            if dropped:
+                self.log(f"Invalidated {dropped} cached answer(s) after {tool_name}")
+    
+    def append_history(self, role, content):
+        """Append one message (append-only so the prompt prefix stays stable)"""
+        with self.history_lock:
+            self.conversation_history.append({"role": role, "content": content})
+    
+    def reset_history(self):
+        """Forget conversation history and running summary"""
+        with self.history_lock:
+            self.conversation_history = []
+            self.conversation_summary = ""
+    
+    def chat_system_message(self):
+        """System prompt, plus running summary of compacted turns if any"""
+        content = CHAT_SYSTEM_PROMPT
+        if self.conversation_summary:
+            content += f"\nSummary of the earlier conversation: {self.conversation_summary}"
+        return {'role': 'system', 'content': content}
+    
+    def build_chat_messages(self):
+        """Messages for a chat request
+        
+        History is only ever appended to between compactions, so consecutive
+        requests share a byte-identical prefix and Ollama reuses its KV cache.
+        """
+        with self.history_lock:
+            return [self.chat_system_message()] + list(self.conversation_history)
+    
+    def history_tokens(self):
+        with self.history_lock:
+            return sum(estimate_tokens(m['content']) for m in self.conversation_history) + \
+                estimate_tokens(self.chat_system_message()['content'])
+    
+    def maybe_compact_history(self):
+        """Start background compaction when history nears its budget
+        
+        Compaction starts at compact_at of both num_ctx and max_history_messages.
+        If summaries fail or can't keep up, the oldest messages are dropped here
+        so history never grows past max_history_messages.
+        """
+        compact_at = float(self.config['behavior']['compact_at'])
+        max_history = int(self.config['behavior']['max_history_messages'])
+        with self.history_lock:
+            excess = len(self.conversation_history) - max_history
+            if excess > 0:
+                self.conversation_history = self.conversation_history[excess:]
+                self.log(f"History over {max_history} messages, dropped {excess} oldest", "WARN")
+            if self.compacting:
+                return
+            tokens = sum(estimate_tokens(m['content']) for m in self.conversation_history) + \
+                estimate_tokens(self.chat_system_message()['content'])
+            if len(self.conversation_history) <= max_history * compact_at and \
+                    tokens <= CHAT_OPTIONS['num_ctx'] * compact_at:
+                return
+            self.compacting = True
+        threading.Thread(target=self.compact_history, daemon=True).start()
+    
+    def compact_history(self):
+        """Fold the oldest half of the history into the running summary
+        
+        Compacting in one larger step (instead of dropping one message per
+        turn) means the prompt prefix only changes at compaction time.
+        """
+        try:
+            with self.history_lock:
+                count = max(2, len(self.conversation_history) // 2)
+                old_turns = self.conversation_history[:count]
+                old_summary = self.conversation_summary
+            if not old_turns:
+                return
+            
+            transcript = "\n".join(f"{m['role']}: {m['content']}" for m in old_turns)
+            prompt = (f"Previous summary: {old_summary}\n\n" if old_summary else "") + \
+                f"Conversation:\n{transcript}\n\nSummarize the facts above in at most 2 short sentences."
+            
+            def summary_request(backend):
+                model = self.config['llm']['text_model'] if backend.local else self.config['ollama']['network_text_model']
+                return backend.client.chat(
+                    model=model,
+                    messages=[{'role': 'user', 'content': prompt}],
+                    keep_alive=self.model_keep_alive(model),
+                    options={
+                        'num_ctx': CHAT_OPTIONS['num_ctx'],
+                        'temperature': 0.3,
+                        'num_predict': 80
+                    }
+                )
+            
+            start = time.time()
+            try:
+                _, response = self.ollama_pool.run(summary_request, "summary")
+                summary = response['message']['content'].strip()
+            except Exception as e:
+                # Without a summary the old turns are simply dropped
+                self.log(f"History summary failed, dropping old turns: {e}", "WARN")
+                summary = old_summary
+            
+            with self.history_lock:
+                # History may have been reset or trimmed meanwhile
+                if self.conversation_history[:count] != old_turns:
+                    return
+                self.conversation_history = self.conversation_history[count:]
+                self.conversation_summary = summary
+            self.log(f"Compacted {count} messages into summary in {time.time() - start:.1f}s")
+        finally:
+            self.compacting = False
 
     
-    def speak_answer(self, text):
-        """Convert text to speech and play"""
+    def speak_answer(self, text, job=None):
+        """Queue text for the TTS stage (returns without waiting for playback)"""
+        job = job or Job('speech')
+        self.queue_speech(job, text)
+        self.end_speech(job)
+    
+    def queue_speech(self, job, sentence):
+        """Hand one sentence to the TTS stage; the first one submits the job"""
+        if not job.speaking:
+            job.speaking = True
+            job.mark("first_sentence")
+            if not self.tts_stage.submit(job):
+                # Nothing will speak this job or leave the state it set: stop the
+                # answer feeding it and go back to listening
+                job.cancel("tts_full")
+                job.speech_finished(ok=False)
+                self.update_qa_display(clear=True)
+                self.set_state(State.WAKE_LISTENING if self.wake_word_enabled else State.IDLE)
+                return
+        job.sentences.put(sentence)
+    
+    def end_speech(self, job):
+        """No more sentences for this job"""
+        if job.speaking:
+            job.sentences.put(None)
+    
+    def run_tts_job(self, job):
+        """TTS stage: speak a job's sentences as they arrive, then leave SPEAKING"""
+        ok = False
+        try:
+            ok = self.speak_job(job)
+        finally:
+            job.speech_finished(ok)
+    
+    def speak_job(self, job):
+        """Play a job's sentences, returns False if TTS failed"""
+        ok = True
+        started = False
+        while not job.is_cancelled():
+            sentence = job.sentences.get()
+            if sentence is None or job.is_cancelled():
+                break
+            if not started:
+                started = True
+                self.begin_speaking(sentence)
+                job.mark("first_audio")
+            # Persistent engine queues the audio, so the next sentence synthesizes while this one plays
+            if ok and not self.speak_sentence(sentence, wait=False, cancel=job.cancelled):
+                ok = False
+        # Wait for the last queued sentence to finish playing (returns early on barge-in)
+        if self.tts:
+            self.tts.wait_done(job.cancelled)
+        if job.is_cancelled():
+            # barge_in() already silenced output and moved the state on
+            self.log(f"Speech cancelled ({job.cancel_reason})")
+        else:
+            job.mark("spoken")
+            self.finish_speaking(ok)
+        self.log(job.summary())
+        self.last_job = job
+        return ok
+    
+    def begin_speaking(self, text):
+        """Enter SPEAKING state (wake word stays live, gated on our output level)"""
         self.set_state(State.SPEAKING)
         self.update_display("speaking", text)
         
-        try:
-            # ⚠️ CRITICAL: Mute wake word detection during TTS to prevent audio feedback loop
+        # ⚠️ CRITICAL: Without barge-in, mute wake word detection during TTS to prevent audio feedback loop
+        if not self.barge_in_enabled:
             self.wake_word_paused = True
             self.log("Wake word detection PAUSED (speaking)")
-            
-            # Use 'speak' command (Piper TTS wrapper)
-            subprocess.run(['speak', text], timeout=30)
-            
+    
+    def speak_sentence(self, text, wait=True, cancel=None):
+        """Synthesize and play one piece of text, returns False on failure
+        
+        With wait=False the persistent engine returns once audio is queued, so
+        the next sentence can be synthesized while this one plays. Setting the
+        cancel event stops the 'speak' fallback and skips queuing audio.
+        """
+        try:
+            if self.tts:
+                self.tts.say(text, wait=wait, cancel=cancel)
+            else:
+                # Use 'speak' command (Piper TTS wrapper), killed on barge-in
+                proc = subprocess.Popen(['speak', text])
+                deadline = time.time() + 30
+                while proc.poll() is None:
+                    if cancel is not None and cancel.is_set():
+                        proc.kill()
+                        break
+                    if time.time() > deadline:
+                        proc.kill()
+                        raise subprocess.TimeoutExpired('speak', 30)
+                    time.sleep(0.02)
+            return True
+        except subprocess.TimeoutExpired:
+            self.log("TTS timeout", "ERROR")
+        except Exception as e:
+            self.log(f"TTS failed: {e}", "ERROR")
+        return False
+    
+    def finish_speaking(self, ok=True):
+        """Leave SPEAKING state, unmute wake word detection after a cooldown"""
+        if ok:
             self.log("Finished speaking")
             
             # ⚠️ CRITICAL: Add cooldown to prevent TTS audio from triggering wake word
             cooldown_seconds = 1.5  # Wait 1.5 seconds before accepting wake words
             self.tts_cooldown_until = time.time() + cooldown_seconds
             self.log(f"Wake word cooldown for {cooldown_seconds}s")
-            
-            # ⚠️ CRITICAL: Unmute wake word detection after TTS
+        
+        # ⚠️ CRITICAL: Unmute wake word detection after TTS
+        if self.wake_word_paused:
             self.wake_word_paused = False
             self.log("Wake word detection RESUMED")
+        
+        # Return to wake listening if wake word enabled, otherwise IDLE
+        if self.wake_word_enabled:
+            self.set_state(State.WAKE_LISTENING)
+        else:
+            self.set_state(State.IDLE)
+    
+    def stream_chat(self, network_model, local_model, messages, options, job=None):
+        """Yield answer text as Ollama generates it (fastest healthy network host, local fallback)
+        
+        Cancelling the job aborts the request wherever it is, prefill included.
+        """
+        def chat_request(backend):
+            model = local_model if backend.local else network_model
+            self.log(f"Using {'local' if backend.local else 'network'} Ollama (streaming): {model} ({backend.host})")
+            stream = backend.chat_stream(model, messages, options, keep_alive=self.model_keep_alive(model))
+            if job:
+                job.on_cancel(stream.abort)
+            try:
+                stream.start()
+                # Connection errors surface on the first chunk - fall back before anything is spoken
+                return stream, next(stream, None)
+            except Exception:
+                stream.close()
+                raise
+        
+        try:
+            _, (stream, first) = self.ollama_pool.run(chat_request, "chat",
+                                                      cancelled=job.cancelled if job else None)
+        except Exception:
+            if job and job.is_cancelled():
+                self.log(f"Chat request aborted ({job.cancel_reason})")
+                return
+            raise
+        
+        try:
+            if first is not None:
+                yield first.get('message', {}).get('content', '')
+            for chunk in stream:
+                yield chunk.get('message', {}).get('content', '')
+        except Exception:
+            if not (job and job.is_cancelled()):
+                raise
+        finally:
+            # Closing the connection (e.g. on barge-in) makes Ollama stop generating
+            stream.close()
+    
+    def speak_streamed_answer(self, chunks, question=None, job=None):
+        """Cut streamed LLM text into sentences and pass each to the TTS stage while generation continues
+        
+        Returns the full answer text (empty string if the model produced nothing).
+        """
+        job = job or Job('speech')
+        answer = ""
+        pending = ""
+        start = time.time()
+        
+        def emit(sentence):
+            if not job.speaking:
+                self.log(f"First sentence ready after {time.time() - start:.2f}s")
+            self.update_qa_display(question=question, answer=answer.strip())
+            self.queue_speech(job, sentence)
+        
+        try:
+            for text in chunks:
+                if job.is_cancelled():
+                    # Barge-in: drop the connection so the server stops generating too
+                    chunks.close()
+                    self.log(f"LLM stream aborted ({job.cancel_reason})")
+                    break
+                answer += text
+                pending += text
+                done, pending = split_sentences(pending)
+                for sentence in done:
+                    emit(sentence)
             
-            # Return to wake listening if wake word enabled, otherwise IDLE
-            if self.wake_word_enabled:
-                self.set_state(State.WAKE_LISTENING)
-            else:
-                self.set_state(State.IDLE)
-            
-        except subprocess.TimeoutExpired:
-            self.log("TTS timeout", "ERROR")
-            self.wake_word_paused = False  # Unmute on error
-            self.set_state(State.WAKE_LISTENING if self.wake_word_enabled else State.IDLE)
-        except Exception as e:
-            self.log(f"TTS failed: {e}", "ERROR")
-            self.wake_word_paused = False  # Unmute on error
-            self.set_state(State.WAKE_LISTENING if self.wake_word_enabled else State.IDLE)
+            # Whatever is left after the stream ends is the last sentence
+            if pending.strip():
+                emit(pending.strip())
+        finally:
+            self.end_speech(job)
+        
+        return answer.strip()
     
-    def capture_camera(self):
+    def capture_camera(self, job=None):
         """Capture image and describe it"""
         if self.config['camera']['enable'].lower() != 'true':
             self.log("Camera disabled in config", "WARN")
@@ -879,7 +1440,7 @@ class AIChatBot:
                 self.log(f"Failed to create photo symlink: {e}", "WARN")
             
             # Describe image with vision model
-            self.describe_image(image_path)
+            self.describe_image(image_path, job)
             
         except subprocess.TimeoutExpired:
             self.log("Camera capture timeout", "ERROR")
@@ -888,91 +1449,38 @@ class AIChatBot:
             self.log(f"Camera capture failed: {e}", "ERROR")
             self.set_state(State.IDLE)
     
-    def describe_image(self, image_path):
+    def describe_image(self, image_path, job=None):
         """Use vision model to describe image"""
         self.set_state(State.ANSWERING)
         self.update_display("answering", "🤔 Analyzing image...")
         
         # Use consistent prompt for length control
         prompt = "Describe this image. Keep the answer to maximum 1 or 2 sentences."
-        description = None
         
         try:
-            # Try network Ollama first if configured
-            if self.use_network_ollama:
-                vision_model = self.config['ollama']['network_vision_model']
-                timeout = int(self.config['ollama']['network_timeout'])
-                
-                self.log(f"Trying network Ollama with model: {vision_model}")
-                
-                try:
-                    response = self.ollama_client.chat(
-                        model=vision_model,
-                        messages=[
-                            {
-                                'role': 'user',
-                                'content': prompt,
-                                'images': [image_path]
-                            }
-                        ],
-                        options={
-                            'num_ctx': 2048,
-                            'temperature': 0.7
-                        }
-                    )
-                    description = response['message']['content'].strip()
-                    self.log(f"Network Ollama success: {description[:50]}...")
-                    
-                except (ConnectionError, TimeoutError, Exception) as network_error:
-                    # Network failed, fall back to local
-                    self.log(f"Network Ollama failed: {network_error}", "WARN")
-                    self.log("Falling back to local Ollama...", "WARN")
-                    
-                    # Use local moondream as fallback
-                    vision_model = self.config['llm']['vision_model']
-                    response = ollama.chat(
-                        model=vision_model,
-                        messages=[
-                            {
-                                'role': 'user',
-                                'content': prompt,
-                                'images': [image_path]
-                            }
-                        ],
-                        options={
-                            'num_ctx': 2048,
-                            'temperature': 0.7
-                        }
-                    )
-                    description = response['message']['content'].strip()
-                    self.log(f"Local Ollama fallback success: {description[:50]}...")
-            else:
-                # Use local Ollama directly
-                vision_model = self.config['llm']['vision_model']
-                self.log(f"Using local Ollama with model: {vision_model}")
-                
-                response = ollama.chat(
-                    model=vision_model,
-                    messages=[
-                        {
-                            'role': 'user',
-                            'content': prompt,
-                            'images': [image_path]
-                        }
-                    ],
-                    options={
-                        'num_ctx': 2048,
-                        'temperature': 0.7
+            chunks = self.stream_chat(
+                self.config['ollama']['network_vision_model'],
+                self.config['llm']['vision_model'],
+                [
+                    {
+                        'role': 'user',
+                        'content': prompt,
+                        'images': [image_path]
                     }
-                )
-                description = response['message']['content'].strip()
-                self.log(f"Local Ollama success: {description[:50]}...")
+                ],
+                {
+                    'num_ctx': 2048,
+                    'temperature': 0.7
+                },
+                job=job
+            )
+            # Update Q&A display with answer (question was already shown at capture time)
+            description = self.speak_streamed_answer(chunks, job=job)
             
-            if description:
+            if job and job.is_cancelled():
+                self.log(f"Image description interrupted ({job.cancel_reason})")
+            elif description:
                 self.log(f"Image description: {description}")
-                # Update Q&A display with answer (question was already shown at capture time)
-                self.update_qa_display(answer=description)
-                self.speak_answer(description)
             else:
                 self.log("No description generated", "WARN")
                 self.set_state(State.IDLE)
@@ -981,6 +1489,44 @@ class AIChatBot:
             self.log(f"Vision model failed: {e}", "ERROR")
             self.set_state(State.IDLE)
     
+    def barge_in(self, reason):
+        """Cancel in-flight ASR/LLM/TTS jobs and silence output (K1, wake word, stop keyword)"""
+        start = time.time()
+        cancelled = sum(stage.cancel_all(reason) for stage in self.stages)
+        if self.tts:
+            self.tts.stop_playback()
+        self.barge_ins += 1
+        self.log(f"Barge-in ({reason}): cancelled {cancelled} job(s), output stopped in {(time.time() - start)*1000:.0f}ms")
+        
+        self.wake_word_paused = False
+        if self.wake_word_enabled:
+            self.set_state(State.WAKE_LISTENING)
+        else:
+            self.set_state(State.IDLE)
+    
+    def keyword_action(self, keyword, busy):
+        """Run a direct-action keyword - no recording, ASR or LLM involved"""
+        if keyword.action == 'stop':
+            # Emergency stop: straight to the motor socket, off the wake word thread
+            start = time.time()
+            def send_stop():
+                result = motor_stop() if motor_stop else "Motor control not available"
+                self.log(f"Keyword stop: {result} ({(time.time() - start)*1000:.0f}ms)")
+            threading.Thread(target=send_stop, daemon=True).start()
+        
+        if busy or (keyword.action == 'stop' and self.state == State.SPEAKING):
+            self.barge_in(f"{keyword.name}_keyword")
+    
+    def echo_gated(self, audio_16k):
+        """True if a mic chunk may be nothing but our own TTS output coming back"""
+        if not self.tts:
+            # 'speak' fallback: output level unknown, ignore the mic while speaking
+            return self.state == State.SPEAKING
+        if not self.tts.is_playing():
+            return False
+        mic_level = float(np.sqrt(np.mean(audio_16k.astype(np.float32) ** 2)))
+        return mic_level < self.echo_ratio * self.tts.output_level(self.output_latency)
+    
     def wake_word_detected_handler(self):
         """Called when wake word is detected by wake word thread"""
         self.log("🔔 Wake word detected!", "INFO")
@@ -1000,6 +1546,10 @@ class AIChatBot:
             # Start recording with wake word source
             self.set_state(State.WAKE_DETECTED)
             
+            # Overlap model load + system prompt prefill with the user speaking
+            if self.warmup:
+                self.warmup.trigger('wake_word')
+            
             # Play feedback sound to indicate wake word detected
             feedback_sound = self.config['wake_word']['feedback_sound']
             if os.path.exists(feedback_sound):
@@ -1013,29 +1563,35 @@ class AIChatBot:
             vad_enabled = self.config['wake_word'].getboolean('vad_enabled', fallback=True)
             if vad_enabled and VAD_AVAILABLE:
                 aggressiveness = int(self.config['wake_word'].get('vad_aggressiveness', 2))
-                self.vad = webrtcvad.Vad(aggressiveness)
-                self.last_speech_time = time.time()  # Assume wake word was speech
-                self.speech_started = False
+                self.endpointer = endpointer_from_config(
+                    webrtcvad.Vad(aggressiveness), self.config['wake_word'], log=self.log
+                )
                 self.log(f"VAD enabled (aggressiveness={aggressiveness})")
             else:
-                self.vad = None
+                self.endpointer = None
                 self.log("VAD disabled, using timer-based recording")
             
-            # Start recording command (uses PyAudio buffer)
-            self.audio_buffer = []
+            # Start recording command (ring buffer, includes pre-roll before the trigger)
+            self.recording_start_pos = self.audio_ring.mark(self.preroll_samples)
             self.recording_start_time = time.time()
+            if self.endpointer:
+                self.endpointer.start(self.recording_start_time)
             self.is_recording = True
             self.recording_source = 'wake_word'  # Track source for priority handling
             self.recording_duration = float(self.config['wake_word'].get('max_recording_time', 10))
+            self.start_streaming_asr()
             
             # Generate filename
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             self.current_audio_file = os.path.join(RECORDINGS_DIR, f"recording_{timestamp}.wav")
             
             self.set_state(State.LISTENING)
-            if self.vad:
-                silence_threshold = float(self.config['wake_word'].get('silence_threshold', 0.8))
-                self.log(f"Recording... (stop after {silence_threshold}s silence, max {self.recording_duration}s)")
+            if self.endpointer:
+                e = self.endpointer
+                if e.adaptive:
+                    self.log(f"Recording... (stop after {e.min_silence}-{e.max_silence}s silence, max {self.recording_duration}s)")
+                else:
+                    self.log(f"Recording... (stop after {e.silence_threshold}s silence, max {self.recording_duration}s)")
             else:
                 self.log(f"Recording command for {self.recording_duration}s...")
     
@@ -1054,129 +1610,68 @@ class AIChatBot:
                 self.log(f"Wake word model not found: {model_path}", "ERROR")
                 return
             
-            # Extract model name from path (e.g., hey_jarvis_v0.1.tflite -> hey_jarvis_v0.1)
-            model_name = os.path.basename(model_path).replace('.tflite', '')
-            threshold = float(self.config['wake_word'].get('threshold', 0.5))
-            
-            self.log(f"Loading wake word model from {model_path}")
-            oww_model = WakeWordModel(wakeword_model_paths=[model_path])
-            model_name = list(oww_model.models.keys())[0]
-            self.log(f"Loaded wake word model: {model_name} (threshold: {threshold})")
-            
-            # Initialize PyAudio
-            audio = pyaudio.PyAudio()
-            
-            # Find USB microphone (device 0: hw:0,0)
-            usb_device_index = 0
-            info = audio.get_device_info_by_index(usb_device_index)
-            self.log(f"Using audio device {usb_device_index}: {info['name']}")
+            # Silent room: skip inference on chunks within margin of the noise floor
+            if self.config['wake_word'].getboolean('gate_enabled', fallback=True):
+                chunk_ms = 1280 * 1000 / TARGET_RATE
+                self.noise_gate = NoiseFloorGate(
+                    margin_db=float(self.config['wake_word']['gate_margin_db']),
+                    hangover_chunks=int(int(self.config['wake_word']['gate_hangover_ms']) / chunk_ms),
+                    context_chunks=int(int(self.config['wake_word']['gate_context_ms']) / chunk_ms)
+                )
             
-            # Record at 48kHz (mic's native rate) and we'll decimate to 16kHz
-            NATIVE_RATE = 48000
-            TARGET_RATE = 16000
-            DECIMATION_FACTOR = NATIVE_RATE // TARGET_RATE  # = 3
+            # Wake word plus [keyword:*] models share one openwakeword Model (one feature pipeline)
+            keywords = load_keywords(self.config, log=self.log)
+            self.log(f"Loading {len(keywords)} keyword model(s): {', '.join(k.model_path for k in keywords)}")
+            self.spotter = KeywordSpotter(WakeWordModel, keywords, gate=self.noise_gate, log=self.log)
+            for keyword in keywords:
+                self.log(f"Loaded keyword '{keyword.name}': {keyword.model_name} (threshold: {keyword.threshold}, action: {keyword.action})")
             
-            stream = audio.open(
-                format=pyaudio.paInt16,
-                channels=1,
-                rate=NATIVE_RATE,  # Use mic's native 48kHz
-                input=True,
-                input_device_index=usb_device_index,
-                frames_per_buffer=1280 * DECIMATION_FACTOR  # Read 3x more samples (3840)
+            # Capture runs on its own thread (PyAudio callback): mic -> 16kHz -> ring + queues
+            # Record at 48kHz (mic's native rate), resampled once per chunk to 16kHz
+            queue_chunks = int(self.config['audio'].get('capture_queue_chunks', 25))
+            self.capture = AudioCapture(
+                self.audio_ring, self.resampler,
+                device_index=0,  # USB microphone (hw:0,0)
+                rate=NATIVE_RATE,
+                chunk_samples=1280 * DECIMATION_FACTOR,  # 3840 @ 48kHz = 1280 @ 16kHz (80ms)
+                log=self.log
             )
+            wake_queue = self.capture.subscribe('wake_word', queue_chunks)
+            # Recording consumer only gets chunks while a recording is active
+            recording_queue = self.capture.subscribe('recording', queue_chunks, when=lambda: self.is_recording)
+            self.capture.start()
+            
+            self.wake_cpu = CpuMeter()
             
             self.log("Wake word detection active - say wake phrase to activate")
             self.set_state(State.WAKE_LISTENING)
             self.wake_word_running = True
             
+            # VAD / end-of-speech runs on its own consumer thread so a slow
+            # stop_recording() (transcribe + answer) never stalls wake word scoring
+            self.recording_thread = threading.Thread(target=self.recording_loop, args=(recording_queue,), daemon=True)
+            self.recording_thread.start()
+            
             while self.wake_word_running:
-                # Always read audio from stream (never pause - needed for buffering)
+                audio_16k = wake_queue.get()
+                if audio_16k is None:
+                    continue
                 try:
-                    audio_data = stream.read(1280 * DECIMATION_FACTOR, exception_on_overflow=False)
-                    audio_array_48k = np.frombuffer(audio_data, dtype=np.int16)
-                    
-                    # If we're recording (wake word or K1 triggered), buffer the audio
-                    if self.is_recording:
-                        self.audio_buffer.append(audio_data)
-                        elapsed = time.time() - self.recording_start_time
-                        
-                        # VAD-based end-of-speech detection
-                        if self.vad:
-                            # Decimate to 16kHz for VAD (webrtcvad needs 8/16/32/48 kHz)
-                            audio_16k = audio_array_48k[::DECIMATION_FACTOR]
-                            audio_16k_bytes = audio_16k.tobytes()
-                            
-                            # webrtcvad needs 10/20/30ms frames at 16kHz
-                            # 16kHz * 0.020s = 320 samples = 640 bytes per 20ms frame
-                            FRAME_SIZE = 320  # samples per 20ms frame
-                            is_speech = False
-                            
-                            # Check if any frame in this chunk contains speech
-                            for i in range(0, len(audio_16k) - FRAME_SIZE, FRAME_SIZE):
-                                frame = audio_16k_bytes[i*2:(i+FRAME_SIZE)*2]  # 2 bytes per sample
-                                if len(frame) == FRAME_SIZE * 2:
-                                    try:
-                                        if self.vad.is_speech(frame, 16000):
-                                            is_speech = True
-                                            break
-                                    except:
-                                        pass
-                            
-                            if is_speech:
-                                self.last_speech_time = time.time()
-                                if not self.speech_started:
-                                    self.speech_started = True
-                                    self.log("Speech detected, listening...")
-                            
-                            # Check silence threshold (only after speech started)
-                            silence_threshold = float(self.config['wake_word'].get('silence_threshold', 0.8))
-                            silence_duration = time.time() - self.last_speech_time
-                            
-                            if self.speech_started and silence_duration >= silence_threshold:
-                                self.log(f"End of speech detected ({silence_duration:.1f}s silence)")
-                                # DEFENSIVE FIX: Wrap in try/except to ensure cleanup even if stop_recording fails
-                                try:
-                                    self.stop_recording()
-                                except Exception as e:
-                                    self.log(f"Error in stop_recording (VAD): {e}", "ERROR")
-                                    self.is_recording = False
-                                    self.update_qa_display(clear=True)
-                                    self.set_state(State.WAKE_LISTENING if self.wake_word_enabled else State.IDLE)
-                            elif elapsed >= self.recording_duration:
-                                self.log(f"Max recording time reached ({elapsed:.1f}s)")
-                                # DEFENSIVE FIX: Wrap in try/except to ensure cleanup even if stop_recording fails
-                                try:
-                                    self.stop_recording()
-                                except Exception as e:
-                                    self.log(f"Error in stop_recording (timeout): {e}", "ERROR")
-                                    self.is_recording = False
-                                    self.update_qa_display(clear=True)
-                                    self.set_state(State.WAKE_LISTENING if self.wake_word_enabled else State.IDLE)
-                        else:
-                            # Fallback: timer-based recording (no VAD)
-                            if elapsed >= self.recording_duration:
-                                self.log(f"Auto-stopping recording after {elapsed:.1f}s")
-                                # DEFENSIVE FIX: Wrap in try/except to ensure cleanup even if stop_recording fails
-                                try:
-                                    self.stop_recording()
-                                except Exception as e:
-                                    self.log(f"Error in stop_recording (fallback): {e}", "ERROR")
-                                    self.is_recording = False
-                                    self.update_qa_display(clear=True)
-                                    self.set_state(State.WAKE_LISTENING if self.wake_word_enabled else State.IDLE)
-                    
-                    # Only do wake word detection if in WAKE_LISTENING state and not in cooldown
-                    if self.state == State.WAKE_LISTENING and not self.wake_word_paused:
-                        # Decimate from 48kHz to 16kHz (take every 3rd sample)
-                        audio_array = audio_array_48k[::DECIMATION_FACTOR]
-                        
-                        # Feed to wake word model (now 16kHz, 1280 samples)
-                        prediction = oww_model.predict(audio_array)
+                    # Wake word detection in WAKE_LISTENING, and for barge-in while answering/speaking
+                    listening = self.state == State.WAKE_LISTENING and not self.wake_word_paused
+                    busy = self.barge_in_enabled and self.state in BARGE_IN_STATES
+                    # Direct-action keywords (e.g. "stop") are live in every state
+                    if listening or busy or self.spotter.direct_actions:
+                        # Feed to keyword models (16kHz, 1280 samples) unless at the noise floor
+                        cpu_start = time.thread_time()
+                        prediction = self.spotter.process(audio_16k)
+                        self.wake_cpu.add(time.thread_time() - cpu_start)
+                        if prediction is None:
+                            continue
                         
-                        # Check TTS cooldown - still feed audio to model (to clear buffers)
-                        # but ignore predictions during cooldown period
-                        if time.time() < self.tts_cooldown_until:
-                            # Still in cooldown, discard predictions to clear model buffers
+                        # During playback the mic hears our own voice - only trust it when clearly louder
+                        # (any state: socket SPEAK can play while recording or answering)
+                        if self.echo_gated(audio_16k):
                             continue
                         
                         # Debug: Log predictions periodically (DISABLED - too verbose)
@@ -1187,24 +1682,38 @@ class AIChatBot:
                         #     pred_str = ", ".join([f"{k}: {v:.3f}" for k, v in prediction.items()])
                         #     self.log(f"Wake word predictions: {pred_str}", "DEBUG")
                         
-                        # Check if wake word detected (check all predictions for threshold)
-                        max_score = max(prediction.values()) if prediction else 0
-                        if max_score > threshold:
-                            # Wake word detected!
-                            detected_model = max(prediction.items(), key=lambda x: x[1])[0]
-                            self.log(f"WAKE WORD DETECTED! Model: {detected_model}, Score: {max_score:.3f}")
-                            self.wake_word_detected_handler()
-                            # No blocking wait - continue reading audio for recording
-                            # The recording timer will auto-stop and process the audio
+                        # Check if any keyword fired (each against its own threshold)
+                        keyword = self.spotter.detect(prediction)
+                        if keyword is None:
+                            continue
+                        score = prediction[keyword.model_name]
+                        
+                        if keyword.action != 'listen':
+                            self.log(f"KEYWORD '{keyword.name}' DETECTED! Action: {keyword.action}, Score: {score:.3f}")
+                            self.keyword_action(keyword, busy)
+                            continue
+                        
+                        # Check TTS cooldown - model was still fed (to clear buffers)
+                        # but wake predictions are ignored during cooldown period
+                        if listening and time.time() < self.tts_cooldown_until:
+                            continue
+                        if not (listening or busy):
+                            continue
+                        
+                        # Wake word detected!
+                        self.log(f"WAKE WORD DETECTED! Model: {keyword.model_name}, Score: {score:.3f}")
+                        if busy:
+                            # Interrupt the current answer and take the new question
+                            self.barge_in('wake_word')
+                        self.wake_word_detected_handler()
+                        # No blocking wait - the recording thread takes over from here
                 
                 except Exception as e:
                     self.log(f"Wake word detection error: {e}", "ERROR")
                     time.sleep(0.1)
             
             # Cleanup
-            stream.stop_stream()
-            stream.close()
-            audio.terminate()
+            self.capture.stop()
             self.log("Wake word detection thread stopped")
             
         except Exception as e:
@@ -1212,11 +1721,84 @@ class AIChatBot:
             import traceback
             self.log(traceback.format_exc(), "ERROR")
     
+    def recording_loop(self, chunks):
+        """Recording consumer thread: streaming ASR feed + VAD end-of-speech detection"""
+        while self.wake_word_running:
+            audio_16k = chunks.get()
+            # Chunks queued just before stop_recording() are stale
+            if audio_16k is None or not self.is_recording:
+                continue
+            try:
+                # Audio is already in the ring; this thread only decides when to stop
+                partial = None
+                if self.asr_recognizer is not None:
+                    # Streaming ASR: recognize while the user is still talking
+                    partial = self.feed_streaming_asr()
+                elapsed = time.time() - self.recording_start_time
+                
+                # VAD-based end-of-speech detection (endpointer.py, shared with the benchmark)
+                endpointer = self.endpointer
+                early_intent = self.early_intent
+                # Partial equal to the finalized text: VOSK has ended the segment
+                if partial and early_intent and early_intent.update(
+                        partial, time.time(), final=partial == self.asr_text):
+                    self.early_dispatches += 1
+                
+                if endpointer:
+                    if partial is not None:
+                        endpointer.set_partial(partial)
+                    now = time.time()
+                    reason = endpointer.update(audio_16k, now)
+                    
+                    if reason == 'silence':
+                        # Per-utterance endpoint latency: silence waited after the last speech frame
+                        self.log(f"End of speech detected: {endpointer.describe()}")
+                        self.endpoint_latencies.append(endpointer.result["latency_ms"])
+                        # DEFENSIVE FIX: Wrap in try/except to ensure cleanup even if stop_recording fails
+                        try:
+                            self.stop_recording()
+                        except Exception as e:
+                            self.log(f"Error in stop_recording (VAD): {e}", "ERROR")
+                            self.is_recording = False
+                            self.update_qa_display(clear=True)
+                            self.set_state(State.WAKE_LISTENING if self.wake_word_enabled else State.IDLE)
+                    elif reason == 'timeout':
+                        self.log(f"Max recording time reached ({elapsed:.1f}s)")
+                        # DEFENSIVE FIX: Wrap in try/except to ensure cleanup even if stop_recording fails
+                        try:
+                            self.stop_recording()
+                        except Exception as e:
+                            self.log(f"Error in stop_recording (timeout): {e}", "ERROR")
+                            self.is_recording = False
+                            self.update_qa_display(clear=True)
+                            self.set_state(State.WAKE_LISTENING if self.wake_word_enabled else State.IDLE)
+                else:
+                    # Fallback: timer-based recording (no VAD)
+                    if elapsed >= self.recording_duration:
+                        self.log(f"Auto-stopping recording after {elapsed:.1f}s")
+                        # DEFENSIVE FIX: Wrap in try/except to ensure cleanup even if stop_recording fails
+                        try:
+                            self.stop_recording()
+                        except Exception as e:
+                            self.log(f"Error in stop_recording (fallback): {e}", "ERROR")
+                            self.is_recording = False
+                            self.update_qa_display(clear=True)
+                            self.set_state(State.WAKE_LISTENING if self.wake_word_enabled else State.IDLE)
+            
+            except Exception as e:
+                self.log(f"Recording thread error: {e}", "ERROR")
+                time.sleep(0.1)
+        
+        self.log("Recording thread stopped")
+    
     def handle_command(self, command):
         """Handle incoming socket commands"""
         self.log(f"Received command: {command}")
         
         if command == "START_RECORDING":
+            # K1 while answering/speaking interrupts the answer, then records the new question
+            if self.barge_in_enabled and self.state in BARGE_IN_STATES:
+                self.barge_in('k1_button')
             # Manual trigger from K1 button (bypass wake word)
             if self.state == State.IDLE or self.state == State.WAKE_LISTENING:
                 self.start_recording()
@@ -1227,17 +1809,71 @@ class AIChatBot:
         
         elif command == "CAMERA_CAPTURE":
             if self.state == State.IDLE or self.state == State.WAKE_LISTENING:
-                self.capture_camera()
+                # Capture + vision model run on the LLM stage, not the socket thread
+                self.set_state(State.CAMERA)
+                if not self.llm_stage.submit(Job('camera', source='k3_button')):
+                    self.set_state(State.WAKE_LISTENING if self.wake_word_enabled else State.IDLE)
+        
+        elif command == "STOP":
+            # Interrupt whatever is being answered or spoken
+            if self.state in BARGE_IN_STATES:
+                self.barge_in('stop_command')
+        
+        elif command.startswith("SPEAK:"):
+            # Speak text through the shared TTS engine (buttons, other services)
+            # Replies once playback has finished
+            text = command[len("SPEAK:"):].strip()
+            if not text:
+                pass
+            elif self.state in (State.IDLE, State.WAKE_LISTENING):
+                # Same path as answers: SPEAKING state, echo-gated wake word,
+                # barge-in and the wake word cooldown afterwards
+                # job.spoken is set on every outcome (spoken, cancelled, rejected by a
+                # full TTS stage, skipped while queued), so failures reply at once;
+                # SPEAK_TIMEOUT only covers a hung engine
+                job = Job('speech', source='socket')
+                self.speak_answer(text, job)
+                if not job.spoken.wait(SPEAK_TIMEOUT):
+                    # The caller falls back to 'speak' on ERROR: don't play it twice
+                    job.cancel("speak_timeout")
+                    self.log(f"SPEAK timed out after {SPEAK_TIMEOUT}s", "WARN")
+                    return "ERROR"
+                if not job.speech_ok:
+                    self.log("SPEAK failed (TTS stage full or engine error)", "WARN")
+                    return "ERROR"
+            elif not self.speak_sentence(text):
+                # Busy (recording/answering): play without touching the state;
+                # the wake word is still echo-gated on our output level
+                return "ERROR"
         
         elif command == "STATUS":
             return json.dumps({
                 "state": self.state.value,
                 "conversation_length": len(self.conversation_history),
-                "wake_word_enabled": self.wake_word_enabled
+                "conversation_tokens": self.history_tokens(),
+                "conversation_summarized": bool(self.conversation_summary),
+                "wake_word_enabled": self.wake_word_enabled,
+                "tts_cache": self.tts.cache.stats() if self.tts and self.tts.cache else None,
+                "models": self.residency.status() if self.residency else None,
+                "warmup": self.warmup.status() if self.warmup else None,
+                "ollama_backends": self.ollama_pool.status(),
+                "answer_cache": self.answer_cache.stats() if self.answer_cache else None,
+                "audio_capture": self.capture.stats() if self.capture else None,
+                "pipeline": {stage.name: stage.stats() for stage in self.stages},
+                "last_job": self.last_job.timings() if self.last_job else None,
+                "barge_ins": self.barge_ins,
+                "early_dispatches": self.early_dispatches,
+                "endpoint_latency_ms": {
+                    "last": self.endpoint_latencies[-1],
+                    "avg": round(sum(self.endpoint_latencies) / len(self.endpoint_latencies)),
+                    "utterances": len(self.endpoint_latencies)
+                } if self.endpoint_latencies else None,
+                "keywords": self.spotter.status() if self.spotter else None,
+                "wake_gate": dict(self.noise_gate.stats() if self.noise_gate else {}, **self.wake_cpu.stats()) if self.wake_cpu else None
             })
         
         elif command == "RESET":
-            self.conversation_history = []
+            self.reset_history()
             self.log("Conversation history reset")
             if self.wake_word_enabled:
                 self.set_state(State.WAKE_LISTENING)
@@ -1343,6 +1979,20 @@ class AIChatBot:
         if self.socket_server:
             self.socket_server.close()
         
+        for stage in self.stages:
+            stage.stop()
+        
+        if self.tts:
+            self.tts.stop()
+        
+        if self.residency:
+            self.residency.stop()
+        
+        if self.answer_cache:
+            self.answer_cache.flush()
+        
+        self.ollama_pool.stop()
+        
         if os.path.exists(SOCKET_PATH):
             os.remove(SOCKET_PATH)
     
@@ -1351,7 +2001,7 @@ class AIChatBot:
         self.log("AI Chatbot service started")
         self.log("="*50)
         self.log("AI Chatbot Service Started")
-        self.log(f"ASR: VOSK (model: {VOSK_MODEL_PATH})")
+        self.log(f"ASR: VOSK (model: {VOSK_MODEL_PATH}, {'streaming' if self.streaming_asr else 'WAV file'} mode)")
         self.log(f"Text LLM: {self.config['llm']['text_model']} (local)")
         if self.use_network_ollama:
             self.log(f"Network Text LLM: {self.config['ollama']['network_text_model']} @ {self.config['ollama']['ollama_host']} (with fallback to local)")
@@ -1377,6 +2027,23 @@ class AIChatBot:
             else:
                 self.log("Wake word detection disabled (enable in config.ini)")
         
+        # Start pipeline worker stages
+        for stage in self.stages:
+            stage.start()
+        
+        # Start background health probes of network Ollama hosts
+        self.ollama_pool.start()
+        
+        # Start model residency manager (preloads text model in background)
+        if self.residency:
+            self.residency.start()
+            for backend in self.ollama_pool.remote:
+                threading.Thread(
+                    target=self.residency.preload,
+                    args=(self.config['ollama']['network_text_model'], backend.client),
+                    daemon=True
+                ).start()
+        
         # Setup signal handlers
         signal.signal(signal.SIGTERM, lambda s, f: self.cleanup() or sys.exit(0))
         signal.signal(signal.SIGINT, lambda s, f: self.cleanup() or sys.exit(0))
@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+"""
+Answer Cache for AI Chatbot
+Remembers LLM answers to repeated questions ("what's your name", "tell me
+a joke") keyed on a normalized transcript, with per-entry TTLs and a JSON
+file so entries survive restarts. Changes are written to disk in the
+background, a few seconds after the first change, never on the answer
+path; flush() writes pending changes at once (on shutdown). The key is the question alone, so the
+caller only uses the cache at the start of a conversation, where the
+answer doesn't depend on earlier turns.
+"""
+
+import os
+import re
+import json
+import time
+import threading
+
+ANSWER_CACHE_FILE = "/var/cache/ai-chatbot/answers.json"
+
+# Expanded before normalizing so "what's" and "what is" share a key
+CONTRACTIONS = {
+    "what's": "what is", "who's": "who is", "where's": "where is", "how's": "how is",
+    "it's": "it is", "that's": "that is", "you're": "you are", "i'm": "i am",
+    "can't": "can not", "don't": "do not", "doesn't": "does not",
+}
+
+# Dropped from the key: ASR fillers, wake phrase leftovers, words that don't change meaning
+FILLER_WORDS = {
+    'um', 'uh', 'er', 'ah', 'hmm', 'hey', 'jarvis', 'okay', 'ok', 'so', 'well',
+    'like', 'just', 'actually', 'please', 'robot', 'now', 'again',
+}
+STOP_WORDS = {
+    'a', 'an', 'the', 'is', 'are', 'was', 'do', 'does', 'can', 'could', 'would',
+    'will', 'to', 'of', 'me', 'us',
+}
+
+# Questions that depend on earlier turns - never answered from cache
+CONTEXT_WORDS = {
+    'it', 'that', 'this', 'those', 'these', 'they', 'them', 'he', 'she', 'him',
+    'her', 'there', 'more', 'else', 'why', 'another', 'previous', 'last',
+}
+
+# Questions whose answer goes stale quickly get the short TTL
+VOLATILE_WORDS = {'today', 'tonight', 'tomorrow', 'weather', 'news', 'latest', 'current', 'currently'}
+
+# Cached answers mentioning what a tool changes are dropped when it runs
+TOOL_INVALIDATES = {
+    'set_volume': ('volume', 'loud', 'quiet'),
+    'motor_forward': ('moving', 'doing', 'where'),
+    'motor_backward': ('moving', 'doing', 'where'),
+    'motor_left': ('moving', 'doing', 'facing'),
+    'motor_right': ('moving', 'doing', 'facing'),
+    'motor_stop': ('moving', 'doing'),
+    'motor_explore': ('moving', 'doing', 'exploring'),
+}
+
+
+def normalize_question(text):
+    """Lowercase, expand contractions, strip punctuation, fillers and stop words"""
+    text = text.lower().replace('’', "'")
+    for contraction, expanded in CONTRACTIONS.items():
+        text = re.sub(rf"\b{re.escape(contraction)}", expanded, text)
+    words = re.sub(r"[^a-z0-9 ]", ' ', text).split()
+    return ' '.join(w for w in words if w not in FILLER_WORDS and w not in STOP_WORDS)
+
+
+class AnswerCache:
+    """Normalized question -> answer, with per-entry expiry and disk persistence"""
+
+    def __init__(self, path=ANSWER_CACHE_FILE, ttl=86400, volatile_ttl=600, max_entries=500,
+                 flush_delay=5.0, log=print):
+        self.path = path
+        self.ttl = ttl
+        self.volatile_ttl = volatile_ttl
+        self.max_entries = max_entries
+        self.flush_delay = flush_delay
+        self.log = log
+
+        self.entries = {}  # key -> {"answer", "expires", "question"}
+        self.lock = threading.Lock()
+        self.save_lock = threading.Lock()  # One writer of the cache file at a time
+        self.dirty = False
+        self.flush_timer = None
+        self.hits = 0
+        self.misses = 0
+        self.load()
+
+    def key(self, question):
+        """Cache key, or None if the question must not be served from cache"""
+        key = normalize_question(question)
+        if not key or CONTEXT_WORDS.intersection(key.split()):
+            return None
+        return key
+
+    def get(self, key):
+        now = time.time()
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry and entry['expires'] > now:
+                self.hits += 1
+                return entry['answer']
+            if entry:
+                del self.entries[key]  # Expired
+            self.misses += 1
+        return None
+
+    def put(self, key, answer, question=""):
+        """Store answer with a TTL chosen from the question"""
+        ttl = self.volatile_ttl if VOLATILE_WORDS.intersection(key.split()) else self.ttl
+        now = time.time()
+        with self.lock:
+            self.entries[key] = {"answer": answer, "expires": now + ttl, "question": question}
+            if len(self.entries) > self.max_entries:
+                # Drop expired first, then the ones expiring soonest
+                for k in sorted(self.entries, key=lambda k: self.entries[k]['expires'])[:len(self.entries) - self.max_entries]:
+                    del self.entries[k]
+        self.mark_dirty()
+
+    def invalidate_for_tool(self, tool_name):
+        """Drop entries whose question or answer is about state the tool just changed"""
+        words = TOOL_INVALIDATES.get(tool_name)
+        if not words:
+            return 0
+        words = set(words)
+        with self.lock:
+            # Whole words only: "time" must not match "sometimes"
+            stale = [k for k, e in self.entries.items()
+                     if words.intersection(k.split()) or words.intersection(re.findall(r"[a-z]+", e['answer'].lower()))]
+            for k in stale:
+                del self.entries[k]
+        if stale:
+            self.mark_dirty()
+        return len(stale)
+
+    def clear(self):
+        with self.lock:
+            self.entries = {}
+        self.mark_dirty()
+
+    def mark_dirty(self):
+        """Schedule a background save unless one is already pending"""
+        with self.lock:
+            self.dirty = True
+            if self.flush_timer is not None:
+                return
+            self.flush_timer = threading.Timer(self.flush_delay, self.flush)
+            self.flush_timer.daemon = True
+            self.flush_timer.start()
+
+    def flush(self):
+        """Write pending changes now (timer thread, or shutdown)"""
+        with self.save_lock:
+            with self.lock:
+                timer, self.flush_timer = self.flush_timer, None
+                dirty, self.dirty = self.dirty, False
+            if timer is not None:
+                timer.cancel()  # No-op when called from the timer itself
+            if dirty:
+                self.save()
+
+    def load(self):
+        now = time.time()
+        try:
+            with open(self.path) as f:
+                data = json.load(f)
+            self.entries = {k: e for k, e in data.items() if e.get('expires', 0) > now}
+            self.log(f"Loaded {len(self.entries)} cached answers from {self.path}")
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            self.log(f"Failed to load answer cache: {e}", "WARN")
+
+    def save(self):
+        """Write cache atomically (best-effort)"""
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            with self.lock:
+                data = json.dumps(self.entries)
+            tmp_path = self.path + '.tmp'
+            with open(tmp_path, 'w') as f:
+                f.write(data)
+            os.replace(tmp_path, self.path)
+        except Exception as e:
+            self.log(f"Failed to save answer cache: {e}", "WARN")
+
+    def stats(self):
+        with self.lock:
+            return {"hits": self.hits, "misses": self.misses, "entries": len(self.entries)}
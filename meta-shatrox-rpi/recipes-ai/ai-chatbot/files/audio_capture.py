@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+Audio Capture for AI Chatbot
+Producer side of the audio pipeline: PyAudio runs in callback mode, so
+reading the microphone happens on PortAudio's own capture thread and never
+waits on wake word scoring, VAD or the LLM. Each chunk is resampled, written
+to the ring buffer and handed to bounded per-consumer queues. Input
+overflows, queue drops and queue depth high-water marks are counted so
+lost audio shows up in STATUS instead of disappearing silently.
+"""
+
+import time
+import queue
+import threading
+
+import numpy as np
+import pyaudio
+
+
+class ChunkQueue:
+    """Bounded queue of 16kHz chunks for one consumer thread
+
+    When the consumer falls behind the oldest chunk is dropped (and counted),
+    so the producer never blocks and the consumer always sees recent audio.
+    """
+
+    def __init__(self, name, maxsize, when=None):
+        self.name = name
+        self.queue = queue.Queue(maxsize)
+        self.when = when          # Optional predicate: only enqueue while it returns True
+        self.delivered = 0
+        self.drops = 0
+        self.high_water = 0
+
+    def put(self, chunk):
+        if self.when is not None and not self.when():
+            return
+        while True:
+            try:
+                self.queue.put_nowait(chunk)
+                break
+            except queue.Full:
+                try:
+                    self.queue.get_nowait()
+                    self.drops += 1
+                except queue.Empty:
+                    pass
+        self.delivered += 1
+        depth = self.queue.qsize()
+        if depth > self.high_water:
+            self.high_water = depth
+
+    def get(self, timeout=0.5):
+        """Next chunk, or None if nothing arrived within timeout"""
+        try:
+            return self.queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def stats(self):
+        return {
+            "depth": self.queue.qsize(),
+            "high_water": self.high_water,
+            "capacity": self.queue.maxsize,
+            "delivered": self.delivered,
+            "drops": self.drops
+        }
+
+
+class AudioCapture:
+    """Microphone -> resampler -> ring buffer + consumer queues"""
+
+    def __init__(self, ring, resampler, device_index=0, rate=48000, chunk_samples=3840, log=print):
+        self.ring = ring
+        self.resampler = resampler
+        self.device_index = device_index
+        self.rate = rate
+        self.chunk_samples = chunk_samples
+        self.log = log
+
+        self.subscribers = []
+        self.audio = None
+        self.stream = None
+
+        self.chunks = 0
+        self.overflows = 0          # PortAudio reported input overflow (mic samples lost)
+        self.max_callback_ms = 0.0  # Worst producer time per chunk (must stay << chunk length)
+        self.last_overflow_log = 0.0
+        self.lock = threading.Lock()
+
+    def subscribe(self, name, maxsize, when=None):
+        """Register a consumer queue (call before start)"""
+        chunk_queue = ChunkQueue(name, maxsize, when)
+        self.subscribers.append(chunk_queue)
+        return chunk_queue
+
+    def start(self):
+        self.audio = pyaudio.PyAudio()
+        info = self.audio.get_device_info_by_index(self.device_index)
+        self.log(f"Using audio device {self.device_index}: {info['name']}")
+
+        self.stream = self.audio.open(
+            format=pyaudio.paInt16,
+            channels=1,
+            rate=self.rate,
+            input=True,
+            input_device_index=self.device_index,
+            frames_per_buffer=self.chunk_samples,
+            stream_callback=self.callback
+        )
+        self.stream.start_stream()
+
+    def callback(self, in_data, frame_count, time_info, status):
+        """Runs on the PortAudio capture thread - keep it short, never block"""
+        start = time.perf_counter()
+        if status & pyaudio.paInputOverflow:
+            self.overflows += 1
+            if time.time() - self.last_overflow_log > 10:
+                self.last_overflow_log = time.time()
+                self.log(f"Audio input overflow (total {self.overflows})", "WARN")
+
+        chunk = self.resampler.process(np.frombuffer(in_data, dtype=np.int16))
+        self.ring.write(chunk)
+        for chunk_queue in self.subscribers:
+            chunk_queue.put(chunk)
+        self.chunks += 1
+
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        if elapsed_ms > self.max_callback_ms:
+            self.max_callback_ms = elapsed_ms
+        return (None, pyaudio.paContinue)
+
+    def is_active(self):
+        return self.stream is not None and self.stream.is_active()
+
+    def stop(self):
+        with self.lock:
+            if self.stream:
+                self.stream.stop_stream()
+                self.stream.close()
+                self.stream = None
+            if self.audio:
+                self.audio.terminate()
+                self.audio = None
+
+    def stats(self):
+        return {
+            "chunks": self.chunks,
+            "overflows": self.overflows,
+            "max_callback_ms": round(self.max_callback_ms, 2),
+            "queues": {q.name: q.stats() for q in self.subscribers}
+        }
@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+Audio Ring Buffer for AI Chatbot
+One int16 buffer allocated at startup that the capture loop writes every
+chunk into. Recordings (wake word or K1) are just a start position in the
+ring, so a configurable pre-roll before the trigger comes for free and
+readers get NumPy views instead of joined copies of bytes chunks.
+"""
+
+import numpy as np
+
+
+class AudioRingBuffer:
+    """Fixed-size int16 ring addressed by absolute sample positions"""
+
+    def __init__(self, capacity):
+        self.capacity = int(capacity)
+        self.buffer = np.zeros(self.capacity, dtype=np.int16)
+        self.write_pos = 0  # Total samples ever written (absolute position)
+
+    def write(self, samples):
+        """Copy one capture chunk into the ring (the only copy of the audio)"""
+        n = len(samples)
+        if n >= self.capacity:
+            samples = samples[-self.capacity:]
+            self.write_pos += n - self.capacity
+            n = self.capacity
+
+        idx = self.write_pos % self.capacity
+        first = min(n, self.capacity - idx)
+        self.buffer[idx:idx + first] = samples[:first]
+        if first < n:
+            self.buffer[:n - first] = samples[first:]
+        # Publish after the copy so readers never see unwritten samples
+        self.write_pos += n
+
+    def mark(self, preroll=0):
+        """Absolute position to start a recording from, preroll samples back"""
+        return max(0, self.write_pos - preroll, self.write_pos - self.capacity)
+
+    def read(self, start, end=None):
+        """Samples in [start, end) - a view unless the range wraps the ring end
+
+        Views stay valid until the writer laps them, i.e. for
+        capacity - (end - start) more samples of capture.
+        """
+        if end is None:
+            end = self.write_pos
+        start = max(start, end - self.capacity)
+        n = end - start
+        if n <= 0:
+            return self.buffer[:0]
+
+        idx = start % self.capacity
+        if idx + n <= self.capacity:
+            return self.buffer[idx:idx + n]
+        return np.concatenate((self.buffer[idx:], self.buffer[:idx + n - self.capacity]))
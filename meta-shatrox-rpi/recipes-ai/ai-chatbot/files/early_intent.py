@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Early Intent Dispatch for AI Chatbot
+Watches the streaming ASR partial transcript while the user is still
+talking and fires latency-critical motor commands as soon as a partial
+is stable, instead of after end of speech, transcription and the LLM
+stage. "Stop" shouted at a moving robot reaches the motor controller
+about a second sooner, which is stopping distance.
+
+A partial is stable once VOSK ends the segment on its own pause, or when
+the same command has been heard for stable_seconds - not after a number
+of identical partials, which a short breath produces.
+
+The recording carries on; when the final transcript arrives the answer
+path checks it against what was dispatched (tool defaults filled in) and
+only speaks the result if they agree. Otherwise the early motion is
+withdrawn and the final transcript is handled as usual, so one command
+never runs twice.
+"""
+
+import time
+import threading
+
+# Categories allowed to fire from a partial, most urgent first
+EARLY_CATEGORIES = ('MOTOR_STOP', 'MOTOR_FORWARD', 'MOTOR_BACKWARD', 'MOTOR_LEFT', 'MOTOR_RIGHT')
+
+# Stopping is always safe, so it fires on the first matching partial
+STOP_WORDS = ('stop', 'halt', 'freeze')
+
+
+class EarlyIntent:
+    """Early dispatch state for one recording"""
+
+    def __init__(self, detect, parse, execute, normalize=None, categories=EARLY_CATEGORIES,
+                 stable_seconds=0.6, log=print):
+        self.detect = detect            # detect_command_category()
+        self.parse = parse              # parse_command()
+        self.execute = execute          # execute_tool()
+        self.normalize = normalize      # normalize_tool_call(): fills in tool defaults
+        self.categories = categories
+        self.stable_seconds = stable_seconds
+        self.log = log
+
+        self.start_time = time.time()
+        self.candidate = None           # (category, call) the latest partial asks for
+        self.candidate_since = None     # When partials started asking for it
+
+        # Set once dispatched
+        self.category = None
+        self.call = None                # (function_name, arguments)
+        self.text = None
+        self.fired_at = None
+        self.result = None
+        self.done = threading.Event()
+
+    @property
+    def fired(self):
+        return self.call is not None
+
+    def classify(self, text):
+        """(category, call) a partial asks for, or None"""
+        text = text.lower().strip()
+        category = self.detect(text)
+        if category != 'MOTOR_STOP' and 'MOTOR_STOP' in self.categories:
+            # Pre-roll can put the tail of the wake word in front ("jarvis stop")
+            words = text.split()
+            if 0 < len(words) <= 3 and words[-1] in STOP_WORDS:
+                category = 'MOTOR_STOP'
+        if category not in self.categories:
+            return None
+        call = self.parse(text, category)
+        if call is None:
+            return None  # Negated, compound or ambiguous: leave it to the final transcript
+        if self.normalize:
+            call = self.normalize(*call)
+        return (category, call)
+
+    def update(self, partial, now=None, final=False):
+        """
+        Feed the latest partial transcript, True when this call dispatched.
+        final: VOSK has ended the segment, the partial won't change any more.
+        """
+        if self.fired or not partial:
+            return False
+        now = now or time.time()
+
+        candidate = self.classify(partial)
+        if candidate != self.candidate:
+            self.candidate = candidate
+            self.candidate_since = now
+        if candidate is None:
+            return False
+
+        category, call = candidate
+        if category != 'MOTOR_STOP' and not final and now - self.candidate_since < self.stable_seconds:
+            return False
+
+        self.category, self.call, self.text = category, call, partial
+        self.fired_at = time.time()
+        self.log(f"Early dispatch {category} from partial '{partial}' "
+                 f"({(self.fired_at - self.start_time)*1000:.0f}ms into recording): {call[0]}({call[1]})")
+        threading.Thread(target=self._run, name="early-intent", daemon=True).start()
+        return True
+
+    def _run(self):
+        try:
+            self.result = self.execute(*self.call)
+        except Exception as e:
+            self.result = f"Error executing {self.call[0]}: {e}"
+        finally:
+            self.log(f"Early dispatch result: {self.result} "
+                     f"(+{(time.time() - self.fired_at)*1000:.0f}ms)")
+            self.done.set()
+
+    def confirms(self, transcript):
+        """True if the final transcript asks for what was already dispatched"""
+        return self.fired and self.classify(transcript) == (self.category, self.call)
+
+    def wait_result(self, timeout=6.0):
+        self.done.wait(timeout)
+        return self.result
+
+    def withdraw(self, timeout=6.0):
+        """
+        Undo a dispatch the final transcript doesn't confirm: wait for it to
+        reach the motor controller, then stop the motion it started so the
+        final command replaces it instead of running after it
+        """
+        self.wait_result(timeout)
+        if self.category == 'MOTOR_STOP':
+            return None  # Stopping was safe whatever the user went on to say
+        try:
+            return self.execute('motor_stop', {})
+        except Exception as e:
+            return f"Error executing motor_stop: {e}"
@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""
+End-of-Speech Detection for AI Chatbot
+Decides when a voice command recording is over, one 16kHz chunk at a time.
+Times are passed in by the caller, so the same code runs live (wall clock)
+and in the offline benchmark (audio clock, faster than real time).
+
+The silence needed to end a recording adapts to the utterance instead of
+being a fixed timer:
+
+- a partial transcript that is a complete short command ("stop", "turn
+  left"), after any wake word tail ("jarvis stop"), ends after min_silence
+- a partial transcript ending on a connective or filler ("turn left and",
+  "what is the") waits up to max_silence
+- otherwise energy decides: speech that trailed off and settled back to
+  the noise floor ends sooner than speech that broke off at full level
+  (a breath or pause mid-sentence)
+"""
+
+import re
+
+from noise_gate import chunk_level_db
+
+FRAME_SIZE = 320  # webrtcvad frame: 20ms at 16kHz
+
+# Utterances that are finished on their own; anything longer goes on to energy
+COMPLETE_COMMANDS = re.compile(
+    r'^(?:stop|halt|freeze|stop (?:moving|now|it|motors?)|cancel|never mind|'
+    r'yes|no|okay|thanks|thank you|'
+    r'(?:go|move|drive) (?:forward|back|backward|backwards|ahead)|forward|reverse|back up|'
+    r'(?:turn|go|rotate|spin) (?:left|right)|explore|'
+    r'take a (?:picture|photo)|what time is it|what day is it)$'
+)
+
+# Wake word tail the pre-roll can put in front of the command ("jarvis stop")
+WAKE_RESIDUE = {'hey', 'hi', 'jarvis', 'ruby'}
+
+# Last words that mean the speaker has more to say
+INCOMPLETE_ENDINGS = {
+    'a', 'an', 'the', 'and', 'or', 'but', 'so', 'because', 'then', 'if',
+    'to', 'of', 'for', 'with', 'in', 'on', 'at', 'about', 'from', 'by',
+    'is', 'are', 'was', 'what', 'how', 'why', 'where', 'who', 'when', 'which',
+    'can', 'could', 'would', 'should', 'do', 'does', 'please', 'my', 'your',
+    'um', 'uh', 'er', 'hmm'
+}
+
+# Energy trend thresholds
+TRAIL_OFF_DB = 10.0     # Last speech chunk this far below the utterance peak = trailing off
+SETTLED_DB = 4.0        # Silent chunk within this of the floor = really quiet
+
+
+def speech_frames(vad, chunk):
+    """Number of 20ms frames in an int16 16kHz chunk that webrtcvad calls speech"""
+    data = chunk.tobytes()
+    count = 0
+    for i in range(0, len(chunk) - FRAME_SIZE + 1, FRAME_SIZE):
+        frame = data[i*2:(i+FRAME_SIZE)*2]  # 2 bytes per sample
+        try:
+            if vad.is_speech(frame, 16000):
+                count += 1
+        except Exception:
+            pass
+    return count
+
+
+def chunk_has_speech(vad, chunk):
+    """True if any 20ms frame of an int16 16kHz chunk is speech"""
+    return speech_frames(vad, chunk) > 0
+
+
+def transcript_completeness(text):
+    """'complete', 'incomplete' or None (can't tell) for a partial transcript"""
+    text = (text or "").lower().strip()
+    if not text:
+        return None
+    words = text.split()
+    while len(words) > 1 and words[0] in WAKE_RESIDUE:
+        words.pop(0)
+    # VOSK often mishears the wake word tail ("harvest stop"), so one unknown
+    # leading word still counts as residue
+    if COMPLETE_COMMANDS.match(' '.join(words)) or COMPLETE_COMMANDS.match(' '.join(words[1:])):
+        return 'complete'
+    if words[-1] in INCOMPLETE_ENDINGS:
+        return 'incomplete'
+    return None
+
+
+class VadEndpointer:
+    """End of speech after an adaptive stretch without a speech frame
+
+    With adaptive=False this is the plain fixed timer: silence_threshold
+    seconds of silence after speech, max_duration overall.
+    """
+
+    def __init__(self, vad, silence_threshold=0.8, max_duration=10.0, log=None,
+                 adaptive=True, min_silence=0.3, max_silence=1.5):
+        self.vad = vad
+        self.silence_threshold = silence_threshold
+        self.max_duration = max_duration
+        self.log = log
+        self.adaptive = adaptive
+        self.min_silence = min(min_silence, silence_threshold)
+        self.max_silence = max(max_silence, silence_threshold)
+        self.start(0.0)
+
+    def start(self, now):
+        self.start_time = now
+        self.last_speech_time = now  # Assume the wake word was speech
+        self.speech_started = False
+        self.speech_time = 0.0       # Seconds of chunks with speech
+        self.peak_db = None
+        self.floor_db = None
+        self.last_speech_db = None
+        self.settled = False
+        self.completeness = None
+        self.partial = ""
+        self.required = self.silence_threshold
+        self.result = None
+
+    def set_partial(self, text):
+        """Latest streaming ASR hypothesis for the whole recording"""
+        self.partial = text
+        self.completeness = transcript_completeness(text)
+
+    def silence_duration(self, now):
+        return now - self.last_speech_time
+
+    def required_silence(self):
+        """Seconds of silence that end the utterance right now"""
+        if not self.adaptive:
+            return self.silence_threshold
+        if self.completeness == 'complete':
+            return self.min_silence
+        if self.completeness == 'incomplete':
+            return self.max_silence
+        trailed_off = (self.last_speech_db is not None
+                       and self.last_speech_db <= self.peak_db - TRAIL_OFF_DB)
+        if trailed_off and self.settled:
+            return (self.min_silence + self.silence_threshold) / 2
+        return self.silence_threshold
+
+    def update(self, chunk, now, chunk_seconds=0.08):
+        """Feed one chunk; returns 'silence' or 'timeout' when the recording should end"""
+        level = chunk_level_db(chunk)
+        if self.floor_db is None or level < self.floor_db:
+            self.floor_db = level
+
+        if speech_frames(self.vad, chunk):
+            self.last_speech_time = now
+            self.speech_time += chunk_seconds
+            self.last_speech_db = level
+            self.peak_db = level if self.peak_db is None else max(self.peak_db, level)
+            self.settled = False
+            if not self.speech_started:
+                self.speech_started = True
+                if self.log:
+                    self.log("Speech detected, listening...")
+        else:
+            self.settled = level <= self.floor_db + SETTLED_DB
+
+        self.required = self.required_silence()
+        reason = None
+        # Check silence threshold (only after speech started)
+        if self.speech_started and self.silence_duration(now) >= self.required:
+            reason = 'silence'
+        elif now - self.start_time >= self.max_duration:
+            reason = 'timeout'
+        if reason:
+            self.result = {
+                "reason": reason,
+                "latency_ms": round(self.silence_duration(now) * 1000),
+                "required_ms": round(self.required * 1000),
+                "speech_ms": round(self.speech_time * 1000),
+                "completeness": self.completeness,
+                "recording_s": round(now - self.start_time, 2)
+            }
+        return reason
+
+    def describe(self):
+        """One log line for the endpoint decision"""
+        r = self.result
+        if r is None:
+            return "no endpoint"
+        basis = r["completeness"] or ("energy" if r["required_ms"] < self.silence_threshold * 1000 else "timer")
+        return (f"{r['reason']} after {r['latency_ms']}ms (needed {r['required_ms']}ms, {basis}; "
+                f"{r['speech_ms']}ms speech in {r['recording_s']}s)")
+
+
+def endpointer_from_config(vad, wake_config, log=None):
+    """VadEndpointer configured from the [wake_word] section"""
+    return VadEndpointer(
+        vad,
+        silence_threshold=float(wake_config.get('silence_threshold', 0.8)),
+        max_duration=float(wake_config.get('max_recording_time', 10)),
+        log=log,
+        adaptive=wake_config.getboolean('adaptive_endpoint', fallback=True),
+        min_silence=float(wake_config.get('min_silence', 0.3)),
+        max_silence=float(wake_config.get('max_silence', 1.5))
+    )
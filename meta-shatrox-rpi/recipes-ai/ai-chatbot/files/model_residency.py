@@ -0,0 +1,268 @@
+#!/usr/bin/env python3
+"""
+Ollama Model Residency Manager for AI Chatbot
+Keeps the text model loaded so the first question after idle doesn't pay a
+cold model load, picks keep_alive per model from recent usage, and unloads
+the vision model when the Pi runs low on memory.
+"""
+
+import json
+import time
+import socket
+import threading
+import http.client
+
+import ollama
+
+MEMINFO_FILE = "/proc/meminfo"
+USAGE_WINDOW = 900  # Seconds of history used to decide if a model is "busy"
+WARMUP_TIMEOUT = 120  # Cold model load on the Pi can take this long (s)
+
+
+def memory_available_mb():
+    """MemAvailable from /proc/meminfo in MB (None if unreadable)"""
+    try:
+        with open(MEMINFO_FILE) as f:
+            for line in f:
+                if line.startswith('MemAvailable:'):
+                    return int(line.split()[1]) // 1024
+    except (OSError, ValueError, IndexError):
+        pass
+    return None
+
+
+class ModelResidencyManager:
+    """Preload, keep_alive policy and memory-aware eviction for local Ollama"""
+
+    def __init__(self, text_model, vision_model, config, client=None, log=print, busy=None):
+        self.text_model = text_model
+        self.vision_model = vision_model
+        self.client = client or ollama.Client()
+        self.log = log
+        self.busy = busy or (lambda: False)
+
+        self.preload_text = config.getboolean('preload_text_model', fallback=True)
+        self.text_keep_alive = config.get('text_keep_alive', fallback='30m')
+        self.vision_keep_alive = config.get('vision_keep_alive', fallback='2m')
+        self.busy_keep_alive = config.get('busy_keep_alive', fallback='60m')
+        self.busy_uses = config.getint('busy_uses', fallback=3)
+        self.min_available_mb = config.getint('min_available_mb', fallback=600)
+        self.check_interval = config.getfloat('check_interval', fallback=10)
+
+        self.usage = {}  # model -> list of recent use timestamps
+        self.lock = threading.Lock()
+        self.running = False
+        self.thread = None
+        self.evictions = 0
+        self.last_resident = []
+
+    def note_use(self, model):
+        """Record that a request is about to use model"""
+        now = time.time()
+        with self.lock:
+            uses = [t for t in self.usage.get(model, []) if now - t < USAGE_WINDOW]
+            uses.append(now)
+            self.usage[model] = uses
+
+    def keep_alive(self, model):
+        """keep_alive for a request: longer for frequently used models"""
+        now = time.time()
+        with self.lock:
+            recent = len([t for t in self.usage.get(model, []) if now - t < USAGE_WINDOW])
+        if model == self.vision_model:
+            return self.vision_keep_alive
+        if recent >= self.busy_uses:
+            return self.busy_keep_alive
+        return self.text_keep_alive
+
+    def preload(self, model, client=None):
+        """Load model into memory (empty prompt = load only, no generation)"""
+        client = client or self.client
+        start = time.time()
+        try:
+            client.generate(model=model, prompt='', keep_alive=self.keep_alive(model))
+            self.log(f"Preloaded model {model} in {time.time() - start:.1f}s")
+            return True
+        except Exception as e:
+            self.log(f"Failed to preload model {model}: {e}", "WARN")
+            return False
+
+    def unload(self, model):
+        """Ask Ollama to drop model from memory now"""
+        try:
+            self.client.generate(model=model, prompt='', keep_alive=0)
+            self.log(f"Unloaded model {model}")
+            return True
+        except Exception as e:
+            self.log(f"Failed to unload model {model}: {e}", "WARN")
+            return False
+
+    def resident_models(self):
+        """Names of models currently loaded by local Ollama"""
+        try:
+            response = self.client.ps()
+            self.last_resident = [m['model'] for m in response['models']]
+        except Exception:
+            pass  # Keep last known list if Ollama is busy/unreachable
+        return self.last_resident
+
+    def check(self):
+        """One residency pass: evict vision under memory pressure, re-warm text model"""
+        available = memory_available_mb()
+        resident = self.resident_models()
+
+        if available is not None and available < self.min_available_mb:
+            if self.vision_model in resident and not self.busy():
+                self.log(f"Memory pressure ({available}MB available < {self.min_available_mb}MB) - unloading {self.vision_model}", "WARN")
+                if self.unload(self.vision_model):
+                    self.evictions += 1
+            return
+
+        # Text model was evicted (e.g. by vision model) - reload while idle
+        if self.preload_text and self.text_model not in resident and not self.busy():
+            self.preload(self.text_model)
+
+    def monitor_loop(self):
+        """Background thread: preload at startup, then watch memory"""
+        if self.preload_text:
+            self.preload(self.text_model)
+
+        while self.running:
+            time.sleep(self.check_interval)
+            try:
+                self.check()
+            except Exception as e:
+                self.log(f"Residency check failed: {e}", "WARN")
+
+    def start(self):
+        self.running = True
+        self.thread = threading.Thread(target=self.monitor_loop, daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        self.running = False
+
+    def status(self):
+        """Residency info for the STATUS socket command"""
+        return {
+            "resident": self.last_resident,
+            "memory_available_mb": memory_available_mb(),
+            "keep_alive": {
+                self.text_model: self.keep_alive(self.text_model),
+                self.vision_model: self.keep_alive(self.vision_model)
+            },
+            "evictions": self.evictions
+        }
+
+
+class SpeculativeWarmup:
+    """Prefill the likely next model while the user is still speaking
+
+    Triggered on wake word / K1 press. Sends the same system prompt and
+    options as the real request with a single-token budget, so Ollama loads
+    the model and caches the prompt prefix. Rate-limited so repeated false
+    wakes don't thrash the server, and cancellable until the prefill returns.
+
+    The request goes over a plain HTTP connection owned by the warm-up, so
+    cancel() can shut its socket down: that interrupts the blocking read
+    during prefill at once, and Ollama aborts a request whose client is gone.
+    """
+
+    def __init__(self, target, config, log=print):
+        self.target = target  # callable -> (address, model, messages, options, keep_alive)
+        self.log = log
+        self.delay = config.getfloat('delay', fallback=0.2)
+        self.min_interval = config.getfloat('min_interval', fallback=20)
+
+        self.lock = threading.Lock()
+        self.cancel_event = threading.Event()
+        self.sock = None  # Socket of the running warm-up request
+        self.in_flight = False
+        self.last_started = 0.0
+        self.stats = {"issued": 0, "rate_limited": 0, "cancelled": 0, "failed": 0}
+
+    def trigger(self, reason):
+        """Start a warm-up unless one is running or one ran recently"""
+        with self.lock:
+            now = time.time()
+            if self.in_flight or now - self.last_started < self.min_interval:
+                self.stats["rate_limited"] += 1
+                return False
+            self.in_flight = True
+            self.last_started = now
+            self.cancel_event.clear()
+
+        threading.Thread(target=self._run, args=(reason,), daemon=True).start()
+        return True
+
+    def cancel(self):
+        """Abort a pending or streaming warm-up (e.g. false wake, nothing said)"""
+        if not self.in_flight:
+            return
+        self.cancel_event.set()
+        with self.lock:
+            sock = self.sock
+        if sock is not None:
+            try:
+                sock.shutdown(socket.SHUT_RDWR)  # Wakes the reader, Ollama sees the disconnect
+            except OSError:
+                pass  # Already closed
+
+    def _run(self, reason):
+        connection = None
+        try:
+            # Short grace period: a false wake cancelled right away costs nothing
+            if self.cancel_event.wait(self.delay):
+                self.stats["cancelled"] += 1
+                return
+
+            address, model, messages, options, keep_alive = self.target()
+            start = time.time()
+            connection = http.client.HTTPConnection(address, timeout=WARMUP_TIMEOUT)
+            connection.connect()
+            with self.lock:
+                # Kept here: http.client drops connection.sock once a response will close
+                self.sock = connection.sock
+            # cancel() sets the event before looking at the socket, so
+            # one of the two sees the other
+            if self.cancel_event.is_set():
+                self.stats["cancelled"] += 1
+                return
+
+            # num_predict=1: Ollama treats 0 as "no limit"
+            body = {
+                "model": model,
+                "messages": messages,
+                "options": dict(options, num_predict=1),
+                "stream": True
+            }
+            if keep_alive is not None:
+                body["keep_alive"] = keep_alive
+            connection.request('POST', '/api/chat', body=json.dumps(body),
+                               headers={'Content-Type': 'application/json'})
+            response = connection.getresponse()
+            if response.status != 200:
+                raise RuntimeError(f"HTTP {response.status}: {response.read(200).decode(errors='replace')}")
+            for _ in response:  # One JSON object per line until done
+                if self.cancel_event.is_set():
+                    break
+            if self.cancel_event.is_set():
+                self.stats["cancelled"] += 1
+                return
+            self.stats["issued"] += 1
+            self.log(f"Speculative warm-up of {model} ({reason}) took {time.time() - start:.2f}s")
+        except Exception as e:
+            if self.cancel_event.is_set():
+                self.stats["cancelled"] += 1  # Socket shut down by cancel()
+            else:
+                self.stats["failed"] += 1
+                self.log(f"Speculative warm-up failed: {e}", "WARN")
+        finally:
+            with self.lock:
+                self.sock = None
+                self.in_flight = False
+            if connection is not None:
+                connection.close()
+
+    def status(self):
+        return dict(self.stats, in_flight=self.in_flight)
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Noise Floor Gate for AI Chatbot
+Tracks the room's background level from the RMS of each 16kHz chunk and
+tells the wake word loop when a chunk is loud enough to be worth scoring.
+Quiet chunks are kept (not scored) so the model can catch up on recent
+context in one batch when the gate opens.
+"""
+
+import math
+import time
+from collections import deque
+
+import numpy as np
+
+
+def chunk_level_db(chunk):
+    """RMS level of an int16 chunk in dBFS-like units (0 dB = full scale)"""
+    rms = float(np.sqrt(np.mean(chunk.astype(np.float32) ** 2)))
+    return 20 * math.log10((rms + 1.0) / 32768.0)
+
+
+class NoiseFloorGate:
+    """Adaptive noise floor with margin and hangover
+
+    The floor follows quieter chunks quickly and louder ones slowly, so
+    speech barely moves it while a fan switching on is absorbed after a
+    few seconds.
+    """
+
+    def __init__(self, margin_db=6.0, hangover_chunks=12, context_chunks=20,
+                 fall_alpha=0.3, rise_alpha=0.01):
+        self.margin_db = margin_db
+        self.hangover_chunks = hangover_chunks
+        self.fall_alpha = fall_alpha
+        self.rise_alpha = rise_alpha
+
+        self.floor_db = None
+        self.open_for = 0                   # Chunks the gate stays open after the last loud one
+        self.context = deque(maxlen=context_chunks)
+
+        self.chunks = 0
+        self.skipped = 0
+        self.openings = 0
+
+    def update(self, chunk):
+        """Feed one chunk, True if it should be scored"""
+        level = chunk_level_db(chunk)
+        self.chunks += 1
+
+        if self.floor_db is None:
+            self.floor_db = level
+        alpha = self.fall_alpha if level < self.floor_db else self.rise_alpha
+        self.floor_db += alpha * (level - self.floor_db)
+
+        was_open = self.open_for > 0
+        if level > self.floor_db + self.margin_db:
+            self.open_for = self.hangover_chunks
+            if not was_open:
+                self.openings += 1
+        elif self.open_for > 0:
+            self.open_for -= 1
+
+        if self.open_for > 0:
+            return True
+        self.skipped += 1
+        self.context.append(chunk)
+        return False
+
+    def take_context(self):
+        """Skipped chunks just before the gate opened, oldest first (clears them)"""
+        chunks = list(self.context)
+        self.context.clear()
+        return chunks
+
+    def stats(self):
+        return {
+            "floor_db": round(self.floor_db, 1) if self.floor_db is not None else None,
+            "open": self.open_for > 0,
+            "chunks": self.chunks,
+            "skipped": self.skipped,
+            "skipped_fraction": round(self.skipped / self.chunks, 3) if self.chunks else None,
+            "openings": self.openings
+        }
+
+
+class CpuMeter:
+    """CPU seconds spent by a thread (and the whole process) per wall second"""
+
+    def __init__(self):
+        self.start_wall = time.monotonic()
+        self.start_process = time.process_time()
+        self.thread_seconds = 0.0
+
+    def add(self, seconds):
+        self.thread_seconds += seconds
+
+    def stats(self):
+        wall = max(1e-6, time.monotonic() - self.start_wall)
+        return {
+            "inference_cpu_percent": round(100 * self.thread_seconds / wall, 2),
+            "process_cpu_percent": round(100 * (time.process_time() - self.start_process) / wall, 2)
+        }
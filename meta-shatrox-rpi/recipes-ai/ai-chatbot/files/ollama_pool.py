@@ -0,0 +1,270 @@
+#!/usr/bin/env python3
+"""
+Ollama Backend Pool for AI Chatbot
+Health-checked set of network Ollama hosts plus the local server.
+Dead hosts are skipped instantly by a circuit breaker, and each request
+goes to the healthy host with the lowest EWMA request latency. Health
+probes keep their own EWMA: a /api/ps round trip says nothing about how
+long a generation takes, so it is reported but never used for routing.
+"""
+
+import os
+import json
+import time
+import base64
+import socket
+import threading
+import http.client
+
+import ollama
+
+LOCAL_ADDRESS = "127.0.0.1:11434"  # Local Ollama server (ollama.Client() default)
+
+
+class OllamaBackend:
+    """One Ollama server with circuit breaker and latency tracking"""
+
+    def __init__(self, host, timeout=None):
+        self.host = host
+        self.local = host == 'local'
+        self.address = LOCAL_ADDRESS if self.local else host  # host:port for raw HTTP
+        self.timeout = None if self.local else timeout
+        if self.local:
+            self.client = ollama.Client()  # Local model loads can legitimately take long
+        else:
+            self.client = ollama.Client(host=f"http://{host}", timeout=timeout)
+
+        self.request_latency = None     # EWMA seconds of real requests, None until first sample
+        self.probe_latency = None       # EWMA seconds of health probes
+        self.consecutive_failures = 0
+        self.open_until = 0.0           # Circuit open (host skipped) until this time
+        self.successes = 0
+        self.failures = 0
+
+    def is_available(self, now=None):
+        """Closed circuit, or open circuit whose cool-down has expired (half-open)"""
+        return (now or time.time()) >= self.open_until
+
+    def chat_stream(self, model, messages, options, keep_alive=None):
+        """Streaming chat request on this server, sent by ChatStream.start()"""
+        body = {
+            "model": model,
+            "messages": encode_images(messages),
+            "options": options,
+            "stream": True
+        }
+        if keep_alive is not None:
+            body["keep_alive"] = keep_alive
+        return ChatStream(self.address, body, timeout=self.timeout)
+
+    def status(self):
+        return {
+            "host": self.host,
+            "available": self.is_available(),
+            "request_latency_ms": round(self.request_latency * 1000) if self.request_latency is not None else None,
+            "probe_latency_ms": round(self.probe_latency * 1000) if self.probe_latency is not None else None,
+            "consecutive_failures": self.consecutive_failures,
+            "successes": self.successes,
+            "failures": self.failures
+        }
+
+
+def encode_images(messages):
+    """The ollama client takes image paths, the HTTP API wants base64"""
+    encoded = []
+    for message in messages:
+        if message.get('images'):
+            images = []
+            for image in message['images']:
+                if isinstance(image, bytes):
+                    image = base64.b64encode(image).decode()
+                elif os.path.isfile(image):
+                    with open(image, 'rb') as f:
+                        image = base64.b64encode(f.read()).decode()
+                images.append(image)
+            message = dict(message, images=images)
+        encoded.append(message)
+    return encoded
+
+
+class ChatStream:
+    """Streaming /api/chat response that abort() can cut off from any thread
+
+    The ollama client's stream is a generator, which only the thread reading
+    it can close - not while it is blocked waiting for the first chunk during
+    prefill. This owns a plain HTTP connection instead (as SpeculativeWarmup
+    does): abort() shuts the socket down, which wakes the blocked read at
+    once, and Ollama aborts a request whose client is gone.
+    """
+
+    def __init__(self, address, body, timeout=None):
+        self.body = body
+        self.connection = http.client.HTTPConnection(address, timeout=timeout)
+        self.response = None
+        self.lock = threading.Lock()
+        self.sock = None
+        self.aborted = False
+
+    def start(self):
+        """Send the request, returns once Ollama starts streaming (after prefill)"""
+        self.connection.connect()
+        with self.lock:
+            # Kept here: http.client drops connection.sock once a response will close
+            self.sock = self.connection.sock
+        # abort() sets the flag before looking at the socket, so one of the two sees the other
+        self._check_aborted()
+        self.connection.request('POST', '/api/chat', body=json.dumps(self.body),
+                                headers={'Content-Type': 'application/json'})
+        self.response = self.connection.getresponse()
+        self._check_aborted()
+        if self.response.status != 200:
+            raise RuntimeError(f"HTTP {self.response.status}: {self.response.read(200).decode(errors='replace')}")
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        """Next chunk, one JSON object per line until done"""
+        while True:
+            line = self.response.readline()
+            self._check_aborted()
+            if not line:
+                raise StopIteration
+            if line.strip():
+                break
+        chunk = json.loads(line)
+        if 'error' in chunk:
+            raise RuntimeError(chunk['error'])
+        return chunk
+
+    def _check_aborted(self):
+        if self.aborted:
+            raise ConnectionAbortedError("Chat request aborted")
+
+    def abort(self):
+        """Stop the request from another thread (e.g. barge-in)"""
+        self.aborted = True
+        with self.lock:
+            sock = self.sock
+        if sock is not None:
+            try:
+                sock.shutdown(socket.SHUT_RDWR)  # Wakes the reader, Ollama sees the disconnect
+            except OSError:
+                pass  # Already closed
+
+    def close(self):
+        self.connection.close()
+
+
+class OllamaPool:
+    """Route requests across network Ollama hosts, with local Ollama as last resort"""
+
+    def __init__(self, hosts, config, log=print):
+        self.log = log
+        timeout = config.getfloat('network_timeout', fallback=5)
+        self.request_deadline = config.getfloat('request_deadline', fallback=8)
+        self.probe_interval = config.getfloat('probe_interval', fallback=10)
+        self.failure_threshold = config.getint('failure_threshold', fallback=2)
+        self.open_seconds = config.getfloat('circuit_open_time', fallback=30)
+        self.alpha = config.getfloat('ewma_alpha', fallback=0.3)
+
+        self.remote = [OllamaBackend(h, timeout=timeout) for h in hosts if h != 'local']
+        self.local = OllamaBackend('local')
+        self.lock = threading.Lock()
+        self.running = False
+
+    def _ewma(self, average, sample):
+        return sample if average is None else self.alpha * sample + (1 - self.alpha) * average
+
+    def record_success(self, backend, latency, probe=False):
+        """Close the circuit and fold latency into the request (or probe) EWMA"""
+        with self.lock:
+            if probe:
+                backend.probe_latency = self._ewma(backend.probe_latency, latency)
+            else:
+                backend.request_latency = self._ewma(backend.request_latency, latency)
+            if backend.consecutive_failures >= self.failure_threshold:
+                self.log(f"Ollama {backend.host} recovered - circuit closed")
+            backend.consecutive_failures = 0
+            backend.open_until = 0.0
+            backend.successes += 1
+
+    def record_failure(self, backend, error):
+        with self.lock:
+            backend.consecutive_failures += 1
+            backend.failures += 1
+            if backend.consecutive_failures >= self.failure_threshold:
+                backend.open_until = time.time() + self.open_seconds
+                self.log(f"Ollama {backend.host} failing ({error}) - circuit open for {self.open_seconds:.0f}s", "WARN")
+
+    def candidates(self):
+        """Available network hosts by EWMA request latency (unmeasured first), then local"""
+        now = time.time()
+        with self.lock:
+            remote = [b for b in self.remote if b.is_available(now)]
+            remote.sort(key=lambda b: b.request_latency if b.request_latency is not None else 0.0)
+        return remote + [self.local]
+
+    def preferred(self):
+        """Backend the next request will most likely go to"""
+        return self.candidates()[0]
+
+    def run(self, request, label="request", cancelled=None):
+        """Call request(backend) on each candidate until one succeeds
+
+        Network hosts are only tried while the per-request deadline has not
+        passed; after that the request goes straight to local Ollama.
+        cancelled: Event set when the caller aborts the request - the error
+        that causes is raised as is, without blaming the host or falling back.
+        """
+        start = time.time()
+        last_error = None
+        for backend in self.candidates():
+            if not backend.local and time.time() - start > self.request_deadline:
+                self.log(f"Ollama {label} deadline ({self.request_deadline:.0f}s) passed, skipping to local", "WARN")
+                continue
+            attempt = time.time()
+            try:
+                result = request(backend)
+            except Exception as e:
+                last_error = e
+                if cancelled is not None and cancelled.is_set():
+                    raise
+                if not backend.local:
+                    self.record_failure(backend, e)
+                    self.log(f"Network Ollama {backend.host} failed: {e}, trying next backend", "WARN")
+                    continue
+                raise
+            self.record_success(backend, time.time() - attempt)
+            return backend, result
+        raise last_error or RuntimeError("No Ollama backend available")
+
+    def probe(self, backend):
+        """Cheap health check (list running models)"""
+        start = time.time()
+        try:
+            backend.client.ps()
+            self.record_success(backend, time.time() - start, probe=True)
+        except Exception as e:
+            self.record_failure(backend, e)
+
+    def probe_loop(self):
+        """Background thread: keep health and latency of network hosts fresh"""
+        while self.running:
+            for backend in self.remote:
+                # Open circuits are only re-probed once their cool-down expires
+                if backend.is_available():
+                    self.probe(backend)
+            time.sleep(self.probe_interval)
+
+    def start(self):
+        if not self.remote:
+            return
+        self.running = True
+        threading.Thread(target=self.probe_loop, daemon=True).start()
+
+    def stop(self):
+        self.running = False
+
+    def status(self):
+        return [b.status() for b in self.remote + [self.local]]
@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+"""
+Streaming Resampler for AI Chatbot
+Anti-aliased integer-factor decimation (48kHz -> 16kHz) done in NumPy,
+one capture chunk at a time. Filter history is carried across chunks so
+consecutive chunks join seamlessly, and only the kept output samples are
+computed (polyphase), so wake word, VAD and ASR all see the same audio
+for the cost of a single small matrix-vector product per chunk.
+"""
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+
+def lowpass_taps(factor, num_taps=63, cutoff=0.9):
+    """Windowed-sinc FIR low-pass for decimation by factor
+
+    cutoff is relative to the output Nyquist frequency (0.9 -> 7.2kHz for 48k->16k).
+    """
+    fc = 0.5 * cutoff / factor  # Cycles per input sample
+    n = np.arange(num_taps) - (num_taps - 1) / 2
+    taps = 2 * fc * np.sinc(2 * fc * n) * np.blackman(num_taps)
+    return (taps / taps.sum()).astype(np.float32)
+
+
+class StreamingDecimator:
+    """Stateful FIR decimator: int16 chunks in, int16 chunks out"""
+
+    def __init__(self, factor=3, num_taps=63, cutoff=0.9):
+        self.factor = factor
+        self.taps = lowpass_taps(factor, num_taps, cutoff)  # Symmetric, no reversal needed
+        self.reset()
+
+    def reset(self):
+        self.history = np.zeros(len(self.taps) - 1, dtype=np.float32)
+        self.phase = 0  # Index of the next kept output within the next chunk
+
+    def process(self, chunk):
+        """Decimate one chunk, continuing the filter state from the previous one"""
+        x = np.concatenate((self.history, chunk.astype(np.float32)))
+        # windows[i] ends at chunk sample i; keep every factor-th, starting at phase
+        windows = sliding_window_view(x, len(self.taps))[self.phase::self.factor]
+        out = windows @ self.taps
+
+        self.phase = (self.phase - len(chunk)) % self.factor
+        self.history = x[len(x) - len(self.history):]
+        return np.clip(np.rint(out), -32768, 32767).astype(np.int16)
@@ -11,81 +11,278 @@ import re
 import socket
 import os
 
+# Shared TTS engine (in-process when loaded by ai-chatbot, else 'speak' wrapper)
+try:
+    from tts_engine import say
+except ImportError:
+    def say(text, wait=True):
+        proc = subprocess.Popen(['speak', text])
+        if wait:
+            try:
+                proc.wait(timeout=30)
+            except subprocess.TimeoutExpired:
+                proc.kill()
+                raise
+
 # Motor control socket path
 MOTOR_SOCKET = "/tmp/shatrox-motor-control.sock"
 
 
-def detect_command_category(text):
-    """
-    STAGE 1: Detect if user input is a command CATEGORY (loose matching).
-    Returns command category name or None.
-    
-    This uses loose patterns - just detects the command type, not details.
-    AI will parse the actual values in Stage 2.
-    """
-    text_lower = text.lower().strip()
-    
+# Command categories in match order (first match wins in detect_command_category)
+COMMAND_PATTERNS = [
     # Volume control - needs action word + "volume"
     # Examples: "set volume", "change volume", "adjust volume", "make volume"
-    if re.search(r'(?:set|change|adjust|make|turn|increase|decrease|raise|lower)\s+(?:the\s+)?volume', text_lower):
-        return 'VOLUME_COMMAND'
+    ('VOLUME_COMMAND', r'(?:set|change|adjust|make|turn|increase|decrease|raise|lower)\s+(?:the\s+)?volume'),
     
     # Time query - "time" with question words
     # Examples: "what time", "tell me time", "what's the time"
-    if re.search(r'(?:what|tell).*time|time.*(?:is\s+it)', text_lower):
-        return 'TIME_COMMAND'
+    ('TIME_COMMAND', r'(?:what|tell).*time|time.*(?:is\s+it)'),
     
     # Date query - "date" or "day" with question words
     # Examples: "what date", "what day", "tell me the date"
-    if re.search(r'(?:what|tell).*(?:date|day)|(?:date|day).*(?:is\s+it|today)', text_lower):
-        return 'DATE_COMMAND'
+    ('DATE_COMMAND', r'(?:what|tell).*(?:date|day)|(?:date|day).*(?:is\s+it|today)'),
     
     # Camera/picture - action word + picture/camera/see
     # Examples: "take picture", "use camera", "what do you see"
-    if re.search(r'(?:take|capture|use)\s+(?:a\s+)?(?:picture|photo|image|camera)|(?:what.*see|describe.*see)', text_lower):
-        return 'CAMERA_COMMAND'
+    ('CAMERA_COMMAND', r'(?:take|capture|use)\s+(?:a\s+)?(?:picture|photo|image|camera)|(?:what.*see|describe.*see)'),
     
     # MOTOR STOP - check this BEFORE shutdown to prevent "stop" from matching "shut down"
     # Examples: "stop", "halt", "freeze", "stop moving"
     # Must NOT match "stop system" which could be shutdown intent
-    if re.search(r'^stop$|^halt$|^freeze$|stop\s+(?:moving|motors?|driving|it)|(?:motors?|robot)\s+stop', text_lower):
-        return 'MOTOR_STOP'
+    ('MOTOR_STOP', r'^stop$|^halt$|^freeze$|stop\s+(?:moving|motors?|driving|it)|(?:motors?|robot)\s+stop'),
     
     # Shutdown - explicit shutdown/power off commands (must include "shutdown", "power off", or "turn off")
     # Examples: "shut down", "power off", "turn off system"
-    if re.search(r'shut\s*down|power\s+off|turn\s+off\s+(?:the\s+)?(?:system|robot|everything)', text_lower):
-        return 'SHUTDOWN_COMMAND'
+    ('SHUTDOWN_COMMAND', r'shut\s*down|power\s+off|turn\s+off\s+(?:the\s+)?(?:system|robot|everything)'),
     
     # ==========================================================================
     # MOTOR CONTROL COMMANDS
     # ==========================================================================
     
     # Move forward - "go forward", "move forward", "drive forward", "forward"
-    if re.search(r'(?:go|move|drive|walk|run)\s+forward|^forward$|move\s+ahead|go\s+ahead', text_lower):
-        return 'MOTOR_FORWARD'
+    ('MOTOR_FORWARD', r'(?:go|move|drive|walk|run)\s+forward|^forward$|move\s+ahead|go\s+ahead'),
     
     # Move backward - "go back", "move backward", "reverse", "back up"
-    if re.search(r'(?:go|move|drive)\s+(?:back(?:ward)?s?)|reverse|back\s*up', text_lower):
-        return 'MOTOR_BACKWARD'
+    ('MOTOR_BACKWARD', r'(?:go|move|drive)\s+(?:back(?:ward)?s?)|reverse|back\s*up'),
     
     # Turn left - "turn left", "go left", "rotate left"
-    if re.search(r'(?:turn|go|rotate|spin)\s+left|left\s+turn', text_lower):
-        return 'MOTOR_LEFT'
+    ('MOTOR_LEFT', r'(?:turn|go|rotate|spin)\s+left|left\s+turn'),
     
     # Turn right - "turn right", "go right", "rotate right"
-    if re.search(r'(?:turn|go|rotate|spin)\s+right|right\s+turn', text_lower):
-        return 'MOTOR_RIGHT'
+    ('MOTOR_RIGHT', r'(?:turn|go|rotate|spin)\s+right|right\s+turn'),
     
     # (MOTOR_STOP is checked earlier, before SHUTDOWN_COMMAND)
     
     # Explore mode - "explore", "start exploring", "roam around", "wander"
-    if re.search(r'explore|start\s+explor|roam(?:\s+around)?|wander|autonomous|auto\s*pilot', text_lower):
-        return 'MOTOR_EXPLORE'
+    ('MOTOR_EXPLORE', r'explore|start\s+explor|roam(?:\s+around)?|wander|autonomous|auto\s*pilot'),
     
     # Distance query - "how far", "what's the distance", "check distance"
-    if re.search(r'(?:how\s+far|what.*distance|check\s+distance|measure\s+distance|obstacle.*distance|distance.*obstacle)', text_lower):
-        return 'DISTANCE_QUERY'
+    ('DISTANCE_QUERY', r'(?:how\s+far|what.*distance|check\s+distance|measure\s+distance|obstacle.*distance|distance.*obstacle)'),
+]
+
+
+def detect_command_category(text):
+    """
+    STAGE 1: Detect if user input is a command CATEGORY (loose matching).
+    Returns command category name or None.
     
+    This uses loose patterns - just detects the command type, not details.
+    AI will parse the actual values in Stage 2.
+    """
+    text_lower = text.lower().strip()
+    for category, pattern in COMMAND_PATTERNS:
+        if re.search(pattern, text_lower):
+            return category
+    return None
+
+
+def _matched_categories(text):
+    """Every command category the text matches"""
+    text_lower = text.lower().strip()
+    return {category for category, pattern in COMMAND_PATTERNS if re.search(pattern, text_lower)}
+
+
+# =============================================================================
+# DETERMINISTIC SLOT FILLING (bypasses LLM for simple commands)
+# =============================================================================
+
+NUMBER_UNITS = {
+    'zero': 0, 'one': 1, 'two': 2, 'three': 3, 'four': 4, 'five': 5,
+    'six': 6, 'seven': 7, 'eight': 8, 'nine': 9, 'ten': 10, 'eleven': 11,
+    'twelve': 12, 'thirteen': 13, 'fourteen': 14, 'fifteen': 15, 'sixteen': 16,
+    'seventeen': 17, 'eighteen': 18, 'nineteen': 19,
+}
+NUMBER_TENS = {
+    'twenty': 20, 'thirty': 30, 'forty': 40, 'fifty': 50,
+    'sixty': 60, 'seventy': 70, 'eighty': 80, 'ninety': 90,
+}
+
+# Common ASR misspellings / variants -> canonical word
+ASR_FIXES = {
+    'half a second': '0.5 seconds',
+    'too': 'to', 'fourty': 'forty', 'fivety': 'fifty', 'nighty': 'ninety',
+    'per cent': 'percent', 'percents': 'percent', 'procent': 'percent', 'pro cent': 'percent',
+    'degree': 'degrees', 'degrease': 'degrees', 'degreese': 'degrees', 'decrees': 'degrees',
+    'second': 'seconds', 'secs': 'seconds', 'sec': 'seconds',
+}
+
+UNIT_WORDS = ('percent', 'degrees', 'seconds')
+NEGATION_PATTERN = r"\b(?:don'?t|do not|never|not|no)\b"
+# Sequences and repeats ("turn left and then right", "turn left twice") need the LLM
+COMPOUND_WORDS = ('and', 'then', 'after', 'afterwards', 'also', 'twice', 'thrice', 'again', 'times')
+# Questions about an action rather than the action ("how do i turn left on a bike")
+QUESTION_PATTERN = r"^(?:how|why|what|when|where|who|which|is|are|was|were|do|does|did|should|shall|(?:can|could|may) i)\b"
+# Categories that are questions by nature, exempt from QUESTION_PATTERN
+QUERY_CATEGORIES = ('TIME_COMMAND', 'DATE_COMMAND', 'DISTANCE_QUERY')
+
+
+def _normalize_command_text(text):
+    """Lowercase, fix common ASR typos and turn spoken numbers into digits"""
+    text = text.lower().replace('%', ' percent').replace('-', ' ')
+    text = re.sub(r"[^a-z0-9.' ]", ' ', text)
+    text = re.sub(r'(?<!\d)\.|\.(?!\d)', ' ', text)  # Keep decimal points only
+    text = ' '.join(text.split())
+    
+    for typo, fix in ASR_FIXES.items():
+        text = re.sub(rf'\b{typo}\b', fix, text)
+    
+    words = text.split()
+    tokens = []
+    i = 0
+    while i < len(words):
+        word = words[i]
+        # "a hundred" -> 100
+        if word == 'a' and i + 1 < len(words) and words[i + 1] == 'hundred':
+            i += 1
+            word = 'hundred'
+        if word in NUMBER_UNITS or word in NUMBER_TENS or word == 'hundred':
+            value = 0
+            while i < len(words):
+                word = words[i]
+                if word in NUMBER_UNITS:
+                    value += NUMBER_UNITS[word]
+                elif word in NUMBER_TENS:
+                    value += NUMBER_TENS[word]
+                elif word == 'hundred':
+                    value = (value or 1) * 100
+                elif word == 'and' and i + 1 < len(words) and (words[i + 1] in NUMBER_UNITS or words[i + 1] in NUMBER_TENS):
+                    pass  # "one hundred and twenty"
+                else:
+                    break
+                i += 1
+            tokens.append(float(value))
+            continue
+        if re.fullmatch(r'\d+(?:\.\d+)?', word):
+            tokens.append(float(word))
+        else:
+            tokens.append(word)
+        i += 1
+    return tokens
+
+
+def _extract_quantities(tokens):
+    """Return list of (value, unit) where unit is 'percent', 'degrees', 'seconds' or None"""
+    quantities = []
+    for i, token in enumerate(tokens):
+        if not isinstance(token, float):
+            continue
+        unit = None
+        if i + 1 < len(tokens) and tokens[i + 1] in UNIT_WORDS:
+            unit = tokens[i + 1]
+        elif i > 0 and tokens[i - 1] == 'speed':
+            unit = 'percent'
+        quantities.append((token, unit))
+    return quantities
+
+
+def _number(value):
+    """Drop the .0 from whole numbers so results read naturally"""
+    return int(value) if value == int(value) else value
+
+
+def parse_command(text, category=None):
+    """
+    Rule-based slot extraction for simple commands.
+    Returns (function_name, arguments) when confident, or None when the
+    command is ambiguous and should go to the LLM with tools.
+    """
+    if category is None:
+        category = detect_command_category(text)
+    if not category:
+        return None
+    
+    # Negated commands ("don't turn left") are left to the LLM
+    if re.search(NEGATION_PATTERN, text.lower()):
+        return None
+    
+    tokens = _normalize_command_text(text)
+    words = [t for t in tokens if isinstance(t, str)]
+    quantities = _extract_quantities(tokens)
+    
+    # Only single, plain commands: compound or repeated requests, a second
+    # command in the same sentence and questions about an action go to the LLM
+    # ("and" inside a number, "one hundred and twenty", is already consumed)
+    if any(w in COMPOUND_WORDS for w in words):
+        return None
+    if len(_matched_categories(text) - {category}) > 0:
+        return None
+    if category not in QUERY_CATEGORIES and re.search(QUESTION_PATTERN, ' '.join(words)):
+        return None
+    
+    if category == 'TIME_COMMAND':
+        return ('get_current_time', {})
+    if category == 'DATE_COMMAND':
+        return ('get_current_date', {})
+    if category == 'DISTANCE_QUERY':
+        return ('get_distance', {})
+    if category == 'MOTOR_STOP':
+        return ('motor_stop', {})
+    
+    if category == 'VOLUME_COMMAND':
+        if any(w in words for w in ('max', 'maximum', 'full')):
+            return ('set_volume', {'percent': 100}) if not quantities else None
+        # Exactly one number, unitless or percent: "set volume to fifty"
+        if len(quantities) == 1 and quantities[0][1] in (None, 'percent'):
+            value = quantities[0][0]
+            # Relative changes ("increase volume by 10") need the current level
+            if 'by' in words or value > 100:
+                return None
+            return ('set_volume', {'percent': int(value)})
+        return None
+    
+    if category in ('MOTOR_FORWARD', 'MOTOR_BACKWARD'):
+        args = {}
+        for value, unit in quantities:
+            if unit == 'percent' and 'speed' not in args:
+                args['speed'] = int(value)
+            elif unit == 'seconds' and 'duration' not in args:
+                args['duration'] = _number(value)
+            else:
+                return None  # Unitless or repeated number (e.g. "forward 3", "2 meters")
+        if 'slowly' in words or 'slow' in words:
+            args.setdefault('speed', 30)
+        elif 'fast' in words or 'quickly' in words:
+            args.setdefault('speed', 80)
+        name = 'motor_forward' if category == 'MOTOR_FORWARD' else 'motor_backward'
+        return (name, args)
+    
+    if category in ('MOTOR_LEFT', 'MOTOR_RIGHT'):
+        args = {}
+        for value, unit in quantities:
+            if unit == 'percent' and 'speed' not in args:
+                args['speed'] = int(value)
+            elif unit in ('degrees', None) and 'angle' not in args:
+                args['angle'] = _number(value)
+            else:
+                return None
+        if 'around' in words:
+            if 'angle' in args:
+                return None
+            args['angle'] = 180
+        name = 'motor_left' if category == 'MOTOR_LEFT' else 'motor_right'
+        return (name, args)
+    
+    # SHUTDOWN_COMMAND and anything else: let the LLM confirm intent
     return None
 
 
@@ -146,7 +343,7 @@ def shutdown_system():
     try:
         # Similar to K8 button implementation
         # First speak the warning
-        subprocess.run(['speak', 'System is shutting down in 3 2 1'], timeout=10)
+        say('System is shutting down in 3 2 1')
         
         # Then actually shutdown
         subprocess.run(['shutdown', '-h', 'now'])
@@ -557,6 +754,24 @@ def execute_tool(function_name, arguments):
         return f"Error executing {function_name}: {str(e)}"
 
 
+def normalize_tool_call(function_name, arguments):
+    """
+    (function_name, arguments) with the function's defaults filled in, so
+    "turn left" and "turn left ninety degrees" compare equal
+    """
+    func = TOOL_FUNCTIONS.get(function_name)
+    if func is None:
+        return (function_name, dict(arguments or {}))
+    
+    import inspect
+    params = inspect.signature(func).parameters
+    full_args = {name: param.default for name, param in params.items()
+                 if param.default is not inspect.Parameter.empty}
+    if isinstance(arguments, dict):
+        full_args.update((k, v) for k, v in arguments.items() if k in params)
+    return (function_name, full_args)
+
+
 if __name__ == "__main__":
     # Test the tools
     print("Testing system tools...")
@@ -582,6 +797,25 @@ if __name__ == "__main__":
         category = detect_command_category(phrase)
         print(f"  '{phrase}' -> {category}")
     
+    print("\n=== Deterministic Command Parsing ===")
+    test_phrases = [
+        "what time is it",
+        "set volume to 30",
+        "set the volume too fifty percent",
+        "increase volume by ten",
+        "turn left ninety degrees",
+        "turn right",
+        "go forward for three seconds at twenty five percent",
+        "move forward 2 meters",
+        "don't turn left",
+        "turn left and then right",
+        "set volume to 50 and turn left",
+        "turn left twice",
+        "how do i turn left on a bike",
+    ]
+    for phrase in test_phrases:
+        print(f"  '{phrase}' -> {parse_command(phrase)}")
+    
     print("\n=== Motor Control (requires motor service) ===")
     print("5. Get distance:", get_distance())
     # Uncomment to test actual motor movement:
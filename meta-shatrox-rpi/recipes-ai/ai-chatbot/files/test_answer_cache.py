@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Answer cache tests for answer_cache.py
+The cache file lives in a temporary directory; time is patched for TTLs.
+
+    python3 -m unittest test_answer_cache
+"""
+
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from answer_cache import AnswerCache, normalize_question
+
+
+class NormalizeQuestionTest(unittest.TestCase):
+
+    def test_variants_share_a_key(self):
+        key = normalize_question("what is your name")
+        for text in ("What's your name?", "um, hey jarvis what is your name", "what’s your name please"):
+            with self.subTest(text=text):
+                self.assertEqual(normalize_question(text), key)
+
+    def test_meaning_is_kept(self):
+        self.assertNotEqual(normalize_question("what is your name"), normalize_question("what is my name"))
+
+
+class AnswerCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, "answers.json")
+        self.cache = self.make_cache()
+
+    def make_cache(self):
+        cache = AnswerCache(self.path, ttl=100, volatile_ttl=10, flush_delay=60, log=lambda *args: None)
+        self.addCleanup(cache.flush)
+        return cache
+
+    def test_context_questions_are_not_cached(self):
+        self.assertIsNone(self.cache.key("why is that"))
+        self.assertIsNone(self.cache.key("tell me more"))
+        self.assertIsNone(self.cache.key("um"))
+        self.assertEqual(self.cache.key("Tell me a joke!"), "tell joke")
+
+    def test_ttl(self):
+        with mock.patch('time.time', return_value=1000.0) as clock:
+            key = self.cache.key("tell me a joke")
+            self.cache.put(key, "Why did the robot cross the road?")
+            clock.return_value = 1099.0
+            self.assertEqual(self.cache.get(key), "Why did the robot cross the road?")
+            clock.return_value = 1101.0
+            self.assertIsNone(self.cache.get(key))
+        self.assertEqual(self.cache.stats(), {"hits": 1, "misses": 1, "entries": 0})
+
+    def test_volatile_questions_expire_sooner(self):
+        with mock.patch('time.time', return_value=1000.0) as clock:
+            key = self.cache.key("what is the weather today")
+            self.cache.put(key, "Sunny.")
+            clock.return_value = 1011.0
+            self.assertIsNone(self.cache.get(key))
+
+    def test_invalidate_whole_words_only(self):
+        self.cache.put("how loud are you", "My volume is 50 percent.")
+        self.cache.put("how do you speak", "Quietly enough, I hope.")  # Not "quiet"
+        self.assertEqual(self.cache.invalidate_for_tool('set_volume'), 1)
+        self.assertIsNone(self.cache.get("how loud are you"))
+        self.assertEqual(self.cache.get("how do you speak"), "Quietly enough, I hope.")
+        self.assertEqual(self.cache.invalidate_for_tool('get_current_time'), 0)
+
+    def test_entries_survive_restart(self):
+        self.cache.put("tell joke", "Knock knock.")
+        self.assertFalse(os.path.exists(self.path))  # Saved later, not on the answer path
+        self.cache.flush()
+        self.assertEqual(self.make_cache().get("tell joke"), "Knock knock.")
+
+    def test_background_flush(self):
+        self.cache.flush_delay = 0.05
+        self.cache.put("tell joke", "Knock knock.")
+        self.cache.put("tell story", "Once upon a time.")
+        self.cache.flush_timer.join(2)
+        self.assertFalse(self.cache.dirty)
+        self.assertEqual(len(self.make_cache().entries), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
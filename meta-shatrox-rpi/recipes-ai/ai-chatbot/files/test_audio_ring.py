@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Ring buffer tests for audio_ring.py
+
+    python3 -m unittest test_audio_ring
+"""
+
+import unittest
+
+import numpy as np
+
+from audio_ring import AudioRingBuffer
+
+
+def samples(start, count):
+    return np.arange(start, start + count, dtype=np.int16)
+
+
+class AudioRingBufferTest(unittest.TestCase):
+
+    def setUp(self):
+        self.ring = AudioRingBuffer(10)
+
+    def test_read_is_a_view_until_it_wraps(self):
+        self.ring.write(samples(0, 6))
+        view = self.ring.read(1, 5)
+        np.testing.assert_array_equal(view, samples(1, 4))
+        self.assertTrue(np.shares_memory(view, self.ring.buffer))
+
+        self.ring.write(samples(6, 7))  # Positions 10-12 wrap to the front
+        wrapped = self.ring.read(8)
+        np.testing.assert_array_equal(wrapped, samples(8, 5))
+        self.assertFalse(np.shares_memory(wrapped, self.ring.buffer))
+
+    def test_preroll_mark(self):
+        self.ring.write(samples(0, 13))
+        start = self.ring.mark(preroll=4)
+        self.assertEqual(start, 9)
+        self.ring.write(samples(13, 2))
+        np.testing.assert_array_equal(self.ring.read(start), samples(9, 6))
+
+    def test_preroll_limited_to_capacity(self):
+        self.ring.write(samples(0, 25))
+        self.assertEqual(self.ring.mark(preroll=100), 15)
+        self.assertEqual(self.ring.mark(preroll=100), self.ring.write_pos - self.ring.capacity)
+
+    def test_lapped_start_is_clamped(self):
+        """A recording older than the ring returns the newest capacity samples"""
+        start = self.ring.mark()
+        self.ring.write(samples(0, 14))
+        np.testing.assert_array_equal(self.ring.read(start), samples(4, 10))
+
+    def test_oversized_write_keeps_newest(self):
+        self.ring.write(samples(0, 3))
+        self.ring.write(samples(3, 23))
+        self.assertEqual(self.ring.write_pos, 26)
+        np.testing.assert_array_equal(self.ring.read(0), samples(16, 10))
+
+    def test_empty_read(self):
+        self.ring.write(samples(0, 5))
+        self.assertEqual(len(self.ring.read(5)), 0)
+        self.assertEqual(len(self.ring.read(4, 2)), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
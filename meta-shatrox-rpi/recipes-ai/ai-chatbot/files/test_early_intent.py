@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Early dispatch tests for early_intent.py
+Uses the real command detection and parsing from system_tools.py with a
+recording fake in place of execute_tool(); partial times are passed in.
+
+    python3 -m unittest test_early_intent
+"""
+
+import threading
+import unittest
+
+from early_intent import EarlyIntent
+from system_tools import detect_command_category, parse_command, normalize_tool_call
+
+
+class RecordingExecutor:
+    def __init__(self):
+        self.calls = []
+        self.lock = threading.Lock()
+
+    def __call__(self, function_name, arguments):
+        with self.lock:
+            self.calls.append((function_name, arguments))
+        return f"{function_name} done"
+
+
+class EarlyIntentTest(unittest.TestCase):
+
+    def setUp(self):
+        self.execute = RecordingExecutor()
+        self.early = EarlyIntent(detect_command_category, parse_command, self.execute,
+                                 normalize=normalize_tool_call, stable_seconds=0.6,
+                                 log=lambda *args, **kwargs: None)
+
+    def test_stop_fires_on_first_partial(self):
+        self.assertTrue(self.early.update("jarvis stop", now=100.0))
+        self.assertEqual(self.early.wait_result(), "motor_stop done")
+        self.assertEqual(self.execute.calls, [('motor_stop', {})])
+
+    def test_motion_waits_for_stable_partial(self):
+        self.assertFalse(self.early.update("turn left", now=100.0))
+        self.assertFalse(self.early.update("turn left", now=100.3))
+        self.assertTrue(self.early.update("turn left", now=100.7))
+        self.early.wait_result()
+        self.assertEqual(self.execute.calls, [('motor_left', {'speed': 50, 'angle': 90})])
+
+    def test_changed_partial_restarts_the_clock(self):
+        self.assertFalse(self.early.update("turn left", now=100.0))
+        self.assertFalse(self.early.update("turn left thirty degrees", now=100.7))
+        self.assertFalse(self.early.fired)
+
+    def test_end_of_segment_fires_at_once(self):
+        self.assertTrue(self.early.update("go forward", now=100.0, final=True))
+        self.assertEqual(self.early.call[0], 'motor_forward')
+
+    def test_ignored_partials(self):
+        for text in ("don't go forward", "what time is it", "turn left and then right", ""):
+            with self.subTest(text=text):
+                self.assertFalse(self.early.update(text, now=100.0, final=True))
+        self.assertFalse(self.early.fired)
+
+    def test_confirms_with_defaults_filled_in(self):
+        self.early.update("turn left", now=100.0, final=True)
+        self.assertTrue(self.early.confirms("turn left ninety degrees"))
+        self.assertFalse(self.early.confirms("turn left thirty degrees"))
+        self.assertFalse(self.early.confirms("turn right"))
+
+    def test_withdraw_stops_unconfirmed_motion(self):
+        self.early.update("go forward", now=100.0, final=True)
+        self.assertEqual(self.early.withdraw(), "motor_stop done")
+        self.assertEqual([call[0] for call in self.execute.calls], ['motor_forward', 'motor_stop'])
+
+    def test_withdraw_leaves_stop_alone(self):
+        self.early.update("stop", now=100.0)
+        self.assertIsNone(self.early.withdraw())
+        self.assertEqual(self.execute.calls, [('motor_stop', {})])
+
+
+if __name__ == "__main__":
+    unittest.main()
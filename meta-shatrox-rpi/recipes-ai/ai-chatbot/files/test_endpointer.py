@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+End-of-speech tests for endpointer.py
+webrtcvad is replaced by a fake that calls any non-silent frame speech,
+and time is the audio clock passed to update().
+
+    python3 -m unittest test_endpointer
+"""
+
+import unittest
+
+import numpy as np
+
+from endpointer import VadEndpointer, transcript_completeness
+
+CHUNK = 1280            # 80ms at 16kHz
+CHUNK_SECONDS = 0.08
+
+
+class FakeVad:
+    def is_speech(self, frame, rate):
+        return any(frame)
+
+
+def speech(level=3000):
+    return np.full(CHUNK, level, dtype=np.int16)
+
+
+def silence():
+    return np.zeros(CHUNK, dtype=np.int16)
+
+
+class TranscriptCompletenessTest(unittest.TestCase):
+
+    def test_completeness(self):
+        cases = {
+            "stop": 'complete',
+            "jarvis stop": 'complete',
+            "hey jarvis turn left": 'complete',
+            "harvest stop": 'complete',     # Misheard wake word tail
+            "turn left and": 'incomplete',
+            "what is the": 'incomplete',
+            "tell me a story": None,
+            "": None,
+        }
+        for text, expected in cases.items():
+            with self.subTest(text=text):
+                self.assertEqual(transcript_completeness(text), expected)
+
+
+class VadEndpointerTest(unittest.TestCase):
+
+    def run_until_end(self, endpointer, speech_chunks=5, partial=None, limit=15.0):
+        """Feed speech then silence; (reason, seconds of silence) at the endpoint"""
+        now = 0.0
+        endpointer.start(now)
+        for _ in range(speech_chunks):
+            now += CHUNK_SECONDS
+            self.assertIsNone(endpointer.update(speech(), now, CHUNK_SECONDS))
+        if partial is not None:
+            endpointer.set_partial(partial)
+        speech_end = now
+        while now < limit:
+            now += CHUNK_SECONDS
+            reason = endpointer.update(silence(), now, CHUNK_SECONDS)
+            if reason:
+                return reason, now - speech_end
+        self.fail("no endpoint")
+
+    def test_fixed_timer(self):
+        endpointer = VadEndpointer(FakeVad(), silence_threshold=0.8, adaptive=False)
+        reason, waited = self.run_until_end(endpointer, partial="stop")
+        self.assertEqual(reason, 'silence')
+        self.assertAlmostEqual(waited, 0.8, delta=CHUNK_SECONDS)
+
+    def test_complete_command_ends_early(self):
+        endpointer = VadEndpointer(FakeVad(), silence_threshold=0.8, min_silence=0.3)
+        reason, waited = self.run_until_end(endpointer, partial="stop")
+        self.assertEqual(reason, 'silence')
+        self.assertAlmostEqual(waited, 0.3, delta=CHUNK_SECONDS)
+        self.assertEqual(endpointer.result["completeness"], 'complete')
+
+    def test_incomplete_sentence_waits_longer(self):
+        endpointer = VadEndpointer(FakeVad(), silence_threshold=0.8, max_silence=1.5)
+        reason, waited = self.run_until_end(endpointer, partial="turn left and")
+        self.assertEqual(reason, 'silence')
+        self.assertAlmostEqual(waited, 1.5, delta=CHUNK_SECONDS)
+
+    def test_trailing_off_ends_sooner(self):
+        """Speech that fades to the noise floor needs less silence than a pause at full level"""
+        endpointer = VadEndpointer(FakeVad(), silence_threshold=0.8, min_silence=0.3)
+        now = 0.0
+        endpointer.start(now)
+        for level in (8000, 8000, 8000, 500):
+            now += CHUNK_SECONDS
+            endpointer.update(speech(level), now, CHUNK_SECONDS)
+        self.assertIsNone(endpointer.update(silence(), now + CHUNK_SECONDS, CHUNK_SECONDS))
+        self.assertAlmostEqual(endpointer.required, (0.3 + 0.8) / 2)
+
+    def test_timeout_without_speech(self):
+        endpointer = VadEndpointer(FakeVad(), max_duration=2.0)
+        reason, _ = self.run_until_end(endpointer, speech_chunks=0)
+        self.assertEqual(reason, 'timeout')
+        self.assertAlmostEqual(endpointer.result["recording_s"], 2.0, delta=CHUNK_SECONDS)
+        self.assertEqual(endpointer.result["speech_ms"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
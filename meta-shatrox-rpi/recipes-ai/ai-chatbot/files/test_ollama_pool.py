@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Routing and circuit breaker tests for ollama_pool.py
+Runs without Ollama: the ollama module is replaced with a fake before
+import and requests are plain functions of the backend.
+
+    python3 -m unittest test_ollama_pool
+"""
+
+import sys
+import types
+import threading
+import configparser
+import unittest
+from unittest import mock
+
+
+class FakeClient:
+    def __init__(self, host=None, timeout=None):
+        self.host = host
+
+
+sys.modules["ollama"] = types.SimpleNamespace(Client=FakeClient)
+import ollama_pool  # noqa: E402
+
+
+def make_pool(hosts=("fast:11434", "slow:11434")):
+    config = configparser.ConfigParser()
+    config.read_string("[ollama]\nfailure_threshold = 2\ncircuit_open_time = 30\n"
+                       "request_deadline = 60\newma_alpha = 0.5\n")
+    return ollama_pool.OllamaPool(list(hosts), config['ollama'], log=lambda *args: None)
+
+
+class CircuitBreakerTest(unittest.TestCase):
+
+    def setUp(self):
+        self.pool = make_pool()
+        self.fast, self.slow = self.pool.remote
+
+    def test_circuit_opens_after_threshold_and_half_opens(self):
+        with mock.patch('time.time', return_value=1000.0) as clock:
+            self.pool.record_failure(self.fast, "refused")
+            self.assertTrue(self.fast.is_available())
+            self.pool.record_failure(self.fast, "refused")
+            self.assertFalse(self.fast.is_available())
+            self.assertNotIn(self.fast, self.pool.candidates())
+
+            clock.return_value = 1031.0  # Cool-down over: one trial request may go through
+            self.assertIn(self.fast, self.pool.candidates())
+            self.pool.record_success(self.fast, 0.2)
+            self.assertEqual(self.fast.consecutive_failures, 0)
+            self.assertEqual(self.fast.open_until, 0.0)
+
+    def test_routes_on_request_latency_not_probes(self):
+        self.pool.record_success(self.fast, 0.5)
+        self.pool.record_success(self.slow, 2.0)
+        self.pool.record_success(self.slow, 0.01, probe=True)  # A quick /api/ps says nothing
+        self.assertEqual(self.pool.candidates(), [self.fast, self.slow, self.pool.local])
+        self.pool.record_success(self.fast, 4.0)
+        self.assertEqual(self.fast.request_latency, 2.25)
+        self.assertEqual(self.pool.preferred(), self.slow)
+
+    def test_failover_to_next_backend(self):
+        def request(backend):
+            if backend is self.fast:
+                raise ConnectionError("refused")
+            return backend.host
+
+        backend, result = self.pool.run(request)
+        self.assertIs(backend, self.slow)
+        self.assertEqual(result, "slow:11434")
+        self.assertEqual(self.fast.failures, 1)
+        self.assertEqual(self.slow.successes, 1)
+
+    def test_local_is_last_resort(self):
+        def request(backend):
+            if not backend.local:
+                raise TimeoutError("timed out")
+            return "local answer"
+
+        backend, result = self.pool.run(request)
+        self.assertIs(backend, self.pool.local)
+        self.assertEqual(result, "local answer")
+
+    def test_local_failure_is_raised(self):
+        def request(backend):
+            raise ConnectionError(f"{backend.host} down")
+
+        with self.assertRaisesRegex(ConnectionError, "local down"):
+            self.pool.run(request)
+        self.assertEqual([b.failures for b in self.pool.remote], [1, 1])
+
+    def test_cancelled_request_is_not_the_hosts_fault(self):
+        cancelled = threading.Event()
+        tried = []
+
+        def request(backend):
+            tried.append(backend)
+            cancelled.set()  # Barge-in while the request was running
+            raise ConnectionAbortedError("aborted")
+
+        with self.assertRaises(ConnectionAbortedError):
+            self.pool.run(request, cancelled=cancelled)
+        self.assertEqual(tried, [self.fast])
+        self.assertEqual(self.fast.failures, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
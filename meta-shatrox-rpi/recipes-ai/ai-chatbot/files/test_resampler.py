@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+Streaming decimation tests for resampler.py
+
+    python3 -m unittest test_resampler
+"""
+
+import unittest
+
+import numpy as np
+
+from resampler import StreamingDecimator
+
+
+def tone(freq, seconds=1.0, rate=48000, amplitude=10000):
+    t = np.arange(int(seconds * rate)) / rate
+    return (amplitude * np.sin(2 * np.pi * freq * t)).astype(np.int16)
+
+
+def rms(samples):
+    return float(np.sqrt(np.mean(samples.astype(np.float64) ** 2)))
+
+
+class StreamingDecimatorTest(unittest.TestCase):
+
+    def test_chunks_join_seamlessly(self):
+        """Any chunking gives the same output as one call over the whole signal"""
+        signal = np.random.default_rng(1).integers(-20000, 20000, 4801).astype(np.int16)
+        whole = StreamingDecimator().process(signal)
+
+        decimator = StreamingDecimator()
+        parts, pos = [], 0
+        for size in (1, 2, 479, 1024, 1000, 7, 2288):
+            parts.append(decimator.process(signal[pos:pos + size]))
+            pos += size
+        self.assertEqual(pos, len(signal))
+        np.testing.assert_array_equal(np.concatenate(parts), whole)
+        self.assertEqual(len(whole), 1601)
+
+    def test_passband_and_alias_rejection(self):
+        """1kHz passes, 10kHz (would alias to 6kHz at 16kHz) is filtered out"""
+        passed = StreamingDecimator().process(tone(1000))[100:]
+        rejected = StreamingDecimator().process(tone(10000))[100:]
+        self.assertAlmostEqual(rms(passed), 10000 / np.sqrt(2), delta=100)
+        self.assertLess(rms(rejected), 10)
+
+    def test_reset_clears_history(self):
+        decimator = StreamingDecimator()
+        decimator.process(tone(1000, seconds=0.01))
+        decimator.reset()
+        out = decimator.process(np.zeros(960, dtype=np.int16))
+        self.assertFalse(out.any())
+        self.assertEqual(out.dtype, np.int16)
+
+
+if __name__ == "__main__":
+    unittest.main()
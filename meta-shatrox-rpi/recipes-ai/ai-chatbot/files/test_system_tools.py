@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+Deterministic command parsing tests for system_tools.py
+Only parse_command() is exercised, nothing is executed.
+
+    python3 -m unittest test_system_tools
+"""
+
+import unittest
+
+from system_tools import parse_command
+
+
+class ParseCommandTest(unittest.TestCase):
+
+    def test_simple_commands(self):
+        cases = {
+            "what time is it": ('get_current_time', {}),
+            "stop": ('motor_stop', {}),
+            "set volume to max": ('set_volume', {'percent': 100}),
+            "set the volume too fifty percent": ('set_volume', {'percent': 50}),
+            "turn left ninety degrees": ('motor_left', {'angle': 90}),
+            "turn right at fifty percent speed": ('motor_right', {'speed': 50}),
+            "go forward slowly for two seconds": ('motor_forward', {'speed': 30, 'duration': 2}),
+        }
+        for text, expected in cases.items():
+            with self.subTest(text=text):
+                self.assertEqual(parse_command(text), expected)
+
+    def test_ambiguous_commands_go_to_llm(self):
+        for text in (
+            "increase volume by ten",                   # Relative, needs the current level
+            "set volume to one hundred and twenty",     # Out of range
+            "go forward 3",                             # Unitless number
+            "don't turn left",                          # Negated
+            "turn left and then right",                 # Sequence
+            "turn left twice",                          # Repeat
+            "how do i turn left on a bike",             # Question about an action
+            "shut down",                                # Needs confirmation
+            "tell me a joke",                           # Not a command
+        ):
+            with self.subTest(text=text):
+                self.assertIsNone(parse_command(text))
+
+    def test_category_from_caller(self):
+        """The caller's category is used as is, the text isn't matched again"""
+        self.assertEqual(parse_command("the time please", 'TIME_COMMAND'), ('get_current_time', {}))
+        self.assertEqual(parse_command("turn left", 'MOTOR_LEFT'), ('motor_left', {}))
+
+
+if __name__ == "__main__":
+    unittest.main()
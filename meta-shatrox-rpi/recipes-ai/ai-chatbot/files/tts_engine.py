@@ -0,0 +1,511 @@
+#!/usr/bin/env python3
+"""
+Persistent TTS Engine for AI Chatbot
+Keeps one Piper process (voice model loaded once) for the lifetime of the
+service, instead of forking the 'speak' wrapper (detect-audio.sh + piper +
+aplay) for every utterance. Piper streams raw PCM, which is played as it
+arrives on an ALSA playback stream that stays open while we talk and is
+closed after PLAYER_IDLE_SECONDS, so other players (wake feedback, the
+'speak' fallback, startup sound) can use the device in between.
+"""
+
+import os
+import re
+import json
+import time
+import shutil
+import select
+import hashlib
+import threading
+import subprocess
+from collections import OrderedDict
+
+import numpy as np
+
+DEFAULT_VOICE_MODEL = "/usr/share/piper-voices/default.onnx"
+
+# Piper logs this on stderr once all audio for an input line is on stdout
+PIPER_LINE_DONE = b'Real-time factor'
+PIPER_READ_BYTES = 16384
+PIPER_TIMEOUT = 10.0  # Longest wait for Piper output (s)
+
+# The plughw device is exclusive (no dmix), so release it when not speaking
+PLAYER_IDLE_SECONDS = 1.0
+
+# Silence appended to every utterance so aplay flushes its last partial period
+# instead of holding the tail of a sentence until the next one arrives
+TAIL_SILENCE_SECONDS = 0.2
+
+# Resolution of the output level envelope used to gate wake word barge-in
+LEVEL_BLOCK_SECONDS = 0.02
+
+# Engine used by say() when running inside the ai-chatbot process
+_default_engine = None
+
+# Synthesized speech cache (disk tier survives reboots, memory tier is an LRU)
+SPEECH_CACHE_DIR = "/var/cache/ai-chatbot/tts"
+SPEECH_CACHE_MEMORY_BYTES = 16 * 1024 * 1024
+
+# Fixed phrases the robot says often - pre-rendered at boot so they play instantly
+COMMON_PHRASES = [
+    "Motors stopped",                                                         # system_tools.motor_stop()
+    "I detected a command but couldn't understand the details. Please try again.",  # ai-chatbot fallback
+    "Hi, I'm Jarvis — an AI-powered robot here to answer your questions",   # K2 greeting
+    "zoozoo haii yaii yaii",                                                  # K4 fun sound
+    "System is shutting down in 3 2 1",                                       # K8 / shutdown_system()
+    "Volume set to",
+]
+
+# Templated phrases are split into pieces, each cached and played back-to-back
+# (e.g. "Volume set to 50%" -> "Volume set to" + "50%")
+SPEECH_TEMPLATES = [
+    re.compile(r'^(Volume set to) (\d+%)$'),
+    re.compile(r'^(Turning (?:left|right)) ([\d.]+ degrees)$'),
+]
+
+
+def split_template(text):
+    """Return cacheable pieces if text matches a speech template, else None"""
+    for template in SPEECH_TEMPLATES:
+        match = template.match(text)
+        if match:
+            return list(match.groups())
+    return None
+
+
+class SpeechCache:
+    """Content-addressed PCM cache keyed by (voice model, text)"""
+
+    def __init__(self, voice_model, cache_dir=SPEECH_CACHE_DIR, max_memory_bytes=SPEECH_CACHE_MEMORY_BYTES):
+        self.cache_dir = cache_dir
+        self.max_memory_bytes = max_memory_bytes
+        self.voice_id = self._voice_id(voice_model)
+
+        self.memory = OrderedDict()  # key -> PCM bytes, most recently used last
+        self.memory_bytes = 0
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+        except OSError:
+            pass  # Memory tier still works without the disk tier
+
+    @staticmethod
+    def _voice_id(voice_model):
+        """Identify the actual voice file (default.onnx is a symlink)"""
+        path = os.path.realpath(voice_model)
+        try:
+            st = os.stat(path)
+            return f"{path}:{st.st_size}:{int(st.st_mtime)}"
+        except OSError:
+            return path
+
+    def key(self, text):
+        return hashlib.sha256(f"{self.voice_id}\0{text}".encode('utf-8')).hexdigest()
+
+    def get(self, text):
+        """Return cached PCM for text or None (memory first, then disk)"""
+        key = self.key(text)
+        with self.lock:
+            pcm = self.memory.get(key)
+            if pcm is not None:
+                self.memory.move_to_end(key)
+                self.hits += 1
+                return pcm
+
+        try:
+            with open(os.path.join(self.cache_dir, key + '.pcm'), 'rb') as f:
+                pcm = f.read()
+        except OSError:
+            with self.lock:
+                self.misses += 1
+            return None
+
+        with self.lock:
+            self.hits += 1
+        self._remember(key, pcm)
+        return pcm
+
+    def put(self, text, pcm):
+        """Store PCM in both tiers"""
+        key = self.key(text)
+        path = os.path.join(self.cache_dir, key + '.pcm')
+        try:
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            with open(tmp_path, 'wb') as f:
+                f.write(pcm)
+            os.replace(tmp_path, path)  # Atomic: readers never see a partial file
+        except OSError:
+            pass  # Disk tier is best-effort (read-only or full /var)
+        self._remember(key, pcm)
+
+    def _remember(self, key, pcm):
+        """Insert into memory LRU, evicting least recently used entries over the limit"""
+        if len(pcm) > self.max_memory_bytes:
+            return
+        with self.lock:
+            if key in self.memory:
+                self.memory_bytes -= len(self.memory.pop(key))
+            self.memory[key] = pcm
+            self.memory_bytes += len(pcm)
+            while self.memory_bytes > self.max_memory_bytes:
+                _, evicted = self.memory.popitem(last=False)
+                self.memory_bytes -= len(evicted)
+
+    def stats(self):
+        with self.lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "entries": len(self.memory),
+                "memory_bytes": self.memory_bytes
+            }
+
+
+def detect_audio_device():
+    """Return ALSA device string (same rules as detect-audio.sh, run once)"""
+    try:
+        output = subprocess.run(['aplay', '-l'], capture_output=True, text=True, timeout=5).stdout
+    except Exception:
+        return "default"
+
+    cards = re.findall(r'^card (\d+):(.*)$', output, re.MULTILINE)
+
+    # Prefer USB Audio device
+    for card, description in cards:
+        if 'usb audio' in description.lower():
+            return f"plughw:{card},0"
+
+    # Fallback to first available card
+    if cards:
+        return f"plughw:{cards[0][0]},0"
+
+    return "default"
+
+
+class PiperEngine:
+    """Long-lived Piper synthesizer with a playback stream opened on demand"""
+
+    def __init__(self, voice_model=DEFAULT_VOICE_MODEL, device='auto', log=print, cache=None):
+        self.voice_model = voice_model
+        self.device = device
+        self.log = log
+        self.cache = cache
+        self.sample_rate = self._read_sample_rate()
+
+        self.piper = None
+        self.player = None
+        self.synth_lock = threading.Lock()  # One utterance at a time through Piper
+        self.play_lock = threading.Lock()   # One writer on the playback stream
+        self.play_until = 0.0               # monotonic time queued audio finishes
+        self.segments = []                  # (start, levels) of queued audio, for output_level()
+        self.running = False
+        self.idle_thread = None             # Closes the player once it has been idle
+
+    def _read_sample_rate(self):
+        """Voice sample rate from the model's .onnx.json (22050 for medium voices)"""
+        try:
+            with open(self.voice_model + '.json') as f:
+                return int(json.load(f)['audio']['sample_rate'])
+        except Exception:
+            return 22050
+
+    def start(self):
+        """Detect the output device once and start Piper (the player opens on demand)"""
+        if not os.path.exists(self.voice_model):
+            raise FileNotFoundError(f"Voice model not found at {self.voice_model}")
+        if not shutil.which('piper'):
+            raise FileNotFoundError("piper binary not found")
+
+        if self.device == 'auto':
+            self.device = detect_audio_device()
+
+        with self.synth_lock:
+            self._ensure_piper()
+        self.running = True
+        self.idle_thread = threading.Thread(target=self._idle_loop, name="tts-player-idle", daemon=True)
+        self.idle_thread.start()
+        self.log(f"TTS engine ready (voice: {self.voice_model}, device: {self.device}, {self.sample_rate}Hz)")
+
+    def stop(self):
+        """Terminate Piper and the player"""
+        self.running = False
+        for proc in (self.piper, self.player):
+            if proc and proc.poll() is None:
+                try:
+                    proc.stdin.close()
+                    proc.terminate()
+                    proc.wait(timeout=2)
+                except Exception:
+                    proc.kill()
+        self.piper = None
+        self.player = None
+
+    def _ensure_piper(self):
+        """(Re)start Piper in raw mode: one text line in, PCM out as each sentence is ready"""
+        if self.piper and self.piper.poll() is None:
+            return
+        self.piper = subprocess.Popen(
+            ['piper', '--model', self.voice_model, '--output_raw'],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE
+        )
+        os.set_blocking(self.piper.stdout.fileno(), False)
+        self.piper_log = b''  # Partial stderr line
+
+    def _ensure_player(self):
+        """(Re)start the raw PCM playback stream on the detected device"""
+        if self.player and self.player.poll() is None:
+            return
+        self.player = subprocess.Popen(
+            ['aplay', '-q', '-D', self.device, '-t', 'raw', '-f', 'S16_LE',
+             '-c', '1', '-r', str(self.sample_rate), '-'],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL
+        )
+        self.play_until = 0.0
+        self.segments = []
+
+    def synthesize(self, text):
+        """Synthesize text to raw 16-bit mono PCM bytes"""
+        return b''.join(self.synthesize_stream(text))
+
+    def synthesize_stream(self, text):
+        """Yield raw 16-bit mono PCM chunks of text as Piper produces them
+
+        Holds synth_lock until the utterance is complete; if the caller stops
+        iterating early the rest is read and dropped, so the next utterance
+        doesn't start with this one's tail.
+        """
+        line = ' '.join(text.split())  # Piper treats each line as one utterance
+        if not line:
+            return
+
+        with self.synth_lock:
+            self._ensure_piper()
+            self.piper.stdin.write((line + '\n').encode('utf-8'))
+            self.piper.stdin.flush()
+            output = self._read_utterance(self.piper)
+            try:
+                for pcm in output:
+                    yield pcm
+            finally:
+                for _ in output:
+                    pass
+
+    def _read_utterance(self, piper):
+        """PCM chunks on Piper's stdout until it logs the line as done (caller holds synth_lock)"""
+        stdout, stderr = piper.stdout.fileno(), piper.stderr.fileno()
+        odd = b''  # Half a sample left over from the last read
+        finished = False
+        while True:
+            if not finished:
+                ready, _, _ = select.select([stdout, stderr], [], [], PIPER_TIMEOUT)
+                if not ready:
+                    piper.kill()  # Out of step with us: restarted for the next utterance
+                    raise RuntimeError("Piper stopped responding during synthesis")
+                if stderr in ready:
+                    data = os.read(stderr, PIPER_READ_BYTES)
+                    if not data:
+                        raise RuntimeError("Piper exited during synthesis")
+                    lines = (self.piper_log + data).split(b'\n')
+                    self.piper_log = lines.pop()
+                    finished = any(PIPER_LINE_DONE in l for l in lines)
+            try:
+                data = os.read(stdout, PIPER_READ_BYTES)
+            except BlockingIOError:
+                data = b''
+            if data:
+                data = odd + data
+                whole = len(data) - len(data) % 2
+                data, odd = data[:whole], data[whole:]
+                if data:
+                    yield data
+            elif finished:
+                return  # Audio is written before the log line, so stdout is drained
+
+    def play(self, pcm, wait=True, cancel=None, tail=True):
+        """Queue PCM on the playback stream, optionally wait until heard
+
+        cancel is a threading.Event; once set nothing more is queued and
+        waiting returns early (stop_playback() silences what is queued).
+        tail=False leaves out the trailing silence, for all but the last
+        chunk of a streamed utterance.
+        """
+        if pcm:
+            if tail:
+                pcm += b'\x00\x00' * int(self.sample_rate * TAIL_SILENCE_SECONDS)
+            with self.play_lock:
+                # Checked under the lock so a concurrent stop_playback() can't be undone
+                if cancel is not None and cancel.is_set():
+                    return
+                self._ensure_player()
+                now = time.monotonic()
+                start = max(now, self.play_until)
+                self.player.stdin.write(pcm)
+                self.player.stdin.flush()
+                self.play_until = start + len(pcm) / (2 * self.sample_rate)
+                self.segments = [seg for seg in self.segments if seg[0] + seg[2] > now]
+                self.segments.append((start, self._block_levels(pcm), len(pcm) / (2 * self.sample_rate)))
+        if wait:
+            self.wait_done(cancel)
+
+    def _block_levels(self, pcm):
+        """RMS of each LEVEL_BLOCK_SECONDS block of PCM"""
+        samples = np.frombuffer(pcm, dtype=np.int16).astype(np.float32)
+        block = max(1, int(self.sample_rate * LEVEL_BLOCK_SECONDS))
+        usable = len(samples) - len(samples) % block
+        if usable == 0:
+            return np.zeros(1, dtype=np.float32)
+        return np.sqrt(np.mean(samples[:usable].reshape(-1, block) ** 2, axis=1))
+
+    def output_level(self, window=0.3):
+        """Loudest RMS we played during the last window seconds (0 when silent)
+
+        A window rather than an instant covers the device buffer latency
+        between writing PCM and it reaching the speaker.
+        """
+        now = time.monotonic()
+        level = 0.0
+        for start, levels, duration in list(self.segments):
+            first = int((now - window - start) / LEVEL_BLOCK_SECONDS)
+            last = int((now - start) / LEVEL_BLOCK_SECONDS) + 1
+            first, last = max(0, first), min(len(levels), last)
+            if first < last:
+                level = max(level, float(levels[first:last].max()))
+        return level
+
+    def is_playing(self):
+        return time.monotonic() < self.play_until
+
+    def _idle_loop(self):
+        """Close the player once nothing has been queued for PLAYER_IDLE_SECONDS"""
+        while self.running:
+            time.sleep(PLAYER_IDLE_SECONDS / 4)
+            with self.play_lock:
+                if self.player is None or time.monotonic() < self.play_until + PLAYER_IDLE_SECONDS:
+                    continue
+                # Everything queued has been heard: EOF lets aplay exit cleanly
+                try:
+                    self.player.stdin.close()
+                    self.player.wait(timeout=2)
+                except Exception:
+                    self.player.kill()
+                self.player = None
+                self.segments = []
+
+    def stop_playback(self):
+        """Silence the speaker now: drop everything queued on the playback stream
+
+        Killing aplay discards its buffer immediately; the next play() starts
+        a fresh stream.
+        """
+        with self.play_lock:
+            if self.player and self.player.poll() is None:
+                self.player.kill()
+                self.player.wait()
+            self.player = None
+            self.play_until = 0.0
+            self.segments = []
+
+    def wait_done(self, cancel=None):
+        """Block until everything queued on the playback stream has been played"""
+        while True:
+            remaining = self.play_until - time.monotonic()
+            if remaining <= 0 or (cancel is not None and cancel.is_set()):
+                return
+            time.sleep(min(remaining, 0.02 if cancel is not None else 0.05))
+
+    def render(self, text, cache=None):
+        """Get PCM for text, from the speech cache where possible
+        
+        cache=None caches only known phrases and templated pieces, so free-form
+        LLM answers don't fill the disk.
+        """
+        text = ' '.join(text.split())
+        if not self._cacheable(text, cache):
+            return self.synthesize(text)
+
+        pieces = split_template(text)
+        if pieces:
+            return b''.join(self._render_cached(piece) for piece in pieces)
+        return self._render_cached(text)
+
+    def _cacheable(self, text, cache=None):
+        """True if render() takes text from the speech cache"""
+        if not self.cache or cache is False:
+            return False
+        return bool(cache or text in COMMON_PHRASES or split_template(text))
+
+    def _render_cached(self, text):
+        pcm = self.cache.get(text)
+        if pcm is None:
+            pcm = self.synthesize(text)
+            if pcm:
+                self.cache.put(text, pcm)
+        return pcm
+
+    def prerender(self, phrases=COMMON_PHRASES):
+        """Warm the speech cache (synthesizes only phrases missing from disk)"""
+        if not self.cache:
+            return
+        start = time.time()
+        for phrase in phrases:
+            try:
+                self._render_cached(' '.join(phrase.split()))
+            except Exception as e:
+                self.log(f"Failed to pre-render '{phrase}': {e}")
+        self.log(f"Pre-rendered {len(phrases)} phrases in {time.time() - start:.1f}s")
+
+    def say(self, text, wait=True, cache=None, cancel=None):
+        """Synthesize (or fetch from cache) and play text
+
+        Text that isn't cached is played while Piper is still producing it.
+        """
+        text = ' '.join(text.split())
+        if self._cacheable(text, cache):
+            self.play(self.render(text, cache=cache), wait=wait, cancel=cancel)
+            return
+
+        queued = False
+        for pcm in self.synthesize_stream(text):
+            if cancel is not None and cancel.is_set():
+                return
+            self.play(pcm, wait=False, cancel=cancel, tail=False)
+            queued = True
+        if queued:
+            self.play(b'\x00\x00' * int(self.sample_rate * TAIL_SILENCE_SECONDS), wait=wait, cancel=cancel, tail=False)
+
+
+def set_default_engine(engine):
+    """Register the in-process engine used by say()"""
+    global _default_engine
+    _default_engine = engine
+
+
+def say(text, wait=True):
+    """Speak text through the in-process engine, or the 'speak' wrapper if none"""
+    if _default_engine is not None:
+        try:
+            _default_engine.say(text, wait=wait)
+            return
+        except Exception as e:
+            print(f"TTS engine failed, falling back to speak: {e}")
+
+    if wait:
+        subprocess.run(['speak', text], timeout=30)
+    else:
+        subprocess.Popen(['speak', text])
+
+
+if __name__ == "__main__":
+    # Test the engine
+    import sys
+    engine = PiperEngine(cache=SpeechCache(DEFAULT_VOICE_MODEL))
+    engine.start()
+    engine.say(' '.join(sys.argv[1:]) or "Text to speech engine test")
+    engine.stop()
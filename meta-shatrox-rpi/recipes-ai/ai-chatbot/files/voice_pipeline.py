@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+"""
+Voice Pipeline for AI Chatbot
+A voice interaction is a Job that moves through worker stages (ASR -> LLM
+-> TTS), each a thread fed by its own queue. The capture, wake word and
+socket threads only submit jobs and never wait on transcription, the LLM
+or playback. Jobs carry their own state and timestamps so each stage can
+be measured on its own. Every job has a cancellation token that the
+stages check between steps, so a barge-in stops it wherever it is.
+"""
+
+import time
+import queue
+import itertools
+import threading
+
+_job_ids = itertools.count(1)
+
+
+class Job:
+    """One interaction: recording or trigger in, spoken answer out"""
+
+    def __init__(self, kind, source=None, recognizer=None, asr_samples=0, asr_text="",
+                 audio=None, wav_path=None):
+        self.id = next(_job_ids)
+        self.kind = kind                # 'voice', 'camera' or 'speech'
+        self.source = source            # 'wake_word', 'k1_button', ...
+        self.recognizer = recognizer    # Live streaming recognizer to finalize, or None
+        self.asr_samples = asr_samples
+        self.asr_text = asr_text        # Segments the recognizer already finalized
+        self.audio = audio              # 16kHz int16 copy for the WAV path
+        self.wav_path = wav_path
+        self.transcript = None
+        self.early_intent = None        # EarlyIntent already dispatched from ASR partials
+
+        # Sentences for the TTS stage; None ends the answer
+        self.sentences = queue.Queue()
+        self.speaking = False
+        self.spoken = threading.Event()  # Set when the TTS stage is done with the job
+        self.speech_ok = True
+
+        # Cancellation token, set on barge-in
+        self.cancelled = threading.Event()
+        self.cancel_reason = None
+        self.cancel_callbacks = []      # Run on cancel, e.g. to abort a blocking LLM request
+        self.cancel_lock = threading.Lock()
+
+        self.timestamps = [("created", time.time())]
+
+    def cancel(self, reason):
+        with self.cancel_lock:
+            if self.cancelled.is_set():
+                return
+            self.cancel_reason = reason
+            self.cancelled.set()
+            callbacks, self.cancel_callbacks = self.cancel_callbacks, []
+        self.mark(f"cancelled_{reason}")
+        # Unblock a TTS stage waiting for the next sentence
+        self.sentences.put(None)
+        for callback in callbacks:
+            try:
+                callback()
+            except Exception:
+                pass
+
+    def on_cancel(self, callback):
+        """Call callback when the job is cancelled (right away if it already is)"""
+        with self.cancel_lock:
+            if not self.cancelled.is_set():
+                self.cancel_callbacks.append(callback)
+                return
+        callback()
+
+    def is_cancelled(self):
+        return self.cancelled.is_set()
+
+    def speech_finished(self, ok=True):
+        """The TTS stage is done with this job, or will never run it"""
+        self.speech_ok = ok
+        self.spoken.set()
+
+    def mark(self, event):
+        self.timestamps.append((event, time.time()))
+
+    def timings(self):
+        """Milliseconds between consecutive events, in order"""
+        return {
+            event: round((t - self.timestamps[i][1]) * 1000)
+            for i, (event, t) in enumerate(self.timestamps[1:])
+        }
+
+    def total_ms(self):
+        return round((self.timestamps[-1][1] - self.timestamps[0][1]) * 1000)
+
+    def summary(self):
+        steps = ", ".join(f"{event} +{ms}ms" for event, ms in self.timings().items())
+        return f"Job #{self.id} ({self.kind}/{self.source}): {steps} = {self.total_ms()}ms"
+
+
+class PipelineStage:
+    """Worker thread processing jobs from a bounded queue, one at a time"""
+
+    def __init__(self, name, handler, maxsize=4, log=print, on_skip=None):
+        self.name = name
+        self.handler = handler
+        self.on_skip = on_skip  # Called for queued jobs that are cancelled before they run
+        self.queue = queue.Queue(maxsize)
+        self.log = log
+        self.running = False
+
+        self.processed = 0
+        self.failed = 0
+        self.rejected = 0
+        self.busy_seconds = 0.0
+        self.max_ms = 0.0
+        self.high_water = 0
+        self.current = None     # Job being processed
+
+    def submit(self, job):
+        """Queue a job without blocking the caller, False if the stage is full"""
+        try:
+            self.queue.put_nowait(job)
+        except queue.Full:
+            self.rejected += 1
+            self.log(f"{self.name} stage full, dropping job #{job.id}", "WARN")
+            return False
+        job.mark(f"{self.name}_queued")
+        self.high_water = max(self.high_water, self.queue.qsize())
+        return True
+
+    def run(self):
+        while self.running:
+            try:
+                job = self.queue.get(timeout=0.5)
+            except queue.Empty:
+                continue
+            if job.is_cancelled():
+                self._skipped(job)
+                continue
+            self.current = job
+            job.mark(f"{self.name}_start")
+            start = time.time()
+            try:
+                self.handler(job)
+            except Exception as e:
+                self.failed += 1
+                self.log(f"{self.name} stage failed on job #{job.id}: {e}", "ERROR")
+            finally:
+                elapsed = time.time() - start
+                job.mark(f"{self.name}_done")
+                self.current = None
+                self.processed += 1
+                self.busy_seconds += elapsed
+                self.max_ms = max(self.max_ms, elapsed * 1000)
+
+    def cancel_all(self, reason):
+        """Cancel the running job and everything still queued, returns how many"""
+        jobs = []
+        while True:
+            try:
+                jobs.append(self.queue.get_nowait())
+            except queue.Empty:
+                break
+        queued = list(jobs)
+        current = self.current
+        if current is not None:
+            jobs.append(current)
+        for job in jobs:
+            job.cancel(reason)
+        for job in queued:
+            self._skipped(job)  # Taken off the queue, run() will never see them
+        return len(jobs)
+
+    def _skipped(self, job):
+        if self.on_skip:
+            try:
+                self.on_skip(job)
+            except Exception as e:
+                self.log(f"{self.name} stage skip handler failed on job #{job.id}: {e}", "ERROR")
+
+    def start(self):
+        self.running = True
+        threading.Thread(target=self.run, name=f"{self.name}-stage", daemon=True).start()
+
+    def stop(self):
+        self.running = False
+
+    def stats(self):
+        return {
+            "depth": self.queue.qsize(),
+            "high_water": self.high_water,
+            "busy": self.current is not None,
+            "processed": self.processed,
+            "failed": self.failed,
+            "rejected": self.rejected,
+            "avg_ms": round(self.busy_seconds * 1000 / self.processed) if self.processed else None,
+            "max_ms": round(self.max_ms)
+        }
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Wake Keywords for AI Chatbot
+Several openwakeword models loaded into one Model, so they share the
+melspectrogram and embedding computation and each extra keyword only adds
+its small classifier. Every keyword has its own threshold and action:
+
+    listen  - start recording a question (the classic wake word)
+    stop    - stop the motors right away and interrupt any answer
+    cancel  - interrupt the current answer only
+
+Keywords come from [wake_word] model_path (action listen) plus one
+[keyword:<name>] section per extra keyword.
+"""
+
+import os
+import time
+
+import numpy as np
+
+KEYWORD_ACTIONS = ('listen', 'stop', 'cancel')
+
+# A keyword's score stays high for several chunks; one detection per utterance
+REFRACTORY_SECONDS = 1.0
+
+
+class Keyword:
+    """One wake model with its threshold and action"""
+
+    def __init__(self, name, model_path, threshold=0.5, action='listen'):
+        if action not in KEYWORD_ACTIONS:
+            raise ValueError(f"Unknown keyword action '{action}' for {name}")
+        self.name = name
+        self.model_path = model_path
+        self.threshold = threshold
+        self.action = action
+        self.model_name = None      # Key in the openwakeword prediction dict
+        self.detections = 0
+        self.last_detection = 0.0
+        self.max_score = 0.0
+
+    def status(self):
+        return {
+            "model": self.model_name,
+            "threshold": self.threshold,
+            "action": self.action,
+            "detections": self.detections,
+            "max_score": round(self.max_score, 3)
+        }
+
+
+def load_keywords(config, log=print):
+    """Keywords from config: the main wake word, then [keyword:<name>] sections"""
+    wake = config['wake_word']
+    keywords = [Keyword('wake', wake['model_path'], float(wake.get('threshold', 0.5)), 'listen')]
+
+    for section in config.sections():
+        if not section.startswith('keyword:'):
+            continue
+        name = section.split(':', 1)[1]
+        options = config[section]
+        model_path = options.get('model_path', '').strip()
+        if not model_path:
+            continue  # Declared but not configured
+        if not os.path.exists(model_path):
+            log(f"Keyword '{name}' model not found: {model_path}", "WARN")
+            continue
+        try:
+            keywords.append(Keyword(
+                name,
+                model_path,
+                float(options.get('threshold', 0.5)),
+                options.get('action', 'listen').strip()
+            ))
+        except ValueError as e:
+            log(f"Keyword '{name}' skipped: {e}", "WARN")
+    return keywords
+
+
+class KeywordSpotter:
+    """All keyword models behind one openwakeword Model"""
+
+    def __init__(self, model_class, keywords, gate=None, log=print):
+        self.keywords = keywords
+        self.gate = gate            # Optional NoiseFloorGate in front of inference
+        self.log = log
+        self.model = model_class(wakeword_model_paths=[k.model_path for k in keywords])
+
+        # openwakeword names models after their file; keys follow load order
+        for keyword, model_name in zip(keywords, self.model.models.keys()):
+            keyword.model_name = model_name
+        self.direct_actions = any(k.action != 'listen' for k in keywords)
+
+    def process(self, chunk):
+        """Score one 16kHz chunk, None if the noise gate skipped it"""
+        if self.gate is not None:
+            if not self.gate.update(chunk):
+                return None
+            context = self.gate.take_context()
+            if context:
+                # Gate just opened: refill the shared feature buffers with the
+                # quiet audio it skipped, in one batch, so the window is contiguous
+                self.model.preprocessor(np.concatenate(context))
+        return self.model.predict(chunk)
+
+    def detect(self, prediction, now=None):
+        """Keyword that fired on this prediction, or None
+
+        If several fire, the one furthest above its own threshold wins.
+        now defaults to the wall clock (the benchmark passes audio time).
+        """
+        if now is None:
+            now = time.time()
+        best = None
+        best_margin = 0.0
+        for keyword in self.keywords:
+            score = prediction.get(keyword.model_name, 0.0)
+            keyword.max_score = max(keyword.max_score, score)
+            if score <= keyword.threshold or now - keyword.last_detection < REFRACTORY_SECONDS:
+                continue
+            margin = score / keyword.threshold
+            if margin > best_margin:
+                best, best_margin = keyword, margin
+        if best is not None:
+            best.detections += 1
+            best.last_detection = now
+        return best
+
+    def reset(self):
+        """Forget detection history and model state (between benchmark files)"""
+        for keyword in self.keywords:
+            keyword.last_detection = float('-inf')
+        if hasattr(self.model, 'reset'):
+            self.model.reset()
+
+    def status(self):
+        return {k.name: k.status() for k in self.keywords}
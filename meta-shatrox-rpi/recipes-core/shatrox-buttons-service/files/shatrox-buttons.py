@@ -80,6 +80,28 @@ def send_ai_command(command):
         return None
 
 
+def speak(text, wait=False):
+    """Speak through the AI chatbot's TTS engine, fall back to 'speak' wrapper"""
+    # Chatbot replies after playback, so only block the caller when asked to
+    if os.path.exists(AI_CHATBOT_SOCKET):
+        if wait:
+            if send_ai_command(f"SPEAK:{text}") == "OK":
+                return
+        else:
+            threading.Thread(target=_speak_via_chatbot, args=(text,), daemon=True).start()
+            return
+
+    proc = subprocess.Popen(["speak", text])
+    if wait:
+        proc.wait()
+
+
+def _speak_via_chatbot(text):
+    """Fire-and-forget SPEAK request, fall back to 'speak' wrapper on failure"""
+    if send_ai_command(f"SPEAK:{text}") != "OK":
+        subprocess.Popen(["speak", text])
+
+
 
 def _handle_button_press_impl(button_name, event_type):
     """Implementation of button press handling (runs in thread)"""
@@ -141,10 +163,7 @@ def _handle_button_press_impl(button_name, event_type):
         # ----------------------------------------------
         if button_name == "K8":
             display_print("[K8] System shutdown initiated...")
-            subprocess.Popen([
-                "speak",
-                "System is shutting down in 3 2 1  "
-            ]).wait()  # Wait for TTS to complete
+            speak("System is shutting down in 3 2 1", wait=True)  # Wait for TTS to complete
             display_print("[K8] Shutting down now...")
             subprocess.run(["shutdown", "-h", "now"])
             return
@@ -154,10 +173,7 @@ def _handle_button_press_impl(button_name, event_type):
         # ----------------------------------------------
         if button_name == "K4":
             display_print("[K4] Playing fun sound...")
-            subprocess.Popen([
-                "speak",
-                "zoozoo haii yaii yaii"
-            ])
+            speak("zoozoo haii yaii yaii")
             return
 
         # ----------------------------------------------
@@ -165,10 +181,7 @@ def _handle_button_press_impl(button_name, event_type):
         # ----------------------------------------------
         if button_name == "K2":
             display_print("[K2] Speaking greeting message...")
-            subprocess.Popen([
-                "speak",
-                "Hi, I'm Jarvis — an AI-powered robot here to answer your questions"
-            ])
+            speak("Hi, I'm Jarvis — an AI-powered robot here to answer your questions")
             return
 
     finally:
@@ -12,6 +12,8 @@ import os
 import sys
 import json
 import signal
+import itertools
+from collections import deque
 from typing import Optional, Dict
 
 # GPIO for ultrasonic sensor (3.3V compatible HC-SR04-P)
@@ -42,6 +44,9 @@ except ImportError:
 # Ultrasonic Sensor GPIO Pins (HC-SR04-P on 3.3V)
 SENSOR_TRIGGER_PIN = 22  # GPIO 22
 SENSOR_ECHO_PIN = 23     # GPIO 23
+SOUND_SPEED_CM_S = 34300  # Speed of sound at ~20°C
+ECHO_START_TIMEOUT = 0.1  # Wait for the echo to start (s)
+ECHO_PULSE_TIMEOUT = 0.03 # Longest echo pulse (max range, s)
 
 # Motor channels on PCA9685
 # Waveshare Motor Driver HAT wiring:
@@ -52,8 +57,41 @@ MOTOR_RIGHT_PWM = 5   # PCA9685 channel for right motors (PWMB)
 
 # Safety configuration
 OBSTACLE_DISTANCE_CM = 20  # Stop if obstacle closer than this (cm)
-SENSOR_READ_INTERVAL = 0.1  # Read sensor every 100ms
+SENSOR_READ_INTERVAL = 0.1  # Read sensor every 100ms while driving forward
+
+# Sensor sampling schedule by motion state (seconds between pings, None = suspended)
+SAMPLE_INTERVALS = {
+    "avoiding": 0.06,                  # Explore mode / avoidance manoeuvre
+    "forward": SENSOR_READ_INTERVAL,   # Driving towards whatever is in front
+    "moving": 0.2,                     # Backing up or turning in place
+    "idle": 0.5,                       # Parked: 2Hz keeps status readings fresh
+    "suspended": None                  # Parked and nobody asking: no pings at all
+}
+# Time-to-collision braking (forward motion)
+CLOSING_WINDOW = 0.5        # Seconds of filtered history for the closing speed fit
+FULL_SPEED_CM_S = 60        # Approx ground speed at 100% (used until the fit has enough points)
+SLOWDOWN_TTC = 2.0          # Start reducing speed when the stop line is this many seconds away
+STOP_TTC = 0.3              # Hard stop below this
+SLOWDOWN_DISTANCE_CM = 80   # Also reduce speed inside this range, whatever the closing speed
+CRAWL_SPEED = 25            # Slowest speed before the hard stop (%), motors stall below ~20%
+SPEED_STEP = 5              # Only rewrite PWM when the target moves this much (%)
+EXPLORE_SPEED = 80          # Cruise speed in explore mode (TTC braking slows it near obstacles)
+
+# Motion primitives: (left, right) motor directions
+MOTION_DIRECTIONS = {
+    'forward': ('forward', 'forward'),
+    'backward': ('backward', 'backward'),
+    'left': ('backward', 'forward'),    # MECANUM TANK STEERING: rotate in place
+    'right': ('forward', 'backward')
+}
+RECENT_MOTIONS = 20  # Finished motions kept for get_motion / get_status
+
+MIN_PING_INTERVAL = 0.06  # HC-SR04 needs ~60ms between pings for echoes to die out
+IDLE_SUSPEND_AFTER = 300  # Suspend sampling after this long parked without commands (s)
 MAX_SENSOR_DISTANCE = 400   # HC-SR04-P max range
+DISTANCE_HISTORY_SIZE = 64  # Timestamped readings kept (~6s at 100ms)
+MEDIAN_WINDOW = 3           # Median over the last N readings: one bad echo can't stop us
+OUTLIER_CM = 30             # Raw reading this far from the median counts as an outlier
 
 # Obstacle avoidance behavior modes
 OBSTACLE_BEHAVIOR_STOP = "stop_only"       # Just stop when obstacle detected
@@ -78,6 +116,120 @@ MOTOR_SOCKET = "/tmp/shatrox-motor-control.sock"
 LOG_FILE = "/var/log/shatrox-motor.log"
 
 
+# ============================================================================
+# DISTANCE HISTORY
+# ============================================================================
+
+class DistanceHistory:
+    """
+    Timestamped ring of ultrasonic readings with a median filter
+    Written only by the sampler thread; obstacle monitoring and socket
+    queries read from it instead of pinging the sensor themselves.
+    """
+    
+    def __init__(self, size: int = DISTANCE_HISTORY_SIZE, median_window: int = MEDIAN_WINDOW):
+        self.readings = deque(maxlen=size)  # (monotonic time, raw cm, filtered cm)
+        self.median_window = median_window
+        self.condition = threading.Condition()
+        self.count = 0
+        self.outliers = 0
+    
+    def add(self, raw_cm: float, timestamp: float) -> float:
+        """Store a raw reading, returns the filtered distance"""
+        with self.condition:
+            window = [r[1] for r in list(self.readings)[-(self.median_window - 1):]] if self.median_window > 1 else []
+            window.append(raw_cm)
+            filtered = sorted(window)[len(window) // 2]
+            if abs(raw_cm - filtered) > OUTLIER_CM:
+                self.outliers += 1
+            self.readings.append((timestamp, raw_cm, filtered))
+            self.count += 1
+            self.condition.notify_all()
+            return filtered
+    
+    def latest(self):
+        """Most recent (timestamp, raw, filtered) or None"""
+        with self.condition:
+            return self.readings[-1] if self.readings else None
+    
+    def wait_next(self, seen: int, timeout: float):
+        """Wait for a reading newer than the first `seen`, returns (count, reading) or None"""
+        with self.condition:
+            if not self.condition.wait_for(lambda: self.count > seen, timeout):
+                return None
+            return self.count, self.readings[-1]
+    
+    def closing_speed(self, window: float = CLOSING_WINDOW) -> Optional[float]:
+        """
+        Closing speed in cm/s (positive = obstacle getting nearer) from a least
+        squares fit of the filtered distance over the last `window` seconds,
+        or None if there are too few in-range readings
+        """
+        with self.condition:
+            if not self.readings:
+                return None
+            newest = self.readings[-1][0]
+            points = [(t, f) for t, _, f in self.readings
+                      if newest - t <= window and f < MAX_SENSOR_DISTANCE]
+        if len(points) < 3:
+            return None
+        mean_t = sum(t for t, _ in points) / len(points)
+        mean_d = sum(d for _, d in points) / len(points)
+        var_t = sum((t - mean_t) ** 2 for t, _ in points)
+        if var_t <= 0:
+            return None
+        slope = sum((t - mean_t) * (d - mean_d) for t, d in points) / var_t
+        return -slope
+    
+    def status(self) -> Dict:
+        """Latest filtered reading and its age, for socket queries (no new ping)"""
+        reading = self.latest()
+        if reading is None:
+            return {"distance_cm": None, "age_us": None, "samples": 0}
+        timestamp, raw_cm, filtered_cm = reading
+        return {
+            "distance_cm": round(filtered_cm, 1),
+            "raw_cm": round(raw_cm, 1),
+            "age_us": int((time.monotonic() - timestamp) * 1e6),
+            "samples": self.count,
+            "outliers": self.outliers
+        }
+
+
+# ============================================================================
+# MOTION
+# ============================================================================
+
+class Motion:
+    """
+    One motion command: a list of (kind, speed, seconds) steps run by the
+    motion executor, kind being a MOTION_DIRECTIONS key or 'stop'.
+    seconds == 0 means the step runs until something preempts it.
+    """
+    
+    def __init__(self, motion_id: int, name: str, steps, avoidance: bool = False):
+        self.id = motion_id
+        self.name = name
+        self.steps = steps
+        self.avoidance = avoidance
+        self.step = 0
+        self.state = "queued"   # queued, running, done, preempted, stop
+        self.created = time.monotonic()
+        self.started = None
+        self.finished = None
+        self.done = threading.Event()
+    
+    def status(self) -> Dict:
+        end = self.finished or time.monotonic()
+        return {
+            "motion_id": self.id,
+            "name": self.name,
+            "state": self.state,
+            "step": self.step,
+            "elapsed_s": round(end - self.started, 2) if self.started else 0.0
+        }
+
+
 # ============================================================================
 # MOTOR CONTROLLER CLASS
 # ============================================================================
@@ -94,7 +246,32 @@ class MotorController:
         self.obstacle_detected = False
         self.current_speed = DEFAULT_SPEED
         self.sensor_thread = None
+        self.sampler_thread = None
         self.socket_thread = None
+        self.distances = DistanceHistory()  # Filled by distance_sampling_loop only
+        self.sampler_wakeup = threading.Event()  # Set to re-schedule sampling at once
+        self.motion = None  # 'forward', 'backward', 'turn' while motors are energized
+        self.last_active = time.monotonic()  # Last motion or command (idle suspend)
+        
+        # Time-to-collision braking
+        self.forward_speed = 0  # Speed requested for the current forward motion
+        self.applied_speed = 0  # Speed actually on the motors (lower while braking)
+        self.closing_cm_s = None
+        self.ttc = None
+        self.slowdowns = 0
+        self.hard_stops = 0
+        self.explore_started = None  # monotonic time explore mode began
+        self.explore_hard_stops = 0
+        
+        # Motion executor: the only thread running timed motor primitives
+        self.motor_lock = threading.RLock()  # Serializes PCA9685 writes between threads
+        self.motion_condition = threading.Condition()
+        self.motion_ids = itertools.count(1)
+        self.pending_motion = None
+        self.active_motion = None
+        self.recent_motions = deque(maxlen=RECENT_MOTIONS)
+        self.executor_running = False
+        self.executor_thread = None
         
         # Obstacle avoidance settings
         self.obstacle_behavior = OBSTACLE_BEHAVIOR_AVOID  # Default: full avoidance
@@ -147,8 +324,11 @@ class MotorController:
             )
             
             # Configure echo pin (input) - no bias, let sensor drive
+            # Both edges are reported by the kernel with timestamps, so the
+            # pulse width doesn't depend on when Python gets scheduled
             echo_settings = gpiod.LineSettings(
-                direction=Direction.INPUT
+                direction=Direction.INPUT,
+                edge_detection=Edge.BOTH
             )
             
             # Request lines
@@ -167,6 +347,15 @@ class MotorController:
             self.log(f"ERROR: Failed to initialize sensor GPIO: {e}")
             raise
         
+        # Motion executor runs from construction so demo mode works without start()
+        self.executor_running = True
+        self.executor_thread = threading.Thread(
+            target=self.motion_executor_loop,
+            daemon=True,
+            name="MotionExecutor"
+        )
+        self.executor_thread.start()
+        
         # Initial stop
         self.stop()
         self.log("Motor Controller ready")
@@ -185,12 +374,46 @@ class MotorController:
             pass  # Ignore logging errors
     
     
+    def _drain_echo_events(self):
+        """Discard edge events left over from an earlier ping"""
+        while self.gpio_request.wait_edge_events(0):
+            self.gpio_request.read_edge_events()
+    
+    
+    def _wait_echo_pulse(self):
+        """
+        Block until the echo pulse has started and ended
+        Returns (rise_ns, fall_ns) kernel timestamps, or None on timeout
+        """
+        rise_ns = None
+        deadline = time.monotonic() + ECHO_START_TIMEOUT
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0 or not self.gpio_request.wait_edge_events(remaining):
+                return None
+            for event in self.gpio_request.read_edge_events():
+                if event.line_offset != SENSOR_ECHO_PIN:
+                    continue
+                if event.event_type == gpiod.EdgeEvent.Type.RISING_EDGE:
+                    if rise_ns is None:
+                        rise_ns = event.timestamp_ns
+                        # Echo started: now only the pulse width is left to wait for
+                        deadline = time.monotonic() + ECHO_PULSE_TIMEOUT
+                elif rise_ns is not None:
+                    return rise_ns, event.timestamp_ns
+    
+    
     def read_distance(self) -> float:
         """
         Read distance from HC-SR04-P ultrasonic sensor
         Returns distance in centimeters, or MAX_SENSOR_DISTANCE if out of range
+        
+        OPTIMIZATION: Waits on echo edge events instead of spinning on
+        get_value(); the pulse width comes from kernel edge timestamps.
         """
         try:
+            self._drain_echo_events()
+            
             # Send 10us trigger pulse with proper settle time
             self.gpio_request.set_value(SENSOR_TRIGGER_PIN, Value.INACTIVE)
             time.sleep(0.002)  # 2ms settle time (important!)
@@ -198,28 +421,15 @@ class MotorController:
             time.sleep(0.00001)   # 10us trigger
             self.gpio_request.set_value(SENSOR_TRIGGER_PIN, Value.INACTIVE)
             
-            # Wait for echo to go high (timeout 100ms)
-            timeout = time.time() + 0.1
-            pulse_start = time.time()
-            while self.gpio_request.get_value(SENSOR_ECHO_PIN) == Value.INACTIVE:
-                pulse_start = time.time()
-                if pulse_start > timeout:
-                    return MAX_SENSOR_DISTANCE
-            
-            # Measure echo pulse duration
-            pulse_start = time.time()
-            
-            # Wait for echo to go low (timeout 30ms for max range)
-            timeout = time.time() + 0.03
-            while self.gpio_request.get_value(SENSOR_ECHO_PIN) == Value.ACTIVE:
-                if time.time() > timeout:
-                    return MAX_SENSOR_DISTANCE
-            
-            pulse_end = time.time()
+            # Sleep in the kernel until both echo edges arrive (timeout 100ms + 30ms)
+            pulse = self._wait_echo_pulse()
+            if pulse is None:
+                return MAX_SENSOR_DISTANCE
+            rise_ns, fall_ns = pulse
             
-            # Calculate distance (speed of sound = 34300 cm/s)
-            pulse_duration = pulse_end - pulse_start
-            distance = (pulse_duration * 34300) / 2
+            # Calculate distance (round trip at the speed of sound)
+            pulse_duration = (fall_ns - rise_ns) / 1e9
+            distance = (pulse_duration * SOUND_SPEED_CM_S) / 2
             
             # Clamp to sensor range (2cm - 400cm)
             if distance < 2:
@@ -234,32 +444,113 @@ class MotorController:
             return MAX_SENSOR_DISTANCE
     
     
+    def sampling_mode(self) -> str:
+        """Sensor sampling mode for the current motion state (key of SAMPLE_INTERVALS)"""
+        if self.avoidance_in_progress or self.explore_mode:
+            return "avoiding"
+        if self.motion == 'forward' or self.is_moving_forward:
+            return "forward"
+        if self.motion:
+            return "moving"
+        if time.monotonic() - self.last_active > IDLE_SUSPEND_AFTER:
+            return "suspended"
+        return "idle"
+    
+    
+    def wake_sampler(self):
+        """Re-evaluate the sampling rate now (call BEFORE energizing the motors)"""
+        self.last_active = time.monotonic()
+        self.sampler_wakeup.set()
+    
+    
+    def fresh_distance(self, max_age: float = SENSOR_READ_INTERVAL, timeout: float = 0.2):
+        """Latest (timestamp, raw, filtered) reading, waiting for a new one if it is older than max_age"""
+        reading = self.distances.latest()
+        if reading is not None and time.monotonic() - reading[0] <= max_age:
+            return reading
+        seen = self.distances.count
+        self.wake_sampler()
+        update = self.distances.wait_next(seen, timeout)
+        return update[1] if update else reading
+    
+    
+    def distance_sampling_loop(self):
+        """Background thread that owns the ultrasonic sensor: the only caller of read_distance()"""
+        self.log("Distance sampling started")
+        last_ping = 0.0
+        mode = None
+        
+        while self.running:
+            try:
+                new_mode = self.sampling_mode()
+                if new_mode != mode:
+                    self.log(f"Distance sampling: {new_mode}", "DEBUG")
+                    mode = new_mode
+                interval = SAMPLE_INTERVALS[mode]
+                if interval is None:
+                    # OPTIMIZATION: Parked and idle - no pings until a command wakes us
+                    self.sampler_wakeup.wait(1.0)
+                    self.sampler_wakeup.clear()
+                    continue
+                
+                # Echoes from the previous ping must die out first
+                gap = MIN_PING_INTERVAL - (time.monotonic() - last_ping)
+                if gap > 0:
+                    time.sleep(gap)
+                last_ping = time.monotonic()
+                raw = self.read_distance()
+                self.distances.add(raw, time.monotonic())
+                
+                # Sleep until the next ping, or until motion changes the schedule
+                if self.sampler_wakeup.wait(max(0.0, interval - (time.monotonic() - last_ping))):
+                    self.sampler_wakeup.clear()
+            except Exception as e:
+                self.log(f"Distance sampling error: {e}", "ERROR")
+                time.sleep(1)
+        
+        self.log("Distance sampling stopped")
+    
+    
     def obstacle_monitoring_loop(self):
-        """Background thread to continuously monitor for obstacles"""
+        """Background thread acting on each new filtered distance reading"""
         self.log("Obstacle monitoring started")
         self.last_turn_was_left = False  # Alternate turn direction to avoid loops
+        seen = 0
         
         while self.running:
             try:
-                distance = self.read_distance()
+                update = self.distances.wait_next(seen, timeout=1.0)
+                if update is None:
+                    continue
+                seen, (_, _, distance) = update
+                self.closing_cm_s = self.distances.closing_speed()
+                self.ttc = self.time_to_collision(distance, self.closing_cm_s)
+                too_soon = self.is_moving_forward and self.ttc < STOP_TTC
                 
-                if distance < OBSTACLE_DISTANCE_CM:
+                if distance < OBSTACLE_DISTANCE_CM or too_soon:
                     if not self.obstacle_detected:
-                        self.log(f"OBSTACLE DETECTED at {distance:.1f}cm", "WARNING")
+                        self.log(f"OBSTACLE DETECTED at {distance:.1f}cm (ttc {self.ttc:.2f}s)", "WARNING")
                         self.obstacle_detected = True
+                        if self.is_moving_forward:
+                            self.hard_stops += 1
+                            if self.explore_mode:
+                                self.explore_hard_stops += 1
                         
                         # Only perform avoidance if we were moving forward
                         if self.is_moving_forward and not self.avoidance_in_progress:
                             self.perform_obstacle_avoidance()
-                        else:
-                            # Just stop if not moving forward or already avoiding
+                        elif not self.avoidance_in_progress:
+                            # Just stop if not moving forward (an avoidance manoeuvre
+                            # is backing away from it already)
                             self.stop()
                 else:
                     if self.obstacle_detected:
                         self.log(f"Obstacle cleared ({distance:.1f}cm)")
                         self.obstacle_detected = False
-                
-                time.sleep(SENSOR_READ_INTERVAL)
+                    
+                    # Graduated slowdown before the hard stop
+                    if self.is_moving_forward and not self.avoidance_in_progress:
+                        self.adjust_forward_speed(distance, self.ttc)
                 
             except Exception as e:
                 self.log(f"Obstacle monitoring error: {e}", "ERROR")
@@ -268,104 +559,91 @@ class MotorController:
         self.log("Obstacle monitoring stopped")
     
     
+    def time_to_collision(self, distance: float, closing: Optional[float]) -> float:
+        """Seconds until the OBSTACLE_DISTANCE_CM stop line is reached (inf if not closing)"""
+        if closing is None:
+            # Too little history (just started): assume the commanded speed
+            closing = FULL_SPEED_CM_S * self.applied_speed / 100 if self.is_moving_forward else 0.0
+        if closing <= 1.0:
+            return float('inf')
+        return max(0.0, distance - OBSTACLE_DISTANCE_CM) / closing
+    
+    
+    def adjust_forward_speed(self, distance: float, ttc: float):
+        """
+        Scale the forward speed down as the obstacle gets nearer in time or
+        distance, and back up to the requested speed when the path clears
+        """
+        ttc_factor = (ttc - STOP_TTC) / (SLOWDOWN_TTC - STOP_TTC)
+        distance_factor = (distance - OBSTACLE_DISTANCE_CM) / (SLOWDOWN_DISTANCE_CM - OBSTACLE_DISTANCE_CM)
+        factor = max(0.0, min(1.0, ttc_factor, distance_factor))
+        target = max(min(CRAWL_SPEED, self.forward_speed), round(self.forward_speed * factor))
+        
+        if target == self.applied_speed:
+            return
+        if abs(target - self.applied_speed) < SPEED_STEP and target != self.forward_speed:
+            return  # Avoid rewriting PWM for tiny changes
+        # Same lock order as the executor (motion_condition, then motor_lock)
+        with self.motion_condition, self.motor_lock:
+            # CRITICAL: the executor or stop() may have switched the motors since
+            # the monitor looked; re-check that a forward step is what is running
+            # or a turn/backward/stop gets the forward PWM
+            if not self.is_moving_forward or not self._forward_step_active():
+                return
+            if target < self.applied_speed and self.applied_speed == self.forward_speed:
+                self.slowdowns += 1
+                self.log(f"Slowing to {target}% ({distance:.0f}cm, ttc {ttc:.1f}s)")
+            self.applied_speed = target
+            self.set_motor_speed(0, target)
+            self.set_motor_speed(1, target)
+    
+    
     def perform_obstacle_avoidance(self):
         """
         Execute obstacle avoidance routine based on configured behavior mode.
         Called when obstacle detected while moving forward.
+        
+        The routine is queued on the motion executor as one preemptible
+        motion, so the monitor thread keeps watching and "stop" cancels it.
         """
-        self.avoidance_in_progress = True
         self.is_moving_forward = False
+        self.log(f"Avoidance: behavior={self.obstacle_behavior}")
         
-        try:
-            # First, always stop motors (but preserve explore_mode)
-            self._stop_motors()
-            self.log(f"Avoidance: behavior={self.obstacle_behavior}")
-            
-            if self.obstacle_behavior == OBSTACLE_BEHAVIOR_STOP:
-                # Just stop - no further action
-                self.log("Avoidance: stop only")
-            
-            elif self.obstacle_behavior == OBSTACLE_BEHAVIOR_BACKUP:
-                # Back up only
-                self.log(f"Avoidance: backing up for {BACKUP_DURATION}s")
-                time.sleep(0.2)  # Brief pause before reversing
-                self._raw_move_backward(BACKUP_SPEED, BACKUP_DURATION)
-            
-            elif self.obstacle_behavior == OBSTACLE_BEHAVIOR_AVOID:
-                # Full avoidance: back up + turn
-                self.log(f"Avoidance: backing up for {BACKUP_DURATION}s")
-                time.sleep(0.2)  # Brief pause before reversing
-                self._raw_move_backward(BACKUP_SPEED, BACKUP_DURATION)
-                
-                # Alternate turn direction to avoid getting stuck
-                if self.last_turn_was_left:
-                    self.log(f"Avoidance: turning RIGHT for {AVOID_TURN_DURATION}s")
-                    self._raw_turn_right(AVOID_TURN_SPEED, AVOID_TURN_DURATION)
-                    self.last_turn_was_left = False
-                else:
-                    self.log(f"Avoidance: turning LEFT for {AVOID_TURN_DURATION}s")
-                    self._raw_turn_left(AVOID_TURN_SPEED, AVOID_TURN_DURATION)
-                    self.last_turn_was_left = True
-                
-                self.log("Avoidance complete")
+        # First, always stop motors (but preserve explore_mode)
+        steps = [('stop', 0, 0.2)]  # Brief pause before reversing
         
-        except Exception as e:
-            self.log(f"Avoidance error: {e}", "ERROR")
-            self._stop_motors()
+        if self.obstacle_behavior == OBSTACLE_BEHAVIOR_STOP:
+            # Just stop - no further action
+            self.log("Avoidance: stop only")
         
-        finally:
-            self.avoidance_in_progress = False
+        elif self.obstacle_behavior == OBSTACLE_BEHAVIOR_BACKUP:
+            # Back up only
+            self.log(f"Avoidance: backing up for {BACKUP_DURATION}s")
+            steps.append(('backward', BACKUP_SPEED, BACKUP_DURATION))
+        
+        elif self.obstacle_behavior == OBSTACLE_BEHAVIOR_AVOID:
+            # Full avoidance: back up + turn
+            self.log(f"Avoidance: backing up for {BACKUP_DURATION}s")
+            steps.append(('backward', BACKUP_SPEED, BACKUP_DURATION))
             
-            # EXPLORE MODE: Auto-resume forward movement after avoidance
-            if self.explore_mode and self.running:
-                self.log("Explore mode: resuming forward movement")
-                time.sleep(0.5)  # Brief pause to let sensor settle
-                # Use raw forward that bypasses obstacle check (we just avoided, so try moving)
-                self._raw_move_forward_continuous(speed=50)
-    
-    
-    def _raw_move_backward(self, speed: int, duration: float):
-        """Internal: move backward without obstacle checks (for avoidance)"""
-        self.set_motor_speed(0, speed)
-        self.set_motor_speed(1, speed)
-        self.set_motor_direction(0, 'backward')
-        self.set_motor_direction(1, 'backward')
-        time.sleep(duration)
-        self._stop_motors()  # Don't clear explore_mode
-    
-    
-    def _raw_move_forward_continuous(self, speed: int):
-        """Internal: start continuous forward without obstacle check (for explore resume)"""
-        self.is_moving_forward = True
-        self.log(f"FORWARD at {speed}% (explore resume)")
-        self.set_motor_speed(0, speed)
-        self.set_motor_speed(1, speed)
-        self.set_motor_direction(0, 'forward')
-        self.set_motor_direction(1, 'forward')
-    
-    
-    def _raw_turn_left(self, speed: int, duration: float):
-        """Internal: turn left without clearing explore_mode (for avoidance)
-        MECANUM TANK STEERING: Left backward, Right forward - rotates in place
-        """
-        self.set_motor_speed(0, speed)
-        self.set_motor_speed(1, speed)
-        self.set_motor_direction(0, 'backward')  # Left backward
-        self.set_motor_direction(1, 'forward')   # Right forward
-        time.sleep(duration)
-        self._stop_motors()
-    
-    
-    def _raw_turn_right(self, speed: int, duration: float):
-        """Internal: turn right without clearing explore_mode (for avoidance)
-        MECANUM TANK STEERING: Left forward, Right backward - rotates in place
-        """
-        self.set_motor_speed(0, speed)
-        self.set_motor_speed(1, speed)
-        self.set_motor_direction(0, 'forward')   # Left forward
-        self.set_motor_direction(1, 'backward')  # Right backward
-        time.sleep(duration)
-        self._stop_motors()
+            # Alternate turn direction to avoid getting stuck
+            if self.last_turn_was_left:
+                self.log(f"Avoidance: turning RIGHT for {AVOID_TURN_DURATION}s")
+                steps.append(('right', AVOID_TURN_SPEED, AVOID_TURN_DURATION))
+                self.last_turn_was_left = False
+            else:
+                self.log(f"Avoidance: turning LEFT for {AVOID_TURN_DURATION}s")
+                steps.append(('left', AVOID_TURN_SPEED, AVOID_TURN_DURATION))
+                self.last_turn_was_left = True
+        
+        # EXPLORE MODE: Auto-resume forward movement after avoidance
+        if self.explore_mode:
+            # Brief pause to let sensor settle, then forward again; the resume
+            # step ends the avoidance, so obstacle monitoring guards it as usual
+            steps.append(('stop', 0, 0.5))
+            steps.append(('forward', EXPLORE_SPEED, 0))
+        
+        return self.submit_motion("avoidance", steps, avoidance=True)
     
     
     def set_motor_direction(self, motor, direction):
@@ -413,20 +691,172 @@ class MotorController:
     
     def _stop_motors(self):
         """Internal: Stop motors without clearing explore_mode (for avoidance routines)"""
-        try:
-            self.set_motor_speed(0, 0)  # Left
-            self.set_motor_speed(1, 0)  # Right
-            self.set_motor_direction(0, 'stop')
-            self.set_motor_direction(1, 'stop')
-        except Exception as e:
-            self.log(f"Stop motors error: {e}", "ERROR")
+        self.motion = None
+        self.last_active = time.monotonic()
+        with self.motor_lock:
+            try:
+                self.set_motor_speed(0, 0)  # Left
+                self.set_motor_speed(1, 0)  # Right
+                self.set_motor_direction(0, 'stop')
+                self.set_motor_direction(1, 'stop')
+            except Exception as e:
+                self.log(f"Stop motors error: {e}", "ERROR")
     
     def stop(self):
-        """Stop all motors immediately (clears explore mode)"""
+        """Stop all motors immediately (clears explore mode), returns the motion ID"""
         self.log("STOP")
         self.explore_mode = False  # Clear explore mode on explicit stop
         self.is_moving_forward = False  # Clear forward movement flag
+        # Preempt whatever the executor is running or about to start, then
+        # cut the motors from this thread - no waiting on the executor
+        motion_id = self.cancel_motions("stop")
         self._stop_motors()
+        return motion_id
+    
+    
+    # ------------------------------------------------------------------------
+    # Motion executor: one thread owns timed motor primitives
+    # ------------------------------------------------------------------------
+    
+    def submit_motion(self, name: str, steps, avoidance: bool = False) -> int:
+        """
+        Queue a motion (list of (kind, speed, seconds) steps, 0 seconds = until
+        preempted) and return its ID at once. It replaces any motion that is
+        running or waiting.
+        """
+        with self.motion_condition:
+            motion = Motion(next(self.motion_ids), name, steps, avoidance)
+            if self.pending_motion is not None:
+                self._finish_motion(self.pending_motion, "preempted")
+            self.pending_motion = motion
+            self.recent_motions.append(motion)
+            self.motion_condition.notify_all()
+            return motion.id
+    
+    
+    def cancel_motions(self, reason: str) -> int:
+        """Drop the running and queued motions, returns the ID recorded for the cancel"""
+        with self.motion_condition:
+            for motion in (self.pending_motion, self.active_motion):
+                if motion is not None:
+                    self._finish_motion(motion, reason)
+            self.pending_motion = None
+            self.active_motion = None
+            motion = Motion(next(self.motion_ids), reason, [])
+            self._finish_motion(motion, "done")
+            self.recent_motions.append(motion)
+            self.motion_condition.notify_all()
+            return motion.id
+    
+    
+    def _finish_motion(self, motion, state: str):
+        """Mark a motion finished (caller holds motion_condition)"""
+        if motion.finished is None:
+            motion.state = state
+            motion.finished = time.monotonic()
+            if motion.avoidance:
+                self.avoidance_in_progress = False
+            motion.done.set()
+    
+    
+    def _energize(self, kind: str, speed: int):
+        """Apply one motion step to the motors"""
+        if kind == 'stop':
+            self.is_moving_forward = False
+            self._stop_motors()
+            return
+        
+        # Sensor schedule switches BEFORE the motors are energized
+        self.motion = {'forward': 'forward', 'backward': 'backward'}.get(kind, 'turn')
+        self.is_moving_forward = kind == 'forward'
+        if self.is_moving_forward:
+            self.forward_speed = self.applied_speed = speed
+        self.wake_sampler()
+        
+        left, right = MOTION_DIRECTIONS[kind]
+        with self.motor_lock:
+            self.set_motor_speed(0, speed)  # Left speed first
+            self.set_motor_speed(1, speed)  # Right speed first
+            self.set_motor_direction(0, left)
+            self.set_motor_direction(1, right)
+    
+    
+    def motion_executor_loop(self):
+        """Background thread running queued motions against monotonic deadlines"""
+        deadline = None
+        with self.motion_condition:
+            while self.executor_running:
+                motion = self.active_motion
+                
+                if self.pending_motion is not None:
+                    # New command preempts the active primitive at once
+                    if motion is not None:
+                        self._finish_motion(motion, "preempted")
+                    motion = self.active_motion = self.pending_motion
+                    self.pending_motion = None
+                    motion.state = "running"
+                    motion.started = time.monotonic()
+                    if motion.avoidance:
+                        self.avoidance_in_progress = True
+                    deadline = self._start_step(motion)
+                
+                elif motion is not None and motion.finished is not None:
+                    # Cancelled by stop() (motors already cut)
+                    self.active_motion = None
+                    continue
+                
+                elif motion is not None and deadline is not None and time.monotonic() >= deadline:
+                    motion.step += 1
+                    if motion.step < len(motion.steps):
+                        deadline = self._start_step(motion)
+                    else:
+                        # Timed motion over: stop like the old sleep-then-stop()
+                        self.is_moving_forward = False
+                        self._stop_motors()
+                        self._finish_motion(motion, "done")
+                        self.active_motion = None
+                        continue
+                
+                if self.active_motion is None or deadline is None:
+                    self.motion_condition.wait(1.0)  # Idle or continuous: until preempted
+                else:
+                    self.motion_condition.wait(max(0.0, deadline - time.monotonic()))
+    
+    
+    def _start_step(self, motion):
+        """Energize the motion's current step, returns its monotonic deadline (None = no end)"""
+        kind, speed, seconds = motion.steps[motion.step]
+        if motion.avoidance and kind == 'forward' and seconds == 0:
+            # Explore resume: the manoeuvre is over, so the monitor must guard
+            # this leg like any other forward motion (avoid, stop, TTC braking)
+            self.avoidance_in_progress = False
+        self._energize(kind, speed)
+        return time.monotonic() + seconds if seconds > 0 else None
+    
+    
+    def _forward_step_active(self) -> bool:
+        """True if the executor is running a forward step (caller holds motion_condition)"""
+        motion = self.active_motion
+        if self.pending_motion is not None or motion is None or motion.finished is not None:
+            return False
+        return motion.step < len(motion.steps) and motion.steps[motion.step][0] == 'forward'
+    
+    
+    def wait_motion(self, motion_id: int, timeout: float = None) -> bool:
+        """Block until a motion has finished (demo / tests), True if it did"""
+        with self.motion_condition:
+            motion = next((m for m in self.recent_motions if m.id == motion_id), None)
+        return motion is None or motion.done.wait(timeout)
+    
+    
+    def motion_status(self) -> Dict:
+        """Running motion and the most recent ones"""
+        with self.motion_condition:
+            active = self.active_motion
+            return {
+                "active": active.status() if active else None,
+                "recent": [m.status() for m in list(self.recent_motions)[-5:]]
+            }
     
     
     def move_forward(self, speed: int = None, duration: float = 0):
@@ -434,49 +864,44 @@ class MotorController:
         Move forward at specified speed (0-100%)
         If duration > 0, move for that many seconds then stop
         If duration == 0, continue moving until stop() is called
+        Returns the motion ID, or None if blocked by an obstacle
         """
-        if self.obstacle_detected:
+        # Switch the sensor to fast sampling BEFORE the motors are energized;
+        # when parked the last reading may be seconds old, so wait for a fresh one
+        previous_motion = self.motion
+        self.motion = 'forward'
+        self.wake_sampler()
+        reading = self.fresh_distance()
+        if self.obstacle_detected or (reading is not None and reading[2] < OBSTACLE_DISTANCE_CM):
+            # DEFENSIVE FIX: a backward or turn motion may still be running;
+            # only undo our own change if nothing else has set motion since
+            if self.motion == 'forward':
+                self.motion = previous_motion
             self.log("Cannot move forward: obstacle detected", "WARNING")
-            return False
+            return None
         
         speed = speed or self.current_speed
         speed = max(MIN_SPEED, min(MAX_SPEED, speed))
         
         # Set flag BEFORE starting movement (for obstacle detection)
         self.is_moving_forward = True
+        self.forward_speed = self.applied_speed = speed
         
         self.log(f"FORWARD at {speed}%")
-        self.set_motor_speed(0, speed)  # Left speed first
-        self.set_motor_speed(1, speed)  # Right speed first
-        self.set_motor_direction(0, 'forward')  # Left direction
-        self.set_motor_direction(1, 'forward')  # Right direction
-        
-        if duration > 0:
-            time.sleep(duration)
-            self.stop()  # This will clear is_moving_forward
-        
-        return True
+        return self.submit_motion("forward", [('forward', speed, max(0.0, duration))])
     
     
     def move_backward(self, speed: int = None, duration: float = 0):
         """
         Move backward at specified speed (0-100%)
         If duration > 0, move for that many seconds then stop
+        Returns the motion ID
         """
         speed = speed or self.current_speed
         speed = max(MIN_SPEED, min(MAX_SPEED, speed))
         
         self.log(f"BACKWARD at {speed}%")
-        self.set_motor_speed(0, speed)  # Left speed first
-        self.set_motor_speed(1, speed)  # Right speed first
-        self.set_motor_direction(0, 'backward')  # Left direction
-        self.set_motor_direction(1, 'backward')  # Right direction
-        
-        if duration > 0:
-            time.sleep(duration)
-            self.stop()
-        
-        return True
+        return self.submit_motion("backward", [('backward', speed, max(0.0, duration))])
     
     
     def turn_left(self, speed: int = None, angle: float = 90):
@@ -484,6 +909,7 @@ class MotorController:
         Turn left using MECANUM TANK STEERING
         Left side backward, Right side forward - rotates in place
         Mecanum wheels have angled rollers for smooth rotation
+        Returns the motion ID
         """
         speed = speed or 100  # Full power for Mecanum
         speed = max(MIN_SPEED, min(MAX_SPEED, speed))
@@ -492,15 +918,7 @@ class MotorController:
         duration = (angle / 90.0) * 5.0
         
         self.log(f"MECANUM TURN LEFT ~{angle}° at {speed}% duration:{duration:.1f}s")
-        self.set_motor_speed(0, speed)
-        self.set_motor_speed(1, speed)
-        self.set_motor_direction(0, 'backward')  # Left backward
-        self.set_motor_direction(1, 'forward')   # Right forward
-        
-        time.sleep(duration)
-        self.stop()
-        
-        return True
+        return self.submit_motion("turn_left", [('left', speed, max(duration, 0.01))])
     
     
     def turn_right(self, speed: int = None, angle: float = 90):
@@ -508,6 +926,7 @@ class MotorController:
         Turn right using MECANUM TANK STEERING
         Left side forward, Right side backward - rotates in place
         Mecanum wheels have angled rollers for smooth rotation
+        Returns the motion ID
         """
         speed = speed or 100  # Full power for Mecanum
         speed = max(MIN_SPEED, min(MAX_SPEED, speed))
@@ -516,15 +935,23 @@ class MotorController:
         duration = (angle / 90.0) * 5.0
         
         self.log(f"MECANUM TURN RIGHT ~{angle}° at {speed}% duration:{duration:.1f}s")
-        self.set_motor_speed(0, speed)
-        self.set_motor_speed(1, speed)
-        self.set_motor_direction(0, 'forward')   # Left forward
-        self.set_motor_direction(1, 'backward')  # Right backward
-        
-        time.sleep(duration)
-        self.stop()
-        
-        return True
+        return self.submit_motion("turn_right", [('right', speed, max(duration, 0.01))])
+    
+    
+    def braking_status(self) -> Dict:
+        """Time-to-collision braking state and counters"""
+        status = {
+            "forward_speed": self.forward_speed if self.is_moving_forward else 0,
+            "applied_speed": self.applied_speed if self.is_moving_forward else 0,
+            "closing_cm_s": round(self.closing_cm_s, 1) if self.closing_cm_s is not None else None,
+            "ttc_s": round(self.ttc, 2) if self.ttc is not None and self.ttc != float('inf') else None,
+            "slowdowns": self.slowdowns,
+            "hard_stops": self.hard_stops
+        }
+        if self.explore_mode and self.explore_started:
+            minutes = max(1e-6, (time.monotonic() - self.explore_started) / 60)
+            status["explore_hard_stops_per_min"] = round(self.explore_hard_stops / minutes, 2)
+        return status
     
     
     def test_motors(self):
@@ -532,19 +959,19 @@ class MotorController:
         self.log("=== MOTOR TEST SEQUENCE ===")
         
         self.log("Test 1: Forward 2 seconds")
-        self.move_forward(speed=50, duration=2)
+        self.wait_motion(self.move_forward(speed=50, duration=2))
         time.sleep(1)
         
         self.log("Test 2: Backward 2 seconds")
-        self.move_backward(speed=50, duration=2)
+        self.wait_motion(self.move_backward(speed=50, duration=2))
         time.sleep(1)
         
         self.log("Test 3: Turn left 90°")
-        self.turn_left(speed=50, angle=90)
+        self.wait_motion(self.turn_left(speed=50, angle=90))
         time.sleep(1)
         
         self.log("Test 4: Turn right 90°")
-        self.turn_right(speed=50, angle=90)
+        self.wait_motion(self.turn_right(speed=50, angle=90))
         time.sleep(1)
         
         self.log("=== TEST COMPLETE ===")
@@ -558,38 +985,53 @@ class MotorController:
         try:
             command = json.loads(command_str)
             action = command.get("action", "")
+            self.last_active = time.monotonic()  # Any command ends idle suspend
             
             if action == "move_forward":
                 speed = command.get("speed", self.current_speed)
                 duration = command.get("duration", 0)
-                success = self.move_forward(speed, duration)
-                return {"status": "ok" if success else "blocked", "action": action}
+                # Returns at once; the motion executor times the movement
+                motion_id = self.move_forward(speed, duration)
+                return {"status": "ok" if motion_id else "blocked", "action": action, "motion_id": motion_id}
             
             elif action == "move_backward":
                 speed = command.get("speed", self.current_speed)
                 duration = command.get("duration", 0)
-                success = self.move_backward(speed, duration)
-                return {"status": "ok", "action": action}
+                motion_id = self.move_backward(speed, duration)
+                return {"status": "ok", "action": action, "motion_id": motion_id}
             
             elif action == "turn_left":
                 speed = command.get("speed", self.current_speed)
                 angle = command.get("angle", 90)
-                success = self.turn_left(speed, angle)
-                return {"status": "ok", "action": action}
+                motion_id = self.turn_left(speed, angle)
+                return {"status": "ok", "action": action, "motion_id": motion_id}
             
             elif action == "turn_right":
                 speed = command.get("speed", self.current_speed)
                 angle = command.get("angle", 90)
-                success = self.turn_right(speed, angle)
-                return {"status": "ok", "action": action}
+                motion_id = self.turn_right(speed, angle)
+                return {"status": "ok", "action": action, "motion_id": motion_id}
             
             elif action == "stop":
-                self.stop()
-                return {"status": "ok", "action": "stop"}
+                motion_id = self.stop()
+                return {"status": "ok", "action": "stop", "motion_id": motion_id}
+            
+            elif action == "get_motion":
+                motion_id = command.get("motion_id")
+                with self.motion_condition:
+                    motion = next((m for m in self.recent_motions if m.id == motion_id), None)
+                    if motion is None:
+                        return {"status": "error", "message": f"Unknown motion: {motion_id}"}
+                    return {"status": "ok", **motion.status()}
             
             elif action == "get_distance":
-                distance = self.read_distance()
-                return {"status": "ok", "distance_cm": distance}
+                # Latest filtered reading from the sampler thread (no new ping);
+                # if sampling was suspended, wake it and wait for one reading
+                self.fresh_distance(max_age=2 * SAMPLE_INTERVALS["idle"])
+                reading = self.distances.status()
+                if reading["distance_cm"] is None:
+                    return {"status": "error", "message": "No distance reading yet"}
+                return {"status": "ok", **reading}
             
             elif action == "test_motors":
                 self.test_motors()
@@ -616,9 +1058,18 @@ class MotorController:
                 
                 self.obstacle_behavior = OBSTACLE_BEHAVIOR_AVOID  # Ensure full avoidance
                 self.explore_mode = True
+                self.explore_started = time.monotonic()
+                self.explore_hard_stops = 0
                 self.log("EXPLORE MODE: Started")
-                self.move_forward(speed=50, duration=0)  # Start continuous forward
-                return {"status": "ok", "action": "explore_start", "message": "Exploration started"}
+                motion_id = self.move_forward(speed=EXPLORE_SPEED, duration=0)  # Start continuous forward
+                if motion_id is None:
+                    # Fresh reading found something in front: not exploring after all
+                    self.explore_mode = False
+                    self.explore_started = None
+                    self.log("EXPLORE MODE: Blocked by obstacle", "WARNING")
+                    return {"status": "blocked", "action": "explore_start",
+                            "message": "Cannot start exploring - obstacle detected", "motion_id": None}
+                return {"status": "ok", "action": "explore_start", "message": "Exploration started", "motion_id": motion_id}
             
             elif action == "explore_stop":
                 # Stop exploration mode
@@ -629,15 +1080,19 @@ class MotorController:
             
             elif action == "get_status":
                 # Get full motor controller status
-                distance = self.read_distance()
+                reading = self.distances.status()
                 return {
                     "status": "ok",
-                    "distance_cm": distance,
+                    "distance_cm": reading["distance_cm"],
+                    "distance_age_us": reading["age_us"],
+                    "sampling": self.sampling_mode(),
                     "obstacle_detected": self.obstacle_detected,
                     "obstacle_behavior": self.obstacle_behavior,
                     "is_moving_forward": self.is_moving_forward,
                     "avoidance_in_progress": self.avoidance_in_progress,
-                    "explore_mode": self.explore_mode
+                    "explore_mode": self.explore_mode,
+                    "braking": self.braking_status(),
+                    "motion": self.motion_status()
                 }
             
             else:
@@ -705,6 +1160,14 @@ class MotorController:
         self.log("Starting motor control service...")
         self.running = True
         
+        # Start distance sampler (sole owner of the sensor lines)
+        self.sampler_thread = threading.Thread(
+            target=self.distance_sampling_loop,
+            daemon=True,
+            name="DistanceSampler"
+        )
+        self.sampler_thread.start()
+        
         # Start obstacle monitoring thread
         self.sensor_thread = threading.Thread(
             target=self.obstacle_monitoring_loop,
@@ -731,8 +1194,17 @@ class MotorController:
         
         # Stop motors
         self.stop()
+        with self.motion_condition:
+            self.executor_running = False
+            self.motion_condition.notify_all()
         
         # Wait for threads
+        if self.executor_thread and self.executor_thread.is_alive():
+            self.executor_thread.join(timeout=2)
+        
+        if self.sampler_thread and self.sampler_thread.is_alive():
+            self.sampler_thread.join(timeout=2)
+        
         if self.sensor_thread and self.sensor_thread.is_alive():
             self.sensor_thread.join(timeout=2)
         
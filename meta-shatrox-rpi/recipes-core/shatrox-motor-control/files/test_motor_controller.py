@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""
+Motion executor tests for motor_controller.py
+Runs without the robot: the PCA9685, Adafruit and gpiod modules are
+replaced with fakes before import.
+
+    python3 -m unittest test_motor_controller
+"""
+
+import sys
+import time
+import types
+import unittest
+from unittest import mock
+
+
+class FakePCA:
+    """Records the last duty cycle per channel"""
+
+    def __init__(self, *args, **kwargs):
+        self.duty = {}
+
+    def setPWMFreq(self, freq):
+        pass
+
+    def setDutycycle(self, channel, pulse):
+        self.duty[channel] = pulse
+
+    def setLevel(self, channel, value):
+        pass
+
+
+class FakeRequest:
+    def set_value(self, *args):
+        pass
+
+    def wait_edge_events(self, timeout=None):
+        return False
+
+    def read_edge_events(self):
+        return []
+
+    def release(self):
+        pass
+
+
+def install_fakes():
+    enum = lambda *names: types.SimpleNamespace(**{n: n for n in names})
+    line = types.ModuleType("gpiod.line")
+    line.Direction = enum("INPUT", "OUTPUT")
+    line.Value = enum("ACTIVE", "INACTIVE")
+    line.Bias = enum("DISABLED", "PULL_UP", "PULL_DOWN")
+    line.Edge = enum("BOTH", "RISING", "FALLING")
+    gpiod = types.ModuleType("gpiod")
+    gpiod.line = line
+    gpiod.LineSettings = lambda **kwargs: kwargs
+    gpiod.request_lines = lambda *args, **kwargs: FakeRequest()
+    waveshare = types.ModuleType("WavesharePCA9685")
+    waveshare.PCA9685 = FakePCA
+    adafruit_pca9685 = types.ModuleType("adafruit_pca9685")
+    adafruit_pca9685.PCA9685 = FakePCA
+    adafruit_motor = types.ModuleType("adafruit_motor")
+    adafruit_motor.motor = None
+    sys.modules.update({
+        "gpiod": gpiod,
+        "gpiod.line": line,
+        "busio": types.ModuleType("busio"),
+        "adafruit_pca9685": adafruit_pca9685,
+        "adafruit_motor": adafruit_motor,
+        "WavesharePCA9685": waveshare
+    })
+
+
+install_fakes()
+import motor_controller  # noqa: E402
+
+
+def quiet_log(test):
+    """Silence MotorController.log for one test, restored afterwards"""
+    patcher = mock.patch.object(motor_controller.MotorController, 'log',
+                                lambda self, message, level="INFO": None)
+    patcher.start()
+    test.addCleanup(patcher.stop)
+
+
+def wait_for(predicate, timeout=3.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.01)
+    return predicate()
+
+
+class ObstacleAvoidanceTest(unittest.TestCase):
+
+    def setUp(self):
+        self.saved = (motor_controller.BACKUP_DURATION, motor_controller.AVOID_TURN_DURATION)
+        motor_controller.BACKUP_DURATION = 0.05
+        motor_controller.AVOID_TURN_DURATION = 0.05
+        quiet_log(self)
+        self.controller = motor_controller.MotorController()
+        self.controller.last_turn_was_left = False
+
+    def tearDown(self):
+        self.controller.shutdown()
+        motor_controller.BACKUP_DURATION, motor_controller.AVOID_TURN_DURATION = self.saved
+
+    def test_explore_resume_ends_avoidance(self):
+        """After the manoeuvre the explore leg is guarded again"""
+        c = self.controller
+        c.explore_mode = True
+        motion_id = c.perform_obstacle_avoidance()
+
+        self.assertTrue(wait_for(lambda: c.avoidance_in_progress))
+        self.assertTrue(wait_for(lambda: c.is_moving_forward))
+        self.assertFalse(c.avoidance_in_progress)
+        self.assertEqual(c.forward_speed, motor_controller.EXPLORE_SPEED)
+        self.assertEqual(c.motion_status()["active"]["motion_id"], motion_id)
+
+    def test_avoidance_without_explore_finishes(self):
+        c = self.controller
+        motion_id = c.perform_obstacle_avoidance()
+
+        self.assertTrue(c.wait_motion(motion_id, timeout=3.0))
+        self.assertFalse(c.avoidance_in_progress)
+        self.assertFalse(c.is_moving_forward)
+        self.assertIsNone(c.motion_status()["active"])
+
+
+class ForwardBrakingTest(unittest.TestCase):
+
+    def setUp(self):
+        quiet_log(self)
+        self.controller = motor_controller.MotorController()
+
+    def tearDown(self):
+        self.controller.shutdown()
+
+    def test_slowdown_applies_to_forward_step(self):
+        c = self.controller
+        c.submit_motion("forward", [('forward', 80, 0)])
+        self.assertTrue(wait_for(lambda: c.motion == 'forward'))
+        c.adjust_forward_speed(30, 0.5)
+        self.assertLess(c.pca.duty[c.PWMA], 80)
+
+    def test_stale_forward_flag_leaves_turn_alone(self):
+        """The monitor saw forward motion, but a turn has taken over"""
+        c = self.controller
+        c.turn_left(speed=70, angle=90)
+        self.assertTrue(wait_for(lambda: c.motion == 'turn'))
+        c.is_moving_forward = True
+        c.forward_speed = c.applied_speed = 80
+        c.adjust_forward_speed(30, 0.5)
+        self.assertEqual(c.pca.duty[c.PWMA], 70)
+
+
+class BlockedForwardTest(unittest.TestCase):
+
+    def setUp(self):
+        quiet_log(self)
+        self.controller = motor_controller.MotorController()
+        self.controller.distances.add(10, time.monotonic())  # Obstacle in front
+
+    def tearDown(self):
+        self.controller.shutdown()
+
+    def test_explore_start_blocked(self):
+        c = self.controller
+        reply = c.handle_command('{"action": "explore_start"}')
+        self.assertEqual(reply["status"], "blocked")
+        self.assertIsNone(reply["motion_id"])
+        self.assertFalse(c.explore_mode)
+
+    def test_blocked_forward_keeps_running_motion(self):
+        c = self.controller
+        c.move_backward(speed=40)
+        self.assertTrue(wait_for(lambda: c.motion == 'backward'))
+        self.assertIsNone(c.move_forward(speed=50))
+        self.assertEqual(c.motion, 'backward')
+
+
+if __name__ == "__main__":
+    unittest.main()